@@ -0,0 +1,44 @@
+"""add_attachments
+
+Revision ID: 0b6d2e9f4a71
+Revises: f2b7a09c3d58
+Create Date: 2026-10-19 20:02:41.118530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6d2e9f4a71'
+down_revision: Union[str, None] = 'f2b7a09c3d58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'attachments',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('link_id', sa.Integer(), nullable=False),
+        sa.Column('uploader_id', sa.Integer(), nullable=False),
+        sa.Column('filename', sa.String(length=255), nullable=False),
+        sa.Column('content_type', sa.String(length=127), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('storage_key', sa.String(length=512), nullable=False),
+        sa.Column('expected_sha256', sa.String(length=64), nullable=True),
+        sa.Column('sha256', sa.String(length=64), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['link_id'], ['links.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['uploader_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_attachments_link_id'), 'attachments', ['link_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_attachments_link_id'), table_name='attachments')
+    op.drop_table('attachments')
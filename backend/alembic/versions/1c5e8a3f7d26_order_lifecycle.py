@@ -0,0 +1,63 @@
+"""order_lifecycle
+
+Revision ID: 1c5e8a3f7d26
+Revises: 0b6d2e9f4a71
+Create Date: 2026-10-19 21:10:07.402215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1c5e8a3f7d26'
+down_revision: Union[str, None] = '0b6d2e9f4a71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE = "status IN ('CREATED', 'ACCEPTED', 'SHIPPED')"
+
+
+def upgrade() -> None:
+    # new enum values must be committed before the partial indexes below can use them
+    with op.get_context().autocommit_block():
+        for value in ('SHIPPED', 'DELIVERED', 'CANCELLED'):
+            op.execute(f"ALTER TYPE orderstatus ADD VALUE IF NOT EXISTS '{value}'")
+
+    orderstatus = postgresql.ENUM(name='orderstatus', create_type=False)
+    op.create_table(
+        'order_status_history',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=False),
+        sa.Column('from_status', orderstatus, nullable=True),
+        sa.Column('to_status', orderstatus, nullable=False),
+        sa.Column('actor_id', sa.Integer(), nullable=True),
+        sa.Column('at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_order_status_history_order_at', 'order_status_history', ['order_id', 'at'], unique=False)
+
+    # existing orders start their history at their current status
+    op.execute("""
+        INSERT INTO order_status_history (order_id, from_status, to_status, at)
+        SELECT id, NULL, status, created_at FROM orders
+    """)
+
+    op.create_index('ix_orders_supplier_active', 'orders', ['supplier_id', 'created_at'], unique=False,
+                    postgresql_where=sa.text(ACTIVE))
+    op.create_index('ix_orders_consumer_active', 'orders', ['consumer_id', 'created_at'], unique=False,
+                    postgresql_where=sa.text(ACTIVE))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_orders_consumer_active', table_name='orders')
+    op.drop_index('ix_orders_supplier_active', table_name='orders')
+    op.drop_index('ix_order_status_history_order_at', table_name='order_status_history')
+    op.drop_table('order_status_history')
+    # Note: PostgreSQL can't drop enum values; map the new statuses back onto the old ones
+    op.execute("UPDATE orders SET status = 'ACCEPTED' WHERE status IN ('SHIPPED', 'DELIVERED')")
+    op.execute("UPDATE orders SET status = 'REJECTED' WHERE status = 'CANCELLED'")
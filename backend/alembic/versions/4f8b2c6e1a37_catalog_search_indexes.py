@@ -0,0 +1,43 @@
+"""catalog_search_indexes
+
+Revision ID: 4f8b2c6e1a37
+Revises: d9c4f7a2b618
+Create Date: 2026-10-20 10:12:05.663120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f8b2c6e1a37'
+down_revision: Union[str, None] = 'd9c4f7a2b618'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_products_supplier_active_id', 'products', ['supplier_id', 'id'],
+        unique=False, postgresql_where=sa.text('is_active'),
+    )
+    # pg_trgm ships with postgres contrib; without it name search still works,
+    # it just scans the supplier's rows
+    available = op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ).scalar()
+    if not available:
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_products_name_trgm', 'products', ['name'],
+        unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX IF EXISTS ix_products_name_trgm')
+    op.drop_index('ix_products_supplier_active_id', table_name='products')
+    # pg_trgm is left installed: other objects may use it
@@ -0,0 +1,29 @@
+"""add_row_versions
+
+Revision ID: 5e2a9c4b7d13
+Revises: 1c5e8a3f7d26
+Create Date: 2026-10-19 22:14:06.402817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2a9c4b7d13'
+down_revision: Union[str, None] = '1c5e8a3f7d26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # constant server default: no table rewrite on PG 11+
+    for table in ('products', 'orders', 'complaints'):
+        op.add_column(table, sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    for table in ('complaints', 'orders', 'products'):
+        op.drop_column(table, 'version')
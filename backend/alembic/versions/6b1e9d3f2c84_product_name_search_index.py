@@ -0,0 +1,29 @@
+"""product_name_search_index
+
+Revision ID: 6b1e9d3f2c84
+Revises: 4f8b2c6e1a37
+Create Date: 2026-10-20 13:47:21.905512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b1e9d3f2c84'
+down_revision: Union[str, None] = '4f8b2c6e1a37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_products_name_tsv', 'products', [sa.text("to_tsvector('simple'::regconfig, name)")],
+        unique=False, postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_products_name_tsv', table_name='products')
@@ -0,0 +1,92 @@
+"""product_soft_delete_and_archive
+
+Revision ID: 7d3a5f8c1e42
+Revises: 6b1e9d3f2c84
+Create Date: 2026-10-20 16:05:38.271449
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d3a5f8c1e42'
+down_revision: Union[str, None] = '6b1e9d3f2c84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('products', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    op.drop_index('ix_products_supplier_active_id', table_name='products')
+    op.create_index(
+        'ix_products_supplier_active_id', 'products', ['supplier_id', 'id'],
+        unique=False, postgresql_where=sa.text('is_active AND deleted_at IS NULL'),
+    )
+    op.create_index(
+        'ix_products_supplier_live_id', 'products', ['supplier_id', 'id'],
+        unique=False, postgresql_where=sa.text('deleted_at IS NULL'),
+    )
+    op.create_index(
+        'ix_products_deleted_at', 'products', ['deleted_at'],
+        unique=False, postgresql_where=sa.text('deleted_at IS NOT NULL'),
+    )
+
+    op.create_table(
+        'products_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('supplier_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('unit', sa.String(length=32), nullable=False),
+        sa.Column('price', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('moq', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_products_archive_supplier_id'), 'products_archive', ['supplier_id'], unique=False)
+    op.create_table(
+        'order_items_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('unit_price', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ),
+        sa.ForeignKeyConstraint(['product_id'], ['products_archive.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_order_items_archive_order_id'), 'order_items_archive', ['order_id'], unique=False)
+    op.create_index(op.f('ix_order_items_archive_product_id'), 'order_items_archive', ['product_id'], unique=False)
+
+
+def downgrade() -> None:
+    # archived rows go back to the hot tables as deleted products
+    op.execute("""
+        INSERT INTO products (id, supplier_id, name, unit, price, moq, is_active, version, deleted_at)
+        SELECT id, supplier_id, name, unit, price, moq, false, version, deleted_at FROM products_archive
+    """)
+    op.execute("""
+        INSERT INTO order_items (id, order_id, product_id, quantity, unit_price)
+        SELECT id, order_id, product_id, quantity, unit_price FROM order_items_archive
+    """)
+    op.drop_index(op.f('ix_order_items_archive_product_id'), table_name='order_items_archive')
+    op.drop_index(op.f('ix_order_items_archive_order_id'), table_name='order_items_archive')
+    op.drop_table('order_items_archive')
+    op.drop_index(op.f('ix_products_archive_supplier_id'), table_name='products_archive')
+    op.drop_table('products_archive')
+
+    op.drop_index('ix_products_deleted_at', table_name='products')
+    op.drop_index('ix_products_supplier_live_id', table_name='products')
+    op.drop_index('ix_products_supplier_active_id', table_name='products')
+    op.create_index(
+        'ix_products_supplier_active_id', 'products', ['supplier_id', 'id'],
+        unique=False, postgresql_where=sa.text('is_active'),
+    )
+    # without deleted_at, deleted products can only be kept as inactive ones
+    op.execute("UPDATE products SET is_active = false WHERE deleted_at IS NOT NULL")
+    op.drop_column('products', 'deleted_at')
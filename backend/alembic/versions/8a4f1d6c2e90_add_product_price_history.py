@@ -0,0 +1,42 @@
+"""add_product_price_history
+
+Revision ID: 8a4f1d6c2e90
+Revises: 5e2a9c4b7d13
+Create Date: 2026-10-19 23:05:51.730144
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a4f1d6c2e90'
+down_revision: Union[str, None] = '5e2a9c4b7d13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'product_price_history',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('price', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('valid_from', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('changed_by', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    # current prices have no known start, treat them as valid since the epoch
+    op.execute(
+        "INSERT INTO product_price_history (product_id, price, valid_from) "
+        "SELECT id, price, to_timestamp(0) FROM products"
+    )
+    op.create_index('ix_product_price_history_product_valid_from', 'product_price_history', ['product_id', 'valid_from'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_product_price_history_product_valid_from', table_name='product_price_history')
+    op.drop_table('product_price_history')
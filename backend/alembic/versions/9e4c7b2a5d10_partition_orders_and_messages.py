@@ -0,0 +1,131 @@
+"""partition_orders_and_messages
+
+Revision ID: 9e4c7b2a5d10
+Revises: 7d3a5f8c1e42
+Create Date: 2026-10-20 19:22:47.530118
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4c7b2a5d10'
+down_revision: Union[str, None] = '7d3a5f8c1e42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+# FKs into orders; a partitioned table can only be referenced by its full key
+ORDER_REFERENCES = [
+    ('complaints', 'complaints_order_id_fkey', ''),
+    ('order_items', 'order_items_order_id_fkey', ''),
+    ('order_status_history', 'order_status_history_order_id_fkey', ' ON DELETE CASCADE'),
+    ('order_items_archive', 'order_items_archive_order_id_fkey', ''),
+]
+
+TABLES = {
+    'orders': {
+        'fks': [
+            ('orders_supplier_id_fkey', 'supplier_id', 'suppliers'),
+            ('orders_consumer_id_fkey', 'consumer_id', 'users'),
+        ],
+        'indexes': [
+            "CREATE INDEX ix_orders_consumer_id ON orders (consumer_id)",
+            "CREATE INDEX ix_orders_supplier_id ON orders (supplier_id)",
+            "CREATE INDEX ix_orders_supplier_active ON orders (supplier_id, created_at) "
+            "WHERE status IN ('CREATED', 'ACCEPTED', 'SHIPPED')",
+            "CREATE INDEX ix_orders_consumer_active ON orders (consumer_id, created_at) "
+            "WHERE status IN ('CREATED', 'ACCEPTED', 'SHIPPED')",
+        ],
+    },
+    'messages': {
+        'fks': [
+            ('messages_link_id_fkey', 'link_id', 'links'),
+            ('messages_sender_id_fkey', 'sender_id', 'users'),
+        ],
+        'indexes': [
+            "CREATE INDEX ix_messages_id ON messages (id)",
+            "CREATE INDEX ix_messages_link_id ON messages (link_id)",
+            "CREATE INDEX ix_messages_sender_id ON messages (sender_id)",
+            "CREATE INDEX ix_messages_created_at ON messages (created_at)",
+            "CREATE INDEX ix_messages_link_created ON messages (link_id, created_at)",
+        ],
+    },
+}
+
+
+def _add_months(d: date, months: int) -> date:
+    index = d.year * 12 + d.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _bound(d: date) -> str:
+    return f"'{d:%Y-%m-%d} 00:00:00+00'"
+
+
+def _rebuild(table: str, partitioned: bool) -> None:
+    """Copy `table` into a new (partitioned or plain) table of the same name, keeping its id sequence"""
+    spec = TABLES[table]
+    old = f"{table}_old"
+    bind = op.get_bind()
+
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    op.execute(f"ALTER TABLE {old} DROP CONSTRAINT {table}_pkey")
+    for name, _, _ in spec['fks']:
+        op.execute(f"ALTER TABLE {old} DROP CONSTRAINT {name}")
+    for ddl in spec['indexes']:
+        op.execute(f"DROP INDEX IF EXISTS {ddl.split()[2]}")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+
+    if partitioned:
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f"PARTITION BY RANGE (created_at)"
+        )
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id, created_at)")
+        # one partition per month from the oldest row to MONTHS_AHEAD ahead;
+        # app/archive/partitions.py keeps creating them from then on
+        oldest = bind.execute(sa.text(f"SELECT min(created_at) FROM {old}")).scalar()
+        current = datetime.now(timezone.utc).date().replace(day=1)
+        month = min(oldest.date().replace(day=1), current) if oldest else current
+        while month <= _add_months(current, MONTHS_AHEAD):
+            op.execute(
+                f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ({_bound(month)}) TO ({_bound(_add_months(month, 1))})"
+            )
+            month = _add_months(month, 1)
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    else:
+        op.execute(f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id)")
+
+    for name, column, target in spec['fks']:
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY ({column}) REFERENCES {target} (id)")
+    for ddl in spec['indexes']:
+        op.execute(ddl)
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    op.execute(f"DROP TABLE {old}")
+
+
+def upgrade() -> None:
+    for table, name, _ in ORDER_REFERENCES:
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT {name}")
+    _rebuild('orders', partitioned=True)
+    _rebuild('messages', partitioned=True)
+
+
+def downgrade() -> None:
+    # partitions already moved to the archive schema are not brought back
+    _rebuild('messages', partitioned=False)
+    _rebuild('orders', partitioned=False)
+    op.execute("DROP INDEX IF EXISTS ix_messages_link_created")  # added by this revision
+    for table, name, suffix in ORDER_REFERENCES:
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY (order_id) REFERENCES orders (id){suffix}"
+        )
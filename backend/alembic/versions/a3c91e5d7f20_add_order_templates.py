@@ -0,0 +1,56 @@
+"""add_order_templates
+
+Revision ID: a3c91e5d7f20
+Revises: 7c8f3f561d15
+Create Date: 2026-10-19 09:12:44.218305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c91e5d7f20'
+down_revision: Union[str, None] = '7c8f3f561d15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'order_templates',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('consumer_id', sa.Integer(), nullable=False),
+        sa.Column('supplier_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['consumer_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['supplier_id'], ['suppliers.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_order_templates_consumer_id'), 'order_templates', ['consumer_id'], unique=False)
+    op.create_index(op.f('ix_order_templates_supplier_id'), 'order_templates', ['supplier_id'], unique=False)
+
+    op.create_table(
+        'order_template_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('template_id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['template_id'], ['order_templates.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_order_template_items_template_id'), 'order_template_items', ['template_id'], unique=False)
+    op.create_index(op.f('ix_order_template_items_product_id'), 'order_template_items', ['product_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_order_template_items_product_id'), table_name='order_template_items')
+    op.drop_index(op.f('ix_order_template_items_template_id'), table_name='order_template_items')
+    op.drop_table('order_template_items')
+    op.drop_index(op.f('ix_order_templates_supplier_id'), table_name='order_templates')
+    op.drop_index(op.f('ix_order_templates_consumer_id'), table_name='order_templates')
+    op.drop_table('order_templates')
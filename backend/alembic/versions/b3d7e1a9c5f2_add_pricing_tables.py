@@ -0,0 +1,52 @@
+"""add_pricing_tables
+
+Revision ID: b3d7e1a9c5f2
+Revises: 8a4f1d6c2e90
+Create Date: 2026-10-19 23:48:12.905377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d7e1a9c5f2'
+down_revision: Union[str, None] = '8a4f1d6c2e90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('suppliers', sa.Column('pricing_version', sa.Integer(), server_default='0', nullable=False))
+    op.create_table(
+        'product_price_tiers',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('min_quantity', sa.Integer(), nullable=False),
+        sa.Column('price', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('product_id', 'min_quantity', name='uq_product_price_tiers_product_min_qty'),
+    )
+    op.create_table(
+        'link_prices',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('link_id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('min_quantity', sa.Integer(), server_default='1', nullable=False),
+        sa.Column('price', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.ForeignKeyConstraint(['link_id'], ['links.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('link_id', 'product_id', 'min_quantity', name='uq_link_prices_link_product_min_qty'),
+    )
+    op.create_index(op.f('ix_link_prices_product_id'), 'link_prices', ['product_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_link_prices_product_id'), table_name='link_prices')
+    op.drop_table('link_prices')
+    op.drop_table('product_price_tiers')
+    op.drop_column('suppliers', 'pricing_version')
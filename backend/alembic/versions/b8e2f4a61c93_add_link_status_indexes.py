@@ -0,0 +1,33 @@
+"""add_link_status_indexes
+
+Revision ID: b8e2f4a61c93
+Revises: a3c91e5d7f20
+Create Date: 2026-10-19 11:04:17.552910
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e2f4a61c93'
+down_revision: Union[str, None] = 'a3c91e5d7f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Supplier queue: WHERE supplier_id = ? AND status = ? ORDER BY id DESC (keyset on id)
+    op.create_index('ix_links_supplier_status_id', 'links', ['supplier_id', 'status', 'id'], unique=False)
+    # Consumer accepted suppliers: index-only scan returning supplier_id
+    op.create_index(
+        'ix_links_consumer_status', 'links', ['consumer_id', 'status'],
+        unique=False, postgresql_include=['supplier_id', 'id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_links_consumer_status', table_name='links')
+    op.drop_index('ix_links_supplier_status_id', table_name='links')
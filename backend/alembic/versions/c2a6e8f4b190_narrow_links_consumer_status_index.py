@@ -0,0 +1,35 @@
+"""narrow_links_consumer_status_index
+
+Revision ID: c2a6e8f4b190
+Revises: 9e4c7b2a5d10
+Create Date: 2026-10-21 10:12:05.318472
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2a6e8f4b190'
+down_revision: Union[str, None] = '9e4c7b2a5d10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # LinkRepo.accepted_supplier_ids reads only supplier_id; id was never read from this index
+    op.drop_index('ix_links_consumer_status', table_name='links')
+    op.create_index(
+        'ix_links_consumer_status', 'links', ['consumer_id', 'status'],
+        unique=False, postgresql_include=['supplier_id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_links_consumer_status', table_name='links')
+    op.create_index(
+        'ix_links_consumer_status', 'links', ['consumer_id', 'status'],
+        unique=False, postgresql_include=['supplier_id', 'id'],
+    )
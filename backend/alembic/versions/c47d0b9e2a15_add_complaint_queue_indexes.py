@@ -0,0 +1,30 @@
+"""add_complaint_queue_indexes
+
+Revision ID: c47d0b9e2a15
+Revises: b8e2f4a61c93
+Create Date: 2026-10-19 13:27:51.903148
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47d0b9e2a15'
+down_revision: Union[str, None] = 'b8e2f4a61c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Supplier queue goes through links: nested loop on link_id, filtered by status, keyset on id
+    op.create_index('ix_complaints_link_status_id', 'complaints', ['link_id', 'status', 'id'], unique=False)
+    # Assignee "my queue" (assigned_to_id was added unindexed in 61785b2410bb)
+    op.create_index('ix_complaints_assigned_status_id', 'complaints', ['assigned_to_id', 'status', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_complaints_assigned_status_id', table_name='complaints')
+    op.drop_index('ix_complaints_link_status_id', table_name='complaints')
@@ -0,0 +1,37 @@
+"""outbox_dead_letters
+
+Revision ID: d4b8f1a3c627
+Revises: c2a6e8f4b190
+Create Date: 2026-10-21 14:37:52.904116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4b8f1a3c627'
+down_revision: Union[str, None] = 'c2a6e8f4b190'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('outbox_events', sa.Column('failed_at', sa.DateTime(timezone=True), nullable=True))
+    # events that already exhausted their attempts are marked by the worker's next prune
+    op.drop_index('ix_outbox_events_pending', table_name='outbox_events')
+    op.create_index(
+        'ix_outbox_events_pending', 'outbox_events', ['id'],
+        unique=False, postgresql_where=sa.text('processed_at IS NULL AND failed_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_events_pending', table_name='outbox_events')
+    op.create_index(
+        'ix_outbox_events_pending', 'outbox_events', ['id'],
+        unique=False, postgresql_where=sa.text('processed_at IS NULL'),
+    )
+    op.drop_column('outbox_events', 'failed_at')
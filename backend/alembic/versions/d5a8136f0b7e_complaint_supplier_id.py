@@ -0,0 +1,48 @@
+"""complaint_supplier_id
+
+Revision ID: d5a8136f0b7e
+Revises: c47d0b9e2a15
+Create Date: 2026-10-19 15:48:06.317429
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a8136f0b7e'
+down_revision: Union[str, None] = 'c47d0b9e2a15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('complaints', sa.Column('supplier_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('fk_complaints_supplier_id', 'complaints', 'suppliers', ['supplier_id'], ['id'])
+
+    # Backfill: from the link first, then from the order for order-only complaints
+    op.execute("""
+        UPDATE complaints c
+        SET supplier_id = l.supplier_id
+        FROM links l
+        WHERE c.link_id = l.id AND c.supplier_id IS NULL
+    """)
+    op.execute("""
+        UPDATE complaints c
+        SET supplier_id = o.supplier_id
+        FROM orders o
+        WHERE c.order_id = o.id AND c.supplier_id IS NULL
+    """)
+
+    # Supplier listing no longer joins links, so the link-keyed queue index is replaced
+    op.create_index('ix_complaints_supplier_status_id', 'complaints', ['supplier_id', 'status', 'id'], unique=False)
+    op.drop_index('ix_complaints_link_status_id', table_name='complaints')
+
+
+def downgrade() -> None:
+    op.create_index('ix_complaints_link_status_id', 'complaints', ['link_id', 'status', 'id'], unique=False)
+    op.drop_index('ix_complaints_supplier_status_id', table_name='complaints')
+    op.drop_constraint('fk_complaints_supplier_id', 'complaints', type_='foreignkey')
+    op.drop_column('complaints', 'supplier_id')
@@ -0,0 +1,63 @@
+"""add_inventory_ledger
+
+Revision ID: d9c4f7a2b618
+Revises: b3d7e1a9c5f2
+Create Date: 2026-10-20 00:31:44.218903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9c4f7a2b618'
+down_revision: Union[str, None] = 'b3d7e1a9c5f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'stock_movements',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('delta', sa.Integer(), nullable=False),
+        sa.Column('reason', sa.Enum('ORDER', 'ORDER_RELEASE', 'ADJUSTMENT', 'IMPORT', name='stockmovementreason'), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=True),
+        sa.Column('actor_id', sa.Integer(), nullable=True),
+        sa.Column('note', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_stock_movements_product_id_id', 'stock_movements', ['product_id', 'id'], unique=False, postgresql_include=['delta'])
+    op.create_table(
+        'stock_snapshots',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('last_movement_id', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('taken_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('product_id'),
+    )
+    # current stock becomes the first snapshot
+    op.execute("INSERT INTO stock_snapshots (product_id, quantity) SELECT id, coalesce(stock, 0) FROM products")
+    op.drop_column('products', 'stock')
+
+
+def downgrade() -> None:
+    op.add_column('products', sa.Column('stock', sa.Integer(), nullable=True))
+    op.execute(
+        "UPDATE products p SET stock = coalesce(s.quantity, 0) + coalesce(("
+        "  SELECT sum(m.delta) FROM stock_movements m"
+        "  WHERE m.product_id = p.id AND m.id > coalesce(s.last_movement_id, 0)), 0) "
+        "FROM products p2 LEFT JOIN stock_snapshots s ON s.product_id = p2.id "
+        "WHERE p2.id = p.id"
+    )
+    op.alter_column('products', 'stock', nullable=False)
+    op.drop_table('stock_snapshots')
+    op.drop_index('ix_stock_movements_product_id_id', table_name='stock_movements')
+    op.drop_table('stock_movements')
+    sa.Enum(name='stockmovementreason').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,45 @@
+"""add_outbox_events
+
+Revision ID: e61f2c8d4b09
+Revises: d5a8136f0b7e
+Create Date: 2026-10-19 17:02:39.640215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e61f2c8d4b09'
+down_revision: Union[str, None] = 'd5a8136f0b7e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'outbox_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('event_type', sa.String(length=64), nullable=False),
+        sa.Column('aggregate_type', sa.String(length=32), nullable=False),
+        sa.Column('aggregate_id', sa.Integer(), nullable=False),
+        sa.Column('actor_id', sa.Integer(), nullable=True),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    # Partial index: the worker only ever scans pending events
+    op.create_index(
+        'ix_outbox_events_pending', 'outbox_events', ['id'],
+        unique=False, postgresql_where=sa.text('processed_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_events_pending', table_name='outbox_events')
+    op.drop_table('outbox_events')
@@ -0,0 +1,40 @@
+"""add_audit_log
+
+Revision ID: f2b7a09c3d58
+Revises: e61f2c8d4b09
+Create Date: 2026-10-19 18:15:22.871406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b7a09c3d58'
+down_revision: Union[str, None] = 'e61f2c8d4b09'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'audit_log',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('actor_id', sa.Integer(), nullable=True),
+        sa.Column('action', sa.String(length=64), nullable=False),
+        sa.Column('entity_type', sa.String(length=32), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=True),
+        sa.Column('data', sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_audit_log_entity', 'audit_log', ['entity_type', 'entity_id', 'at'], unique=False)
+    op.create_index('ix_audit_log_actor_at', 'audit_log', ['actor_id', 'at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audit_log_actor_at', table_name='audit_log')
+    op.drop_index('ix_audit_log_entity', table_name='audit_log')
+    op.drop_table('audit_log')
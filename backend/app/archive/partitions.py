@@ -0,0 +1,104 @@
+"""
+Partition maintenance for the monthly-partitioned tables (orders, messages;
+see PARTITIONED_TABLES in app/repositories/partition_repo.py).
+
+    python -m app.archive.partitions            # once, e.g. daily from cron
+    python -m app.archive.partitions --dry-run  # print what would change
+
+Creates the partitions for the current month and PARTITION_MONTHS_AHEAD
+months ahead, so inserts never fall into the default partition. With
+MESSAGES_RETENTION_MONTHS / ORDERS_RETENTION_MONTHS set, whole months older
+than that are detached and moved to the PARTITION_ARCHIVE_SCHEMA schema:
+they leave the live table (and its indexes and vacuum work) but stay
+queryable there, or can be dumped and dropped. An orders month moves only
+once all its orders are finished and their complaints resolved; its order
+lines, status history and complaints move with it. Every run also reports
+rows that reference a missing order (orders.id has no foreign keys).
+"""
+import argparse
+import logging
+from datetime import date, datetime, timezone
+
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal, get_engine
+from app.repositories.partition_repo import PARTITIONED_TABLES, PartitionRepo, add_months, month_start, partition_name
+
+logger = logging.getLogger("scp.partitions")
+
+
+def _retention_months(table: str) -> int | None:
+    settings = get_settings()
+    return {
+        "orders": settings.ORDERS_RETENTION_MONTHS,
+        "messages": settings.MESSAGES_RETENTION_MONTHS,
+    }.get(table)
+
+
+def maintain(today: date | None = None, dry_run: bool = False) -> list[str]:
+    """Create upcoming partitions and archive expired ones; returns the actions taken"""
+    settings = get_settings()
+    current = month_start(today or datetime.now(timezone.utc).date())
+    timeout = settings.PARTITION_LOCK_TIMEOUT_MS
+    actions = []
+    db = SessionLocal()
+    try:
+        for table in PARTITIONED_TABLES:
+            try:
+                for ahead in range(settings.PARTITION_MONTHS_AHEAD + 1):
+                    month = add_months(current, ahead)
+                    if dry_run:
+                        existing = {name for name, _ in PartitionRepo.list_months(db, table)}
+                        if partition_name(table, month) not in existing:
+                            actions.append(f"create {partition_name(table, month)}")
+                    elif PartitionRepo.create_month(db, table, month, timeout):
+                        actions.append(f"create {partition_name(table, month)}")
+
+                retention = _retention_months(table)
+                if retention is None:
+                    continue
+                # a month is archived once all of it is older than the retention window
+                cutoff = add_months(current, -retention)
+                for name, month in PartitionRepo.list_months(db, table):
+                    if add_months(month, 1) > cutoff:
+                        break
+                    schema = settings.PARTITION_ARCHIVE_SCHEMA
+                    if dry_run:
+                        archived = PartitionRepo.archivable(db, table, name)
+                    else:
+                        archived = PartitionRepo.archive_month(db, table, name, schema, timeout)
+                    if archived:
+                        actions.append(f"archive {name} -> {schema}.{name}")
+                    else:
+                        actions.append(f"keep {name}: open orders or unresolved complaints")
+            except OperationalError as e:
+                # lock_timeout: a long transaction holds the table, try next run
+                db.rollback()
+                logger.warning("partition maintenance of %s skipped: %s", table, e.orig)
+
+        # orders.id has no FKs pointing at it; report rows that lost their order
+        for child, count in PartitionRepo.orphan_counts(db).items():
+            logger.warning("%s has %s rows whose order is not in orders", child, count)
+            actions.append(f"orphans {child}: {count}")
+        return actions
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Create upcoming monthly partitions and archive old ones")
+    parser.add_argument("--dry-run", action="store_true", help="only print what would change")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    get_engine()
+    actions = maintain(dry_run=args.dry_run)
+    for action in actions:
+        print(action)
+    if not actions:
+        print("partitions up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Product archival: moves products soft-deleted more than
+PRODUCT_ARCHIVE_AFTER_DAYS ago, and the order lines that reference them, out
+of the hot tables into products_archive / order_items_archive. Orders keep
+showing archived lines (Order.lines).
+
+    python -m app.archive.products          # until nothing is left to move
+    python -m app.archive.products --loop   # every PRODUCT_ARCHIVE_INTERVAL seconds
+
+Each batch of PRODUCT_ARCHIVE_BATCH_SIZE products is its own short
+transaction, so the job can run next to live traffic.
+"""
+import argparse
+import logging
+import signal
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import get_settings
+from app.db import base  # noqa: F401  (register all models)
+from app.db.session import SessionLocal, get_engine
+from app.repositories.archive_repo import ArchiveRepo
+
+logger = logging.getLogger("scp.archive")
+
+
+def archive_once(max_batches: int | None = None) -> tuple[int, int]:
+    """(products, order lines) moved"""
+    settings = get_settings()
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.PRODUCT_ARCHIVE_AFTER_DAYS)
+    products = lines = batches = 0
+    db = SessionLocal()
+    try:
+        while max_batches is None or batches < max_batches:
+            moved, moved_lines = ArchiveRepo.archive_products(db, cutoff, settings.PRODUCT_ARCHIVE_BATCH_SIZE)
+            if not moved:
+                break
+            products += moved
+            lines += moved_lines
+            batches += 1
+        return products, lines
+    finally:
+        db.close()
+
+
+def run_forever() -> None:
+    settings = get_settings()
+    stopping = False
+
+    def _stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    while not stopping:
+        try:
+            products, lines = archive_once()
+            logger.info("product archival: %s products, %s order lines moved", products, lines)
+        except Exception:
+            logger.exception("product archival failed")
+        deadline = time.monotonic() + settings.PRODUCT_ARCHIVE_INTERVAL
+        while not stopping and time.monotonic() < deadline:
+            time.sleep(min(1.0, settings.PRODUCT_ARCHIVE_INTERVAL))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Move long-deleted products to the archive tables")
+    parser.add_argument("--loop", action="store_true", help="keep running every PRODUCT_ARCHIVE_INTERVAL seconds")
+    parser.add_argument("--max-batches", type=int, help="stop after this many batches")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    get_engine()
+    if args.loop:
+        run_forever()
+    else:
+        products, lines = archive_once(args.max_batches)
+        print(f"products archived: {products}, order lines archived: {lines}")
+
+
+if __name__ == "__main__":
+    main()
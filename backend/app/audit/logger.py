@@ -0,0 +1,190 @@
+"""
+Buffered audit logging.
+
+`log_event(...)` only enqueues a record (no I/O, no commit on the request
+path). A daemon thread drains the queue and writes batches when
+AUDIT_BATCH_SIZE records are pending or AUDIT_FLUSH_INTERVAL seconds have
+passed, either as one multi-row INSERT into `audit_log` ("db") or as
+appended JSON lines ("file").
+
+The queue is bounded (AUDIT_QUEUE_SIZE). When full, AUDIT_OVERFLOW_POLICY
+decides: "drop" discards the record and counts it, "block" slows the caller
+down for up to AUDIT_BLOCK_TIMEOUT seconds before dropping.
+"""
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, List, Optional
+
+from sqlalchemy import insert
+
+from app.core.config import get_settings
+
+logger = logging.getLogger("scp.audit")
+
+
+class AuditLogger:
+    def __init__(
+        self,
+        *,
+        backend: str,
+        batch_size: int,
+        flush_interval: float,
+        queue_size: int,
+        overflow_policy: str,
+        block_timeout: float,
+        file_path: Optional[str] = None,
+    ):
+        if backend not in ("db", "file", "off"):
+            raise ValueError(f"Unknown audit backend: {backend}")
+        if overflow_policy not in ("drop", "block"):
+            raise ValueError(f"Unknown audit overflow policy: {overflow_policy}")
+        self.backend = backend
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.file_path = file_path
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    # --- producer side (request path) ---
+
+    def log(
+        self,
+        actor_id: Optional[int],
+        action: str,
+        entity_type: str,
+        entity_id: Optional[int],
+        data: Optional[dict[str, Any]] = None,
+    ) -> None:
+        if self.backend == "off":
+            return
+        self._ensure_started()
+        record = {
+            "at": datetime.now(timezone.utc),
+            "actor_id": actor_id,
+            "action": action,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "data": data,
+        }
+        try:
+            if self.overflow_policy == "block":
+                self._queue.put(record, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning("audit queue full, %s records dropped so far", self.dropped)
+
+    # --- consumer side (background thread) ---
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self) -> None:
+        batch: List[dict] = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            timeout = max(deadline - time.monotonic(), 0)
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                pass
+            # drain whatever is already queued without waiting again
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                if batch:
+                    self._write(batch)
+                    batch = []
+                deadline = time.monotonic() + self.flush_interval
+            if self._stop.is_set() and self._queue.empty():
+                if batch:
+                    self._write(batch)
+                return
+
+    def _write(self, batch: List[dict]) -> None:
+        try:
+            if self.backend == "db":
+                self._write_db(batch)
+            else:
+                self._write_file(batch)
+        except Exception:
+            logger.exception("audit batch of %s records could not be written", len(batch))
+
+    def _write_db(self, batch: List[dict]) -> None:
+        from app.db.session import get_engine
+        from app.models.audit_log import AuditLog
+        with get_engine().begin() as conn:
+            conn.execute(insert(AuditLog.__table__), batch)
+
+    def _write_file(self, batch: List[dict]) -> None:
+        lines = "".join(json.dumps(record, default=str) + "\n" for record in batch)
+        with open(self.file_path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush pending records and stop the writer thread"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+
+
+_audit_logger: Optional[AuditLogger] = None
+_audit_logger_lock = threading.Lock()
+
+
+def get_audit_logger() -> AuditLogger:
+    """Process-wide audit logger, configured from settings on first use"""
+    global _audit_logger
+    if _audit_logger is None:
+        with _audit_logger_lock:
+            if _audit_logger is None:
+                settings = get_settings()
+                _audit_logger = AuditLogger(
+                    backend=settings.AUDIT_BACKEND,
+                    batch_size=settings.AUDIT_BATCH_SIZE,
+                    flush_interval=settings.AUDIT_FLUSH_INTERVAL,
+                    queue_size=settings.AUDIT_QUEUE_SIZE,
+                    overflow_policy=settings.AUDIT_OVERFLOW_POLICY,
+                    block_timeout=settings.AUDIT_BLOCK_TIMEOUT,
+                    file_path=settings.AUDIT_FILE_PATH,
+                )
+    return _audit_logger
+
+
+def close_audit_logger() -> None:
+    """Flush and stop the writer thread (app shutdown)"""
+    if _audit_logger is not None:
+        _audit_logger.close()
+
+
+def log_event(
+    actor_id: Optional[int],
+    action: str,
+    entity_type: str,
+    entity_id: Optional[int],
+    data: Optional[dict[str, Any]] = None,
+) -> None:
+    """Record an audit event; returns immediately"""
+    get_audit_logger().log(actor_id, action, entity_type, entity_id, data)
@@ -0,0 +1,184 @@
+"""
+Catalog snapshot files.
+
+For each supplier, the active catalog is serialized once into a compact,
+content-addressed JSON document and written next to its gzip (and, if the
+`brotli` package is installed, brotli) encodings:
+
+    CATALOG_SNAPSHOT_DIR/<supplier_id>/<version>.json[.gz|.br]
+    CATALOG_SNAPSHOT_DIR/<supplier_id>/CURRENT      -> "<version>"
+
+`version` is a hash of the JSON, so unchanged catalogs keep their ETag.
+Snapshots are rebuilt by the outbox worker on `product.changed` events
+(CatalogSnapshotSink) or by hand:
+
+    python -m app.catalog.snapshot            # every supplier
+    python -m app.catalog.snapshot 3 7        # selected suppliers
+
+Consumers get a short-lived signed URL (HMAC over supplier, consumer and
+expiry) after the usual accepted-link check; serving it needs neither the
+DB nor the JWT.
+"""
+import gzip
+import hashlib
+import hmac
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.product import Product
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always written
+    brotli = None
+
+CURRENT = "CURRENT"
+KEEP_VERSIONS = 2  # the previous version stays for downloads in flight
+
+
+@dataclass(frozen=True)
+class SnapshotFile:
+    path: str
+    encoding: Optional[str]  # None = identity
+    etag: str
+
+
+def _supplier_dir(supplier_id: int) -> str:
+    return os.path.join(get_settings().CATALOG_SNAPSHOT_DIR, str(supplier_id))
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def serialize_catalog(db: Session, supplier_id: int) -> bytes:
+    rows = db.execute(
+        select(
+            Product.id, Product.name, Product.unit, Product.price,
+            Product.stock, Product.moq, Product.is_active,
+        )
+        .where(Product.supplier_id == supplier_id, Product.is_active.is_(True), Product.deleted_at.is_(None))
+        .order_by(Product.id.desc())
+    ).all()
+    doc = {
+        "supplier_id": supplier_id,
+        "products": [
+            {
+                "id": r.id,
+                "supplier_id": supplier_id,
+                "name": r.name,
+                "unit": r.unit,
+                "price": float(r.price),
+                "stock": r.stock,
+                "moq": r.moq,
+                "is_active": r.is_active,
+            }
+            for r in rows
+        ],
+    }
+    return json.dumps(doc, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def build_snapshot(db: Session, supplier_id: int) -> str:
+    """Write the supplier's snapshot if its content changed; returns the current version"""
+    body = serialize_catalog(db, supplier_id)
+    version = hashlib.sha256(body).hexdigest()[:20]
+    directory = _supplier_dir(supplier_id)
+    os.makedirs(directory, exist_ok=True)
+
+    if current_version(supplier_id) != version:
+        base = os.path.join(directory, f"{version}.json")
+        _write_atomic(base, body)
+        _write_atomic(base + ".gz", gzip.compress(body, compresslevel=9, mtime=0))
+        if brotli is not None:
+            _write_atomic(base + ".br", brotli.compress(body, quality=11))
+        _write_atomic(os.path.join(directory, CURRENT), version.encode())
+        _prune(directory, version)
+    return version
+
+
+def _prune(directory: str, version: str) -> None:
+    versions = {}
+    for name in os.listdir(directory):
+        if name.endswith(".json"):
+            versions[name[:-5]] = os.path.getmtime(os.path.join(directory, name))
+    stale = sorted((v for v in versions if v != version), key=versions.get, reverse=True)[KEEP_VERSIONS - 1:]
+    for v in stale:
+        for suffix in (".json", ".json.gz", ".json.br"):
+            try:
+                os.remove(os.path.join(directory, v + suffix))
+            except FileNotFoundError:
+                pass
+
+
+def current_version(supplier_id: int) -> Optional[str]:
+    try:
+        with open(os.path.join(_supplier_dir(supplier_id), CURRENT), "rb") as f:
+            return f.read().decode().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def select_file(supplier_id: int, accept_encoding: str) -> Optional[SnapshotFile]:
+    """Best stored encoding the client accepts for the current version"""
+    version = current_version(supplier_id)
+    if version is None:
+        return None
+    base = os.path.join(_supplier_dir(supplier_id), f"{version}.json")
+    accepted = {p.split(";")[0].strip() for p in accept_encoding.lower().split(",")}
+    for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+        if encoding in accepted and os.path.exists(base + suffix):
+            return SnapshotFile(base + suffix, encoding, f'"{version}-{encoding}"')
+    return SnapshotFile(base, None, f'"{version}"')
+
+
+# --- signed URLs ---
+
+def _signature(supplier_id: int, consumer_id: int, expires: int) -> str:
+    msg = f"{supplier_id}.{consumer_id}.{expires}".encode()
+    return hmac.new(get_settings().SECRET_KEY.encode(), msg, hashlib.sha256).hexdigest()[:32]
+
+
+def sign_snapshot_url(supplier_id: int, consumer_id: int) -> tuple[str, datetime]:
+    expires = int(time.time()) + get_settings().CATALOG_URL_TTL_SECONDS
+    sig = _signature(supplier_id, consumer_id, expires)
+    url = f"/catalog/{supplier_id}/snapshot?consumer_id={consumer_id}&expires={expires}&sig={sig}"
+    return url, datetime.fromtimestamp(expires, tz=timezone.utc)
+
+
+def verify_snapshot_signature(supplier_id: int, consumer_id: int, expires: int, sig: str) -> bool:
+    if expires < time.time():
+        return False
+    return hmac.compare_digest(_signature(supplier_id, consumer_id, expires), sig)
+
+
+def rebuild(supplier_ids: Iterable[int] | None = None) -> List[str]:
+    from app.db import base  # noqa: F401  (register all models)
+    from app.db.session import SessionLocal, get_engine
+    from app.models.supplier import Supplier
+
+    get_engine()
+    db = SessionLocal()
+    try:
+        if supplier_ids is None:
+            supplier_ids = db.execute(select(Supplier.id)).scalars().all()
+        return [build_snapshot(db, sid) for sid in supplier_ids]
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    ids = [int(a) for a in sys.argv[1:]] or None
+    print(f"built {len(rebuild(ids))} catalog snapshots")
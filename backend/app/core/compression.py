@@ -0,0 +1,222 @@
+"""
+Negotiated gzip/brotli response compression (pure ASGI).
+
+- Only bodies of at least COMPRESSION_MIN_SIZE bytes with a compressible
+  content type are encoded; responses that already carry Content-Encoding
+  (e.g. catalog snapshot files) or Content-Range (206 partial content) pass
+  through untouched. Strong ETags of encoded responses are made weak.
+- Streaming responses (`more_body`) are compressed chunk by chunk with a sync
+  flush, so clients still receive data as it is produced.
+- Single-body responses are looked up in a small LRU of compressed bytes keyed
+  by (encoding, sha256 of the body): a repeated catalog or order page costs one
+  hash instead of one compression. Size it with COMPRESSION_CACHE_MAX_BYTES
+  (0 disables).
+
+brotli is used only when the `brotli` package is installed.
+"""
+import hashlib
+import zlib
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from starlette.datastructures import MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "text/",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+_NO_BODY_STATUSES = (204, 304)
+
+
+def parse_accept_encoding(header: str, supported: Tuple[str, ...]) -> Optional[str]:
+    """Preferred supported coding by q-value (ties go to the order of `supported`)"""
+    best, best_q = None, 0.0
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                continue
+        if coding == "*":
+            coding = supported[0]
+        if coding in supported and (q > best_q or (q == best_q and best is not None
+                                                   and supported.index(coding) < supported.index(best))):
+            best, best_q = coding, q
+    return best
+
+
+class _Encoder:
+    """Incremental encoder with the same interface for gzip and brotli"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._c = brotli.Compressor(quality=brotli_quality)
+            self.compress, self._flush, self._finish = self._c.process, self._c.flush, self._c.finish
+        else:
+            self._c = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)  # 31 = gzip container
+            self.compress = self._c.compress
+            self._flush = lambda: self._c.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = self._c.flush
+
+    def chunk(self, data: bytes) -> bytes:
+        return self.compress(data) + self._flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self.compress(data) + self._finish()
+
+
+class CompressedCache:
+    """LRU of compressed bodies bounded by total bytes"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items: "OrderedDict[Tuple[str, bytes], bytes]" = OrderedDict()
+
+    def get(self, key: Tuple[str, bytes]) -> Optional[bytes]:
+        value = self._items.get(key)
+        if value is not None:
+            self._items.move_to_end(key)
+        return value
+
+    def put(self, key: Tuple[str, bytes], value: bytes) -> None:
+        if len(value) > self.max_bytes // 4 or key in self._items:
+            return
+        self._items[key] = value
+        self.size += len(value)
+        while self.size > self.max_bytes:
+            _, old = self._items.popitem(last=False)
+            self.size -= len(old)
+
+
+class CompressionMiddleware:
+    def __init__(self, app, settings):
+        self.app = app
+        self.min_size = settings.COMPRESSION_MIN_SIZE
+        self.gzip_level = settings.COMPRESSION_GZIP_LEVEL
+        self.brotli_quality = settings.COMPRESSION_BROTLI_QUALITY
+        self.supported = ("br", "gzip") if brotli is not None else ("gzip",)
+        self.cache = CompressedCache(settings.COMPRESSION_CACHE_MAX_BYTES) if settings.COMPRESSION_CACHE_MAX_BYTES else None
+        self._negotiated: Dict[bytes, Optional[str]] = {}  # Accept-Encoding value -> coding
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                encoding = self._negotiate(value)
+                break
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _Responder(self, encoding, send).send)
+
+    def _negotiate(self, value: bytes) -> Optional[str]:
+        try:
+            return self._negotiated[value]
+        except KeyError:
+            pass
+        encoding = parse_accept_encoding(value.decode("latin-1"), self.supported)
+        if len(self._negotiated) < 256:
+            self._negotiated[value] = encoding
+        return encoding
+
+    def encode_body(self, encoding: str, body: bytes) -> bytes:
+        if self.cache is None:
+            return _Encoder(encoding, self.gzip_level, self.brotli_quality).finish(body)
+        key = (encoding, hashlib.sha256(body).digest())
+        encoded = self.cache.get(key)
+        if encoded is None:
+            encoded = _Encoder(encoding, self.gzip_level, self.brotli_quality).finish(body)
+            self.cache.put(key, encoded)
+        return encoded
+
+
+class _Responder:
+    def __init__(self, mw: CompressionMiddleware, encoding: str, send):
+        self.mw = mw
+        self.encoding = encoding
+        self._send = send
+        self.start = None
+        self.passthrough = False
+        self.buffer = b""
+        self.encoder: Optional[_Encoder] = None
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            if (
+                message["status"] in _NO_BODY_STATUSES
+                or message["status"] == 206
+                or "content-range" in headers  # byte ranges address the identity body
+                or "content-encoding" in headers
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+                or int(headers.get("content-length", self.mw.min_size)) < self.mw.min_size
+            ):
+                self.passthrough = True
+                await self._send(message)
+            else:
+                self.start = message
+            return
+
+        if self.passthrough or message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more = message.get("more_body", False)
+
+        if self.encoder is None:
+            # not started yet: collect until the threshold is reached or the body ends
+            self.buffer += body
+            if not more:
+                await self._finish_unstreamed()
+                return
+            if len(self.buffer) < self.mw.min_size:
+                return
+            self.encoder = _Encoder(self.encoding, self.mw.gzip_level, self.mw.brotli_quality)
+            self._set_encoding_headers(None)
+            await self._send(self.start)
+            body, self.buffer = self.buffer, b""
+
+        data = self.encoder.chunk(body) if more else self.encoder.finish(body)
+        await self._send({"type": "http.response.body", "body": data, "more_body": more})
+
+    async def _finish_unstreamed(self):
+        body = self.buffer
+        if len(body) < self.mw.min_size:
+            await self._send(self.start)
+            await self._send({"type": "http.response.body", "body": body})
+            return
+        encoded = self.mw.encode_body(self.encoding, body)
+        self._set_encoding_headers(len(encoded))
+        await self._send(self.start)
+        await self._send({"type": "http.response.body", "body": encoded})
+
+    def _set_encoding_headers(self, length: Optional[int]) -> None:
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        # the encoded body is not byte-identical to the identity one; If-Match accepts W/
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = "W/" + etag
+        if length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(length)
@@ -0,0 +1,67 @@
+"""
+Optimistic concurrency on top of SQLAlchemy's version_id_col.
+
+Versioned rows (products, orders, complaints) carry an integer `version`
+that every ORM UPDATE checks and bumps (`... WHERE id = :id AND version = :v`).
+Clients echo it back as `If-Match: "<version>"`:
+
+- a stale `If-Match` is rejected up front with 412,
+- a write that loses the race after the check (the row changed between
+  SELECT and UPDATE) raises StaleDataError, mapped to 409.
+
+No row locks are taken, so busy suppliers are not serialized.
+"""
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+
+def etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def set_etag(response: Response, version: int) -> None:
+    response.headers["ETag"] = etag(version)
+
+
+def parse_if_match(value: Optional[str]) -> Optional[int]:
+    """Version from an If-Match header; None when absent or `*`"""
+    if value is None:
+        return None
+    value = value.strip()
+    if value == "*":
+        return None
+    if value.startswith("W/"):
+        value = value[2:]
+    try:
+        return int(value.strip('"'))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="If-Match must be an ETag returned by this API",
+        )
+
+
+def check_version(current: int, expected: Optional[int], what: str) -> None:
+    if expected is not None and expected != current:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=f"{what} has been modified (current version {current})",
+            headers={"ETag": etag(current)},
+        )
+
+
+@contextmanager
+def conflict_on_stale(db: Session, what: str) -> Iterator[None]:
+    """Turn a lost optimistic-lock race into 409"""
+    try:
+        yield
+    except StaleDataError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"{what} was modified concurrently, reload and retry",
+        )
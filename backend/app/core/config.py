@@ -6,7 +6,120 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     ENV: str = "dev"
 
+    # SQLAlchemy pool (per worker process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800
+
+    # Proxies whose X-Forwarded-For / X-Forwarded-Proto are trusted (gunicorn workers,
+    # app/core/server.py); comma-separated IPs/networks, "*" trusts any client
+    FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+
+    # Optional read replica for read-only routes; users who just wrote stay on the
+    # primary for DB_READ_PIN_SECONDS (read-your-writes)
+    DATABASE_READ_URL: str | None = None
+    DB_READ_PIN_SECONDS: float = 5.0
+
+    # Outbox worker (python -m app.outbox.worker)
+    OUTBOX_SINKS: str = "audit,push,webhook,catalog"
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL: float = 1.0
+    OUTBOX_MAX_ATTEMPTS: int = 5
+    OUTBOX_RETENTION_HOURS: int = 72
+    OUTBOX_DEAD_RETENTION_HOURS: int = 720    # dead letters (failed OUTBOX_MAX_ATTEMPTS times)
+    OUTBOX_WEBHOOK_URL: str | None = None
+    OUTBOX_WEBHOOK_TIMEOUT: float = 5.0
+
+    # Stock ledger compaction (python -m app.inventory.compaction)
+    INVENTORY_COMPACT_INTERVAL: float = 300.0
+    INVENTORY_COMPACT_LOCK_TIMEOUT_MS: int = 2000
+    INVENTORY_RETENTION_DAYS: int = 90         # folded movements kept for audit this long
+
+    # Product archival (python -m app.archive.products)
+    PRODUCT_ARCHIVE_AFTER_DAYS: int = 180      # soft-deleted this long before moving to the archive
+    PRODUCT_ARCHIVE_BATCH_SIZE: int = 500
+    PRODUCT_ARCHIVE_INTERVAL: float = 3600.0
+
+    # Monthly partitions of orders / messages (python -m app.archive.partitions)
+    PARTITION_MONTHS_AHEAD: int = 3
+    PARTITION_ARCHIVE_SCHEMA: str = "archive"
+    PARTITION_LOCK_TIMEOUT_MS: int = 2000
+    ORDERS_RETENTION_MONTHS: int | None = None     # None = keep every month attached
+    MESSAGES_RETENTION_MONTHS: int | None = None
+
+    # Response compression (app/core/compression.py); brotli needs the `brotli` package
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_CACHE_MAX_BYTES: int = 16 * 1024 * 1024  # 0 = don't cache compressed bodies
+
+    # Chat attachments (app/storage, /chat/{link_id}/attachments)
+    ATTACHMENT_STORAGE: str = "local"
+    ATTACHMENT_DIR: str = "attachments"
+    ATTACHMENT_MAX_BYTES: int = 50 * 1024 * 1024
+    ATTACHMENT_CONTENT_TYPES: str = "image/,audio/,video/,application/pdf,text/plain"  # prefixes
+
+    # Sampled profiling (app/core/profiling.py, /admin/profiles)
+    PROFILING_SAMPLE_RATE: float = 0.0           # fraction of requests profiled
+    PROFILING_ALLOW_SIGNED_HEADER: bool = True   # X-Profile: python -m app.core.profiling
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILING_MAX_STACKS: int = 5000             # distinct stacks kept per route
+    ADMIN_TOKEN: str | None = None               # X-Admin-Token for /admin; unset = disabled
+
+    # Catalog snapshot files (app/catalog/snapshot.py)
+    CATALOG_SNAPSHOT_DIR: str = "catalog_snapshots"
+    CATALOG_URL_TTL_SECONDS: int = 900
+
+    # Compiled price tables kept per process (app/pricing/engine.py)
+    PRICING_CACHE_SUPPLIERS: int = 1024
+
+    # Audit log (app/audit/logger.py): db | file | off
+    AUDIT_BACKEND: str = "db"
+    AUDIT_FILE_PATH: str = "audit.log"
+    AUDIT_BATCH_SIZE: int = 200
+    AUDIT_FLUSH_INTERVAL: float = 1.0
+    AUDIT_QUEUE_SIZE: int = 10000
+    AUDIT_OVERFLOW_POLICY: str = "drop"  # drop | block
+    AUDIT_BLOCK_TIMEOUT: float = 0.05
+
+    # Rate limiting (app/ratelimit): "METHOD /path-prefix" -> "count/seconds", "*" = any method
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"  # memory | redis
+    RATE_LIMIT_REDIS_URL: str | None = None
+    RATE_LIMIT_DEFAULT: str | None = "300/60"
+    RATE_LIMIT_POLICIES: dict[str, str] = {
+        "POST /auth/login": "10/60",
+        "POST /auth/register": "5/60",
+        "GET /chat/": "60/60",
+        "GET /suppliers": "60/60",
+    }
+    RATE_LIMIT_MAX_CONCURRENT: int = 8  # in-flight requests per client and worker, 0 = off
+
     class Config:
         env_file = ".env"
 
-settings = Settings()
+_settings: Settings | None = None
+
+
+def get_settings() -> Settings:
+    """Process settings, read from env/.env on first use rather than at import"""
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
+
+
+def configure_settings(new_settings: Settings) -> None:
+    """Install explicit settings (create_app(settings), tests); resets the DB engine"""
+    global _settings
+    _settings = new_settings
+    from app.db.session import reset_engine
+    reset_engine()
+
+
+def __getattr__(name: str):
+    # `from app.core.config import settings` keeps working, resolved lazily
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
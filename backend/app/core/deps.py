@@ -4,14 +4,16 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from jose import jwt, JWTError
 
-from app.core.config import settings
-from app.db.session import SessionLocal
+from app.core.config import get_settings
+from app.core.read_pin import is_pinned
+from app.db.session import ReadSessionLocal, SessionLocal, get_engine, get_read_engine
 from app.models.user import User
 
 ALGORITHM = "HS256"
 security = HTTPBearer(auto_error=False) 
 
 def get_db() -> Generator[Session, None, None]:
+    get_engine()  # no-op once the app lifespan has bound the engine
     db = SessionLocal()
     try:
         yield db
@@ -27,7 +29,7 @@ def _credentials_exc(detail: str = "Invalid credentials") -> HTTPException:
 
 def _get_user_from_token(token: str, db: Session) -> User:
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, get_settings().SECRET_KEY, algorithms=[ALGORITHM])
         email: Optional[str] = payload.get("sub")
         if not email:
             raise ValueError("no-sub")
@@ -37,6 +39,8 @@ def _get_user_from_token(token: str, db: Session) -> User:
     user = db.query(User).filter(User.email == email).first()
     if not user:
         raise _credentials_exc("User not found")
+    # acting user for outbox events written through this session
+    db.info["actor_id"] = user.id
     return user
 
 def auth_bearer(
@@ -46,3 +50,23 @@ def auth_bearer(
     if not creds or not creds.scheme or creds.scheme.lower() != "bearer":
         raise _credentials_exc("Missing bearer token")
     return _get_user_from_token(creds.credentials, db)
+
+
+def get_read_db(
+    current_user: User = Depends(auth_bearer),
+    db: Session = Depends(get_db),
+) -> Generator[Session, None, None]:
+    """
+    Session for read-only routes: the replica, unless none is configured or the
+    user wrote recently and carries a read pin (then the request's primary session).
+    """
+    if get_read_engine() is None or is_pinned(current_user.id):
+        yield db
+        return
+    # the primary was only needed to authenticate; release its connection now
+    db.close()
+    read_db = ReadSessionLocal()
+    try:
+        yield read_db
+    finally:
+        read_db.close()
@@ -0,0 +1,41 @@
+"""
+Opaque keyset cursors for lists sorted by something other than id.
+
+A cursor is the sort key of the last row returned, e.g. ("Tomatoes", 812),
+JSON-encoded and base64url'd so clients pass it back verbatim. Lists sorted
+by id alone keep the plain `before_id` parameter.
+"""
+import base64
+import json
+from decimal import Decimal
+from typing import Any, Optional, Sequence
+
+from fastapi import HTTPException, Response, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _plain(value: Any) -> Any:
+    return str(value) if isinstance(value, Decimal) else value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_plain(v) for v in values], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(token: Optional[str], size: int) -> Optional[list]:
+    if not token:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
+
+
+def set_next_cursor(response: Response, token: Optional[str]) -> None:
+    if token:
+        response.headers[NEXT_CURSOR_HEADER] = token
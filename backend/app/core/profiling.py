@@ -0,0 +1,267 @@
+"""
+Sampled, per-route statistical profiling.
+
+A request is profiled when `random() < PROFILING_SAMPLE_RATE` or when it
+carries a valid `X-Profile: <expires>.<signature>` header (see
+`sign_profile_header`). While at least one profiled request is in flight, a
+sampler thread snapshots the Python stacks of all busy threads every
+PROFILING_INTERVAL_MS and adds them to that request's counter; when the
+request ends the counts are merged under its route ("GET /orders/me").
+Unsampled requests cost one random() call and a header scan.
+
+Stacks come from every busy thread in the process (the event loop and the
+threadpool that runs sync endpoints, dependencies and response
+validation), so concurrent unprofiled requests can show up in a sample.
+Profiles are per worker process and kept in memory; read them from
+/admin/profiles as collapsed stacks (flamegraph.pl, speedscope) or as a
+speedscope JSON document.
+"""
+import hashlib
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+PROFILE_HEADER = b"x-profile"
+TRUNCATED = "[truncated]"
+
+# top Python frame of a thread that is waiting for work
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+}
+
+
+def _signature(secret: str, expires: int) -> str:
+    return hmac.new(secret.encode(), f"profile.{expires}".encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def sign_profile_header(secret: str, ttl_seconds: int = 3600) -> str:
+    """Value for the X-Profile header, valid for `ttl_seconds`"""
+    expires = int(time.time()) + ttl_seconds
+    return f"{expires}.{_signature(secret, expires)}"
+
+
+def verify_profile_header(secret: str, value: str) -> bool:
+    expires, _, sig = value.partition(".")
+    try:
+        expires_at = int(expires)
+    except ValueError:
+        return False
+    return expires_at >= time.time() and hmac.compare_digest(_signature(secret, expires_at), sig)
+
+
+class StackSampler:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._active: Dict[int, Counter] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._labels: Dict[object, str] = {}
+
+    def begin(self) -> Counter:
+        stacks: Counter = Counter()
+        with self._lock:
+            self._active[id(stacks)] = stacks
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+                self._thread.start()
+            self._wake.set()
+        return stacks
+
+    def end(self, stacks: Counter) -> None:
+        with self._lock:
+            self._active.pop(id(stacks), None)
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while True:
+            self._wake.wait()
+            with self._lock:
+                targets = list(self._active.values())
+                if not targets:
+                    self._wake.clear()
+                    continue
+            for tid, frame in sys._current_frames().items():
+                if tid == me:
+                    continue
+                stack = self._collapse(frame)
+                if stack:
+                    for stacks in targets:
+                        stacks[stack] += 1
+            time.sleep(self.interval)
+
+    def _collapse(self, frame) -> Optional[str]:
+        code = frame.f_code
+        if (os.path.basename(code.co_filename), code.co_name) in _IDLE_FRAMES:
+            return None
+        labels = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+                self._labels[code] = label
+            labels.append(label)
+            frame = frame.f_back
+        labels.reverse()
+        return ";".join(labels)
+
+
+def _short_path(path: str) -> str:
+    i = path.rfind("site-packages" + os.sep)
+    if i >= 0:
+        return path[i + len("site-packages") + 1:]
+    i = path.rfind(os.sep + "app" + os.sep)
+    if i >= 0:
+        return path[i + 1:]
+    return os.path.basename(path)
+
+
+class ProfileStore:
+    """Collapsed stack counts per route, bounded by PROFILING_MAX_STACKS distinct stacks per route"""
+
+    def __init__(self, max_stacks: int, interval: float):
+        self.max_stacks = max_stacks
+        self.interval = interval
+        self._routes: Dict[str, Counter] = {}
+        self._requests: Counter = Counter()
+        self._seconds: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, route: str, stacks: Counter, elapsed: float) -> None:
+        with self._lock:
+            agg = self._routes.setdefault(route, Counter())
+            for stack, n in stacks.items():
+                if stack in agg or len(agg) < self.max_stacks:
+                    agg[stack] += n
+                else:
+                    agg[TRUNCATED] += n
+            self._requests[route] += 1
+            self._seconds[route] += elapsed
+
+    def summary(self) -> list[dict]:
+        with self._lock:
+            return [
+                {
+                    "route": route,
+                    "requests": self._requests[route],
+                    "samples": sum(stacks.values()),
+                    "avg_ms": round(self._seconds[route] / self._requests[route] * 1000, 2),
+                }
+                for route, stacks in sorted(self._routes.items())
+            ]
+
+    def stacks(self, route: str) -> Optional[Counter]:
+        with self._lock:
+            stacks = self._routes.get(route)
+            return Counter(stacks) if stacks is not None else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self._requests.clear()
+            self._seconds.clear()
+
+    def collapsed(self, route: str) -> Optional[str]:
+        stacks = self.stacks(route)
+        if stacks is None:
+            return None
+        return "".join(f"{stack} {n}\n" for stack, n in stacks.most_common())
+
+    def speedscope(self, route: str) -> Optional[dict]:
+        stacks = self.stacks(route)
+        if stacks is None:
+            return None
+        frames, index = [], {}
+        samples, weights = [], []
+        for stack, n in stacks.most_common():
+            sample = []
+            for label in stack.split(";"):
+                if label not in index:
+                    index[label] = len(frames)
+                    frames.append({"name": label})
+                sample.append(index[label])
+            samples.append(sample)
+            weights.append(n * self.interval * 1000)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": route,
+            "exporter": "scp-profiling",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": route,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
+
+
+_store: Optional[ProfileStore] = None
+_sampler: Optional[StackSampler] = None
+
+
+def get_profile_store() -> ProfileStore:
+    global _store
+    if _store is None:
+        from app.core.config import get_settings
+        settings = get_settings()
+        _store = ProfileStore(settings.PROFILING_MAX_STACKS, settings.PROFILING_INTERVAL_MS / 1000)
+    return _store
+
+
+def _get_sampler() -> StackSampler:
+    global _sampler
+    if _sampler is None:
+        from app.core.config import get_settings
+        _sampler = StackSampler(get_settings().PROFILING_INTERVAL_MS / 1000)
+    return _sampler
+
+
+class ProfilingMiddleware:
+    def __init__(self, app, settings):
+        self.app = app
+        self.rate = settings.PROFILING_SAMPLE_RATE
+        self.secret = settings.SECRET_KEY if settings.PROFILING_ALLOW_SIGNED_HEADER else None
+        self.sampler = _get_sampler()
+        self.store = get_profile_store()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._sampled(scope):
+            await self.app(scope, receive, send)
+            return
+
+        stacks = self.sampler.begin()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.sampler.end(stacks)
+            route = scope.get("route")
+            key = f"{scope['method']} {route.path}" if route is not None else "unmatched"
+            self.store.add(key, stacks, time.perf_counter() - start)
+
+    def _sampled(self, scope) -> bool:
+        if self.rate and random.random() < self.rate:
+            return True
+        if self.secret is not None:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    return verify_profile_header(self.secret, value.decode("latin-1"))
+        return False
+
+
+if __name__ == "__main__":
+    # python -m app.core.profiling [ttl_seconds] -> X-Profile header value
+    from app.core.config import get_settings
+    print(sign_profile_header(get_settings().SECRET_KEY, int(sys.argv[1]) if len(sys.argv) > 1 else 3600))
@@ -0,0 +1,120 @@
+"""
+Read-your-writes pin carried by the client (pure ASGI).
+
+After a request commits a write, the response carries a signed pin
+`<user id>.<until ms>.<sig>` as the `read_pin` cookie and the `X-Read-Pin`
+header. Until it expires, read-only routes of that user stay on the primary
+(see get_read_db in core/deps.py). The pin travels with the client, so it
+holds whichever worker or host serves the next request; clients that don't
+keep cookies can echo the header instead.
+"""
+import hashlib
+import hmac
+import time
+from contextvars import ContextVar
+from http.cookies import CookieError, SimpleCookie
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+
+from app.core.config import get_settings
+
+COOKIE_NAME = "read_pin"
+HEADER_NAME = "X-Read-Pin"
+
+
+class _RequestPin:
+    """Pin sent with the request, and the writer to pin in the response"""
+    __slots__ = ("token", "writer_id")
+
+    def __init__(self, token: Optional[str]):
+        self.token = token
+        self.writer_id: Optional[int] = None
+
+
+_current: ContextVar[Optional[_RequestPin]] = ContextVar("read_pin", default=None)
+
+
+def _signature(user_id: int, until_ms: int) -> str:
+    msg = f"pin.{user_id}.{until_ms}".encode()
+    return hmac.new(get_settings().SECRET_KEY.encode(), msg, hashlib.sha256).hexdigest()[:32]
+
+
+def sign_pin(user_id: int, seconds: float) -> str:
+    until_ms = int((time.time() + seconds) * 1000)
+    return f"{user_id}.{until_ms}.{_signature(user_id, until_ms)}"
+
+
+def verify_pin(token: str, user_id: int) -> bool:
+    try:
+        pin_user, until, sig = token.split(".")
+        pin_user_id, until_ms = int(pin_user), int(until)
+    except ValueError:
+        return False
+    if pin_user_id != user_id or until_ms < time.time() * 1000:
+        return False
+    return hmac.compare_digest(_signature(user_id, until_ms), sig)
+
+
+def record_write(user_id: int) -> None:
+    """Pin `user_id` in the current response (no-op outside a ReadPinMiddleware request)"""
+    pin = _current.get()
+    if pin is not None:
+        pin.writer_id = user_id
+
+
+def is_pinned(user_id: int) -> bool:
+    """The current request carries a valid pin of `user_id`, or wrote as `user_id`"""
+    pin = _current.get()
+    if pin is None:
+        return False
+    if pin.writer_id == user_id:
+        return True
+    return pin.token is not None and verify_pin(pin.token, user_id)
+
+
+def _request_token(scope) -> Optional[str]:
+    header = HEADER_NAME.lower().encode()
+    cookie = None
+    for name, value in scope["headers"]:
+        if name == header:
+            return value.decode("latin-1")
+        if name == b"cookie":
+            cookie = value.decode("latin-1")
+    if cookie:
+        try:
+            morsel = SimpleCookie(cookie).get(COOKIE_NAME)
+        except CookieError:
+            return None
+        return morsel.value if morsel else None
+    return None
+
+
+class ReadPinMiddleware:
+    def __init__(self, app, settings):
+        self.app = app
+        self.seconds = settings.DB_READ_PIN_SECONDS
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        pin = _RequestPin(_request_token(scope))
+        reset = _current.set(pin)
+
+        async def send_with_pin(message):
+            if message["type"] == "http.response.start" and pin.writer_id is not None:
+                token = sign_pin(pin.writer_id, self.seconds)
+                headers = MutableHeaders(scope=message)
+                headers.append(HEADER_NAME, token)
+                headers.append(
+                    "Set-Cookie",
+                    f"{COOKIE_NAME}={token}; Max-Age={max(int(self.seconds), 1)}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_pin)
+        finally:
+            _current.reset(reset)
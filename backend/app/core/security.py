@@ -3,7 +3,7 @@ from datetime import datetime, timedelta
 import hashlib
 import base64
 from jose import jwt
-from app.core.config import settings
+from app.core.config import get_settings
 
 ALGORITHM = "HS256"
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -20,6 +20,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(password_b64, hashed_password)
 
 def create_access_token(sub: str) -> str:
+    settings = get_settings()
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode = {"sub": sub, "exp": expire}
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
@@ -0,0 +1,18 @@
+from uvicorn.workers import UvicornWorker as _UvicornWorker
+
+from app.core.config import get_settings
+
+
+class UvicornWorker(_UvicornWorker):
+    """Uvicorn worker for gunicorn with the C event loop and HTTP parser"""
+    CONFIG_KWARGS = {
+        "loop": "uvloop",
+        "http": "httptools",
+        "lifespan": "on",
+        "proxy_headers": True,
+    }
+
+    def __init__(self, *args, **kwargs):
+        # X-Forwarded-For / -Proto are only trusted from these proxies
+        self.CONFIG_KWARGS = {**self.CONFIG_KWARGS, "forwarded_allow_ips": get_settings().FORWARDED_ALLOW_IPS}
+        super().__init__(*args, **kwargs)
@@ -0,0 +1,100 @@
+"""
+Table-driven status workflows for orders and complaints.
+
+Each table maps current status -> target status -> roles allowed to make
+that move. Services call `ensure(current, target, role)`, then apply the
+change as a compare-and-set UPDATE (`WHERE status = current`) so a
+concurrent transition is detected instead of overwritten.
+"""
+from enum import Enum
+from typing import FrozenSet, Generic, Mapping, Optional, Set, TypeVar
+
+from app.enums import ComplaintStatus, OrderStatus, Role
+
+S = TypeVar("S", bound=Enum)
+
+
+class TransitionNotAllowed(ValueError):
+    """current -> target is not an edge of the workflow"""
+
+
+class StateMachine(Generic[S]):
+    def __init__(self, name: str, transitions: Mapping[S, Mapping[S, FrozenSet[Role]]]):
+        self.name = name
+        self.transitions = transitions
+        self.terminal: FrozenSet[S] = frozenset(s for s, targets in transitions.items() if not targets)
+        self.active: FrozenSet[S] = frozenset(s for s, targets in transitions.items() if targets)
+
+    def targets(self, current: S, role: Optional[Role] = None) -> Set[S]:
+        return {
+            target for target, roles in self.transitions.get(current, {}).items()
+            if role is None or role in roles
+        }
+
+    def roles_for(self, target: S) -> FrozenSet[Role]:
+        """Roles that can move some status to `target`"""
+        roles: FrozenSet[Role] = frozenset()
+        for targets in self.transitions.values():
+            roles |= targets.get(target, frozenset())
+        return roles
+
+    def ensure(self, current: S, target: S, role: Role) -> None:
+        """Raises TransitionNotAllowed for a missing edge, PermissionError for the wrong role"""
+        roles = self.transitions.get(current, {}).get(target)
+        if roles is None:
+            raise TransitionNotAllowed(
+                f"Cannot change {self.name} status {current.value} -> {target.value}"
+            )
+        if role not in roles:
+            raise PermissionError(
+                f"Role {role.value} cannot change {self.name} status {current.value} -> {target.value}"
+            )
+
+
+_SUPPLIER_DECIDERS = frozenset({Role.SUPPLIER_OWNER, Role.SUPPLIER_MANAGER})
+_SUPPLIER_STAFF = frozenset({Role.SUPPLIER_OWNER, Role.SUPPLIER_MANAGER, Role.SUPPLIER_SALES})
+
+ORDER_FLOW: StateMachine[OrderStatus] = StateMachine("order", {
+    OrderStatus.CREATED: {
+        OrderStatus.ACCEPTED: _SUPPLIER_DECIDERS,
+        OrderStatus.REJECTED: _SUPPLIER_DECIDERS,
+        OrderStatus.CANCELLED: _SUPPLIER_DECIDERS | {Role.CONSUMER},
+    },
+    OrderStatus.ACCEPTED: {
+        OrderStatus.SHIPPED: _SUPPLIER_STAFF,
+        OrderStatus.CANCELLED: _SUPPLIER_DECIDERS,
+    },
+    OrderStatus.SHIPPED: {
+        # consumer confirms receipt, or the supplier records the delivery
+        OrderStatus.DELIVERED: _SUPPLIER_STAFF | {Role.CONSUMER},
+    },
+    OrderStatus.DELIVERED: {},
+    OrderStatus.REJECTED: {},
+    OrderStatus.CANCELLED: {},
+})
+
+COMPLAINT_FLOW: StateMachine[ComplaintStatus] = StateMachine("complaint", {
+    ComplaintStatus.OPEN: {
+        ComplaintStatus.IN_PROGRESS: frozenset({Role.SUPPLIER_OWNER}),
+        ComplaintStatus.RESOLVED: frozenset({Role.SUPPLIER_OWNER}),
+        ComplaintStatus.ESCALATED: frozenset({Role.SUPPLIER_SALES}),
+    },
+    ComplaintStatus.IN_PROGRESS: {
+        ComplaintStatus.RESOLVED: frozenset({Role.SUPPLIER_OWNER}),
+        ComplaintStatus.ESCALATED: frozenset({Role.SUPPLIER_SALES}),
+    },
+    ComplaintStatus.ESCALATED: {
+        ComplaintStatus.IN_PROGRESS: frozenset({Role.SUPPLIER_OWNER}),
+        ComplaintStatus.RESOLVED: frozenset({Role.SUPPLIER_OWNER}),
+    },
+    ComplaintStatus.RESOLVED: {},
+})
+
+# open orders (non-terminal); the partial indexes on orders use the same list
+ACTIVE_ORDER_STATUSES = tuple(s for s in OrderStatus if s in ORDER_FLOW.active)
+
+# complaints still being worked on
+OPEN_COMPLAINT_STATUSES = tuple(s for s in ComplaintStatus if s in COMPLAINT_FLOW.active)
+
+# moving an order into these gives its reserved stock back (stock_movements ORDER_RELEASE)
+STOCK_RELEASING_STATUSES = frozenset({OrderStatus.REJECTED, OrderStatus.CANCELLED})
@@ -1 +1 @@
-from app.models import user, supplier, supplier_staff, link, product, order, order_item, message, complaint
\ No newline at end of file
+from app.models import user, supplier, supplier_staff, link, product, order, order_item, message, complaint, order_template, order_template_item, outbox_event, audit_log, attachment, order_status_history, product_price_history, price_tier, link_price, stock_movement, stock_snapshot, product_archive, order_item_archive
\ No newline at end of file
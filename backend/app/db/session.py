@@ -1,9 +1,120 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+from app.core.read_pin import record_write
 
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+Base = declarative_base()
 
-Base = declarative_base()
\ No newline at end of file
+# Bound to the engine on first use (or in the app lifespan), so importing
+# models neither reads settings nor builds an engine.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+# Sessions on the read replica (DATABASE_READ_URL); see get_read_db in core/deps.py
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+_engine: Engine | None = None
+_read_engine: Engine | None = None
+_read_engine_checked = False
+
+
+def create_db_engine(settings, url: str | None = None) -> Engine:
+    url = url or settings.DATABASE_URL
+    if url.startswith("sqlite"):
+        # local stand-in for a replica; SQLite has its own pooling
+        return create_engine(url)
+    return create_engine(
+        url,
+        pool_pre_ping=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+
+
+def get_engine() -> Engine:
+    """Process-wide engine, created from the current settings on first call"""
+    global _engine
+    if _engine is None:
+        from app.core.config import get_settings
+        _engine = create_db_engine(get_settings())
+        SessionLocal.configure(bind=_engine)
+    return _engine
+
+
+def get_read_engine() -> Engine | None:
+    """Replica engine, or None when DATABASE_READ_URL is not set"""
+    global _read_engine, _read_engine_checked
+    if not _read_engine_checked:
+        from app.core.config import get_settings
+        settings = get_settings()
+        if settings.DATABASE_READ_URL:
+            _read_engine = create_db_engine(settings, settings.DATABASE_READ_URL)
+            ReadSessionLocal.configure(bind=_read_engine)
+        _read_engine_checked = True
+    return _read_engine
+
+
+def reset_engine() -> None:
+    """Dispose the current engines; the next get_engine() builds new ones"""
+    global _engine, _read_engine, _read_engine_checked
+    for engine in (_engine, _read_engine):
+        if engine is not None:
+            engine.dispose()
+    _engine = _read_engine = None
+    _read_engine_checked = False
+
+
+def warm_pool(size: int | None = None) -> None:
+    """Open `size` pooled connections up front so the first requests don't pay for connect"""
+    for engine in (get_engine(), get_read_engine()):
+        if engine is None:
+            continue
+        conns = [engine.connect() for _ in range(size or engine.pool.size())]
+        for conn in conns:
+            conn.close()
+
+
+def dispose_engine() -> None:
+    """Close all pooled connections (worker shutdown)"""
+    for engine in (_engine, _read_engine):
+        if engine is not None:
+            engine.dispose()
+
+
+# --- read-your-writes ---
+# A user who committed a write reads from the primary for DB_READ_PIN_SECONDS,
+# so replica lag never hides their own change. The pin is a signed token the
+# client sends back (app/core/read_pin.py), so it holds across workers and hosts.
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _mark_flush_write(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _mark_statement_write(orm_execute_state):
+    # bulk UPDATE/INSERT/DELETE issued through session.execute()
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _pin_writer(session):
+    if session.info.pop("wrote", False):
+        actor_id = session.info.get("actor_id")
+        if actor_id is not None:
+            record_write(actor_id)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _clear_write(session):
+    session.info.pop("wrote", None)
+
+
+def __getattr__(name: str):
+    # `from app.db.session import engine` keeps working, created on first access
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,5 +3,7 @@ from .link_status import LinkStatus
 from .order_status import OrderStatus
 from .complaint_status import ComplaintStatus
 from .message_kind import MessageKind
+from .complaint_age_bucket import ComplaintAgeBucket
+from .stock_movement_reason import StockMovementReason
 
-__all__ = ["Role", "LinkStatus", "OrderStatus", "ComplaintStatus", "MessageKind"]
+__all__ = ["Role", "LinkStatus", "OrderStatus", "ComplaintStatus", "MessageKind", "ComplaintAgeBucket", "StockMovementReason"]
@@ -0,0 +1,7 @@
+from enum import Enum
+
+class ComplaintAgeBucket(Enum):
+    LT_4H = "LT_4H"
+    H4_24 = "H4_24"
+    D1_3 = "D1_3"
+    GT_3D = "GT_3D"
@@ -4,3 +4,6 @@ class OrderStatus(Enum):
     CREATED = "CREATED"
     ACCEPTED = "ACCEPTED"
     REJECTED = "REJECTED"
+    SHIPPED = "SHIPPED"
+    DELIVERED = "DELIVERED"
+    CANCELLED = "CANCELLED"
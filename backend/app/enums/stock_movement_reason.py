@@ -0,0 +1,7 @@
+from enum import Enum
+
+class StockMovementReason(Enum):
+    ORDER = "ORDER"                  # reserved by a placed order
+    ORDER_RELEASE = "ORDER_RELEASE"  # given back when the order is rejected/cancelled
+    ADJUSTMENT = "ADJUSTMENT"        # manual correction by supplier staff
+    IMPORT = "IMPORT"                # bulk warehouse import
@@ -0,0 +1,91 @@
+"""
+Stock ledger compaction: folds stock_movements into stock_snapshots so that
+reading available stock only sums the few movements since the last run, and
+deletes folded movements past INVENTORY_RETENTION_DAYS.
+
+    python -m app.inventory.compaction          # once
+    python -m app.inventory.compaction --loop   # every INVENTORY_COMPACT_INTERVAL seconds
+
+Running several instances is safe (each fold takes a table lock), but one is
+enough.
+"""
+import argparse
+import logging
+import signal
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import get_settings
+from app.db import base  # noqa: F401  (register all models)
+from app.db.session import SessionLocal, get_engine
+from app.repositories.inventory_repo import InventoryRepo
+
+logger = logging.getLogger("scp.inventory")
+
+
+def compact_once(prune: bool = True) -> tuple[int, int]:
+    """(snapshots updated, movements pruned)"""
+    settings = get_settings()
+    db = SessionLocal()
+    try:
+        try:
+            folded = InventoryRepo.compact(db, settings.INVENTORY_COMPACT_LOCK_TIMEOUT_MS)
+        except OperationalError as e:
+            # lock_timeout: a long transaction holds stock_movements, try next time
+            db.rollback()
+            logger.warning("stock compaction skipped: %s", e.orig)
+            return 0, 0
+        pruned = 0
+        if prune:
+            cutoff = datetime.now(timezone.utc) - timedelta(days=settings.INVENTORY_RETENTION_DAYS)
+            pruned = InventoryRepo.prune(db, cutoff)
+        return folded, pruned
+    finally:
+        db.close()
+
+
+def run_forever() -> None:
+    settings = get_settings()
+    stopping = False
+
+    def _stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    last_prune = 0.0
+    while not stopping:
+        prune = time.monotonic() - last_prune > 3600
+        try:
+            folded, pruned = compact_once(prune=prune)
+            if prune:
+                last_prune = time.monotonic()
+            logger.info("stock compaction: %s snapshots updated, %s movements pruned", folded, pruned)
+        except Exception:
+            logger.exception("stock compaction failed")
+        deadline = time.monotonic() + settings.INVENTORY_COMPACT_INTERVAL
+        while not stopping and time.monotonic() < deadline:
+            time.sleep(min(1.0, settings.INVENTORY_COMPACT_INTERVAL))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fold stock movements into snapshots")
+    parser.add_argument("--loop", action="store_true", help="keep running every INVENTORY_COMPACT_INTERVAL seconds")
+    parser.add_argument("--no-prune", action="store_true", help="keep folded movements")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    get_engine()
+    if args.loop:
+        run_forever()
+    else:
+        folded, pruned = compact_once(prune=not args.no_prune)
+        print(f"snapshots updated: {folded}, movements pruned: {pruned}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,104 @@
+"""
+Application factory.
+
+`create_app(settings)` builds the FastAPI app; routers, models and outbox
+listeners are imported inside the factory, and the DB engine is created in
+the lifespan rather than at import time. `app.main:app` is still available
+for uvicorn/gunicorn and is built on first access.
+"""
+from contextlib import asynccontextmanager
+from typing import Optional
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.db import base  
-from app.routers import auth as auth_router
-from app.routers import suppliers as suppliers_router
-from app.routers import links  as links_router
-from app.routers import products as products_router
-from app.routers import orders as orders_router
-from app.routers import chat as chat_router
-from app.routers import complaints as complaints_router
-from app.routers import staff as staff_router
 
+from app.core.config import Settings, configure_settings, get_settings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from app.audit.logger import close_audit_logger
+    from app.db.session import dispose_engine, get_engine
+
+    app.state.engine = get_engine()
+    try:
+        yield
+    finally:
+        close_audit_logger()
+        dispose_engine()
+
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    if settings is not None:
+        configure_settings(settings)
+
+    from app.db import base  # noqa: F401  registers all models on Base.metadata
+    from app.outbox import listeners as outbox_listeners  # noqa: F401  registers outbox mapper events
+    from app.routers import auth as auth_router
+    from app.routers import suppliers as suppliers_router
+    from app.routers import links as links_router
+    from app.routers import products as products_router
+    from app.routers import orders as orders_router
+    from app.routers import chat as chat_router
+    from app.routers import complaints as complaints_router
+    from app.routers import staff as staff_router
+    from app.routers import catalog as catalog_router
+    from app.routers import admin as admin_router
+
+    app = FastAPI(title="SCP API", lifespan=lifespan)
+
+    if get_settings().RATE_LIMIT_ENABLED:
+        from app.ratelimit.middleware import RateLimitMiddleware
+        # added before CORS so 429 responses still carry CORS headers
+        app.add_middleware(RateLimitMiddleware, settings=get_settings())
 
+    if get_settings().PROFILING_SAMPLE_RATE or get_settings().PROFILING_ALLOW_SIGNED_HEADER:
+        from app.core.profiling import ProfilingMiddleware
+        app.add_middleware(ProfilingMiddleware, settings=get_settings())
 
+    if get_settings().COMPRESSION_ENABLED:
+        from app.core.compression import CompressionMiddleware
+        app.add_middleware(CompressionMiddleware, settings=get_settings())
 
+    if get_settings().DATABASE_READ_URL:
+        from app.core.read_pin import ReadPinMiddleware
+        app.add_middleware(ReadPinMiddleware, settings=get_settings())
 
-app = FastAPI(title="SCP API")
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["ETag", "X-Next-Cursor", "X-Read-Pin"],
+    )
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
 
-@app.get("/health")
-def health():
-    return {"status": "ok"}
+    app.include_router(auth_router.router)
+    app.include_router(suppliers_router.router)
+    app.include_router(links_router.router)
+    app.include_router(products_router.router)
+    app.include_router(orders_router.router)
+    app.include_router(chat_router.router)
+    app.include_router(complaints_router.router)
+    app.include_router(staff_router.router)
+    app.include_router(catalog_router.router)
+    app.include_router(admin_router.router)
 
+    return app
 
 
-app.include_router(auth_router.router)
-app.include_router(suppliers_router.router)
-app.include_router(links_router.router)
-app.include_router(products_router.router)
-app.include_router(orders_router.router)
-app.include_router(chat_router.router)
-app.include_router(complaints_router.router)
-app.include_router(staff_router.router)
+_app: Optional[FastAPI] = None
 
 
+def __getattr__(name: str):
+    # `uvicorn app.main:app` / gunicorn resolve `app` here, on first access
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Integer, ForeignKey, Enum, Text, DateTime
+from sqlalchemy import Integer, ForeignKey, Enum, Text, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -9,9 +9,18 @@ from app.enums import ComplaintStatus
 
 class Complaint(Base):
     __tablename__ = "complaints"
+    __table_args__ = (
+        # supplier listing/queue, keyset on id
+        Index("ix_complaints_supplier_status_id", "supplier_id", "status", "id"),
+        # assignee "my queue"
+        Index("ix_complaints_assigned_status_id", "assigned_to_id", "status", "id"),
+    )
+
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     link_id: Mapped[int | None] = mapped_column(ForeignKey("links.id"), index=True, nullable=True)
-    order_id: Mapped[int | None] = mapped_column(ForeignKey("orders.id"), index=True, nullable=True)
+    order_id: Mapped[int | None] = mapped_column(Integer, index=True, nullable=True)   # orders.id, no FK: orders is partitioned
+    # Denormalized from link/order at creation so supplier queries need no join
+    supplier_id: Mapped[int | None] = mapped_column(ForeignKey("suppliers.id"), nullable=True)
     description: Mapped[str] = mapped_column(Text, nullable=False)
     status: Mapped[ComplaintStatus] = mapped_column(
         Enum(ComplaintStatus), default=ComplaintStatus.OPEN, nullable=False
@@ -25,6 +34,10 @@ class Complaint(Base):
     assigned_to_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True)
     escalated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     resolved_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # optimistic lock, see app/core/concurrency.py
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
 
     # Relationships
     creator = relationship("User", foreign_keys=[created_by], lazy="joined")
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, ForeignKey, Enum, UniqueConstraint
+from sqlalchemy import Integer, ForeignKey, Enum, UniqueConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.session import Base
 from app.enums.link_status import LinkStatus
@@ -7,6 +7,10 @@ class Link(Base):
     __tablename__ = "links"
     __table_args__ = (
         UniqueConstraint("consumer_id", "supplier_id", name="uq_consumer_supplier"),
+        # supplier queue: WHERE supplier_id = ? AND status = ? ORDER BY id DESC
+        Index("ix_links_supplier_status_id", "supplier_id", "status", "id"),
+        # consumer's accepted supplier ids (LinkRepo.accepted_supplier_ids): index-only scan
+        Index("ix_links_consumer_status", "consumer_id", "status", postgresql_include=["supplier_id"]),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -0,0 +1,18 @@
+from decimal import Decimal
+from sqlalchemy import Integer, ForeignKey, Numeric, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.session import Base
+
+
+class LinkPrice(Base):
+    """Price negotiated with one consumer (link) for a product, optionally from a quantity"""
+    __tablename__ = "link_prices"
+    __table_args__ = (
+        UniqueConstraint("link_id", "product_id", "min_quantity", name="uq_link_prices_link_product_min_qty"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    link_id: Mapped[int] = mapped_column(ForeignKey("links.id", ondelete="CASCADE"), nullable=False)
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id", ondelete="CASCADE"), index=True, nullable=False)
+    min_quantity: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
+    price: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
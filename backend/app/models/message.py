@@ -1,12 +1,18 @@
 from datetime import datetime
-from sqlalchemy import Integer, ForeignKey, String, Text, DateTime
+from sqlalchemy import Integer, ForeignKey, String, Text, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.session import Base
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        # MessageRepo.list_by_link: newest first, one index range per partition
+        Index("ix_messages_link_created", "link_id", "created_at"),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    # Partitioned by month of created_at (app/archive/partitions.py): the
+    # table key is (id, created_at), id alone is the ORM identity
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, index=True)
     link_id: Mapped[int] = mapped_column(ForeignKey("links.id"), index=True)
     sender_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
 
@@ -14,7 +20,9 @@ class Message(Base):
     file_url: Mapped[str | None] = mapped_column(String(1024), nullable=True)
     audio_url: Mapped[str | None] = mapped_column(String(1024), nullable=True)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False, index=True, primary_key=True)
+
+    __mapper_args__ = {"primary_key": [id]}
 
     # Relationships for populated responses
     link = relationship("Link", lazy="joined")
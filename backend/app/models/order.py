@@ -1,5 +1,6 @@
 from datetime import datetime
-from sqlalchemy import Integer, ForeignKey, Enum, Numeric, DateTime
+from decimal import Decimal
+from sqlalchemy import Integer, ForeignKey, Enum, Numeric, DateTime, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 from app.db.session import Base
@@ -7,17 +8,47 @@ from app.enums import OrderStatus
 
 class Order(Base):
     __tablename__ = "orders"
-    
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    __table_args__ = (
+        # "active orders" lists only touch open orders (ACTIVE_ORDER_STATUSES in app/core/transitions.py)
+        Index("ix_orders_supplier_active", "supplier_id", "created_at",
+              postgresql_where=text("status IN ('CREATED', 'ACCEPTED', 'SHIPPED')")),
+        Index("ix_orders_consumer_active", "consumer_id", "created_at",
+              postgresql_where=text("status IN ('CREATED', 'ACCEPTED', 'SHIPPED')")),
+    )
+
+    # Partitioned by month of created_at (app/archive/partitions.py), so the
+    # table key is (id, created_at); id alone stays unique (one sequence) and
+    # is the ORM identity. Other tables reference orders by id without a
+    # database FK, which postgres only allows on the full partition key.
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     supplier_id: Mapped[int] = mapped_column(ForeignKey("suppliers.id"), index=True)
     consumer_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
-    total_amount: Mapped[float] = mapped_column(Numeric(12, 2), default=0)
+    total_amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), default=0)
     status: Mapped[OrderStatus] = mapped_column(Enum(OrderStatus), default=OrderStatus.CREATED)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True), server_default=func.now(), nullable=False, primary_key=True
     )
+    # optimistic lock, see app/core/concurrency.py; bulk UPDATEs bump it by hand
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version, "primary_key": [id]}
 
     # Relationships for populated responses
     supplier = relationship("Supplier", lazy="joined")
     consumer = relationship("User", foreign_keys=[consumer_id], lazy="joined")
-    items = relationship("OrderItem", back_populates="order", lazy="joined")
+    items = relationship(
+        "OrderItem", back_populates="order", lazy="joined",
+        primaryjoin="Order.id == foreign(OrderItem.order_id)",
+    )
+    # lines of archived products (app/archive/products.py); list queries selectin-load them
+    archived_items = relationship(
+        "OrderItemArchive", lazy="select", order_by="OrderItemArchive.id",
+        primaryjoin="Order.id == foreign(OrderItemArchive.order_id)",
+    )
+
+    @property
+    def lines(self) -> list:
+        """Every line of the order, including those moved to the archive"""
+        if not self.archived_items:
+            return list(self.items)
+        return sorted([*self.items, *self.archived_items], key=lambda item: item.id)
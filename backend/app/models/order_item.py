@@ -1,3 +1,4 @@
+from decimal import Decimal
 from sqlalchemy import Integer, ForeignKey, Numeric
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.session import Base
@@ -7,12 +8,15 @@ class OrderItem(Base):
     __tablename__ = "order_items"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    order_id: Mapped[int] = mapped_column(ForeignKey("orders.id"), index=True)
+    order_id: Mapped[int] = mapped_column(Integer, index=True)   # orders.id, no FK: orders is partitioned
     product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), index=True)
     quantity: Mapped[int] = mapped_column(Integer, nullable=False)
-    unit_price: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False)
+    unit_price: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
 
     # Relationships
     product = relationship("Product", lazy="joined")
-    order = relationship("Order", back_populates="items", lazy="select")
+    order = relationship(
+        "Order", back_populates="items", lazy="select",
+        primaryjoin="Order.id == foreign(OrderItem.order_id)",
+    )
 
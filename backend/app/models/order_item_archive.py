@@ -0,0 +1,20 @@
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import Integer, ForeignKey, Numeric, DateTime
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class OrderItemArchive(Base):
+    """Order line of an archived product, moved out of `order_items` with its original id"""
+    __tablename__ = "order_items_archive"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    order_id: Mapped[int] = mapped_column(Integer, index=True)   # orders.id, no FK: orders is partitioned
+    product_id: Mapped[int] = mapped_column(ForeignKey("products_archive.id"), index=True)
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False)
+    unit_price: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    product = relationship("ProductArchive", lazy="joined")
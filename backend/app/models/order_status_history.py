@@ -0,0 +1,21 @@
+from datetime import datetime
+from sqlalchemy import BigInteger, Integer, Enum, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from app.db.session import Base
+from app.enums import OrderStatus
+
+
+class OrderStatusHistory(Base):
+    """Append-only log of order status changes, written in the same transaction as the change"""
+    __tablename__ = "order_status_history"
+    __table_args__ = (
+        Index("ix_order_status_history_order_at", "order_id", "at"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    order_id: Mapped[int] = mapped_column(Integer, nullable=False)   # orders.id, no FK: orders is partitioned
+    from_status: Mapped[OrderStatus | None] = mapped_column(Enum(OrderStatus), nullable=True)  # NULL = created
+    to_status: Mapped[OrderStatus] = mapped_column(Enum(OrderStatus), nullable=False)
+    actor_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,27 @@
+from datetime import datetime
+from sqlalchemy import Integer, ForeignKey, String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class OrderTemplate(Base):
+    """Saved basket a consumer can re-order from a supplier in one call"""
+    __tablename__ = "order_templates"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    consumer_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
+    supplier_id: Mapped[int] = mapped_column(ForeignKey("suppliers.id"), index=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    # Relationships
+    supplier = relationship("Supplier", lazy="joined")
+    items = relationship(
+        "OrderTemplateItem",
+        back_populates="template",
+        lazy="joined",
+        cascade="all, delete-orphan",
+    )
@@ -0,0 +1,15 @@
+from sqlalchemy import Integer, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from app.db.session import Base
+
+
+class OrderTemplateItem(Base):
+    __tablename__ = "order_template_items"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    template_id: Mapped[int] = mapped_column(ForeignKey("order_templates.id", ondelete="CASCADE"), index=True)
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), index=True)
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # Relationships
+    template = relationship("OrderTemplate", back_populates="items", lazy="select")
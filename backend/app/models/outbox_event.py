@@ -0,0 +1,32 @@
+from datetime import datetime
+from sqlalchemy import Integer, String, Text, DateTime, JSON, Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class OutboxEvent(Base):
+    """
+    Side-effect event written in the same transaction as the change that caused it.
+    Drained asynchronously by the outbox worker (app/outbox/worker.py).
+    """
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        # worker claims pending events in id order; dead letters (failed_at) drop out
+        Index("ix_outbox_events_pending", "id", postgresql_where=text("processed_at IS NULL AND failed_at IS NULL")),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    event_type: Mapped[str] = mapped_column(String(64), nullable=False)
+    aggregate_type: Mapped[str] = mapped_column(String(32), nullable=False)
+    aggregate_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    actor_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    processed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # dead letter: gave up after OUTBOX_MAX_ATTEMPTS; kept OUTBOX_DEAD_RETENTION_HOURS for inspection
+    failed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
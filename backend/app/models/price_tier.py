@@ -0,0 +1,17 @@
+from decimal import Decimal
+from sqlalchemy import Integer, ForeignKey, Numeric, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.session import Base
+
+
+class PriceTier(Base):
+    """Quantity break: unit price for lines of at least `min_quantity`"""
+    __tablename__ = "product_price_tiers"
+    __table_args__ = (
+        UniqueConstraint("product_id", "min_quantity", name="uq_product_price_tiers_product_min_qty"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    min_quantity: Mapped[int] = mapped_column(Integer, nullable=False)
+    price: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
@@ -1,18 +1,71 @@
-from sqlalchemy import Integer, ForeignKey, String, Numeric, Boolean
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import Integer, ForeignKey, String, Numeric, Boolean, DateTime, Index, select, func, text, literal_column
+from sqlalchemy.orm import Mapped, mapped_column, relationship, column_property
 from app.db.session import Base
+from app.models.stock_movement import StockMovement
+from app.models.stock_snapshot import StockSnapshot
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        # consumer catalog: WHERE supplier_id = ? AND is_active AND deleted_at IS NULL ORDER BY id DESC
+        Index("ix_products_supplier_active_id", "supplier_id", "id",
+              postgresql_where=text("is_active AND deleted_at IS NULL")),
+        # owner catalog: every live product
+        Index("ix_products_supplier_live_id", "supplier_id", "id", postgresql_where=text("deleted_at IS NULL")),
+        # archival job (app/archive/products.py) finds long-deleted products
+        Index("ix_products_deleted_at", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
+        # name search: ILIKE '%q%' (pg_trgm)
+        Index("ix_products_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     supplier_id: Mapped[int] = mapped_column(ForeignKey("suppliers.id"), index=True)
     name: Mapped[str] = mapped_column(String(255), index=True)
     unit: Mapped[str] = mapped_column(String(32))   # kg | liter | pack
-    price: Mapped[float] = mapped_column(Numeric(12, 2))
-    stock: Mapped[int] = mapped_column(Integer, default=0)
+    price: Mapped[Decimal] = mapped_column(Numeric(12, 2))
     moq: Mapped[int] = mapped_column(Integer, default=1)
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="true")
+    # soft delete: hidden everywhere, kept for order history until archived
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # optimistic lock, see app/core/concurrency.py
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
+
+    # Available stock: snapshot + ledger deltas after it. Read-only; stock
+    # changes are StockMovement rows (InventoryRepo), so orders never lock
+    # the product row.
+    stock: Mapped[int] = column_property(
+        func.coalesce(
+            select(StockSnapshot.quantity)
+            .where(StockSnapshot.product_id == id)
+            .correlate_except(StockSnapshot)
+            .scalar_subquery(),
+            0,
+        )
+        + select(func.coalesce(func.sum(StockMovement.delta), 0))
+        .where(
+            StockMovement.product_id == id,
+            StockMovement.id > func.coalesce(
+                select(StockSnapshot.last_movement_id)
+                .where(StockSnapshot.product_id == id)
+                .correlate_except(StockSnapshot)
+                .scalar_subquery(),
+                0,
+            ),
+        )
+        .correlate_except(StockMovement)
+        .scalar_subquery()
+    )
 
     # Relationship for populated responses (optional, use selectinload when needed)
-    supplier = relationship("Supplier", lazy="select")
\ No newline at end of file
+    supplier = relationship("Supplier", lazy="select")
+
+
+# Word search across suppliers (ProductRepo.search). 'simple': no stemming, so
+# the same words match whatever language the catalog is in
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+NAME_TSVECTOR = func.to_tsvector(SEARCH_CONFIG, Product.name)
+Index("ix_products_name_tsv", NAME_TSVECTOR, postgresql_using="gin")
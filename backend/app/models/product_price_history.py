@@ -0,0 +1,21 @@
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import BigInteger, Integer, ForeignKey, Numeric, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class ProductPriceHistory(Base):
+    """Append-only log of product prices; a row is valid from `valid_from` until the next one"""
+    __tablename__ = "product_price_history"
+    __table_args__ = (
+        # as-of lookups: latest valid_from <= :at per product
+        Index("ix_product_price_history_product_valid_from", "product_id", "valid_from"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    price: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
+    valid_from: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    changed_by: Mapped[int | None] = mapped_column(Integer, nullable=True)
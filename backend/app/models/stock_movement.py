@@ -0,0 +1,28 @@
+from datetime import datetime
+from sqlalchemy import BigInteger, Integer, ForeignKey, Enum, String, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from app.db.session import Base
+from app.enums import StockMovementReason
+
+
+class StockMovement(Base):
+    """
+    Append-only inventory ledger. Available stock is the product's
+    StockSnapshot plus the deltas after its `last_movement_id`
+    (app/inventory/compaction.py folds them in periodically).
+    """
+    __tablename__ = "stock_movements"
+    __table_args__ = (
+        # tail sum after the snapshot: range scan, delta read from the index
+        Index("ix_stock_movements_product_id_id", "product_id", "id", postgresql_include=["delta"]),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    delta: Mapped[int] = mapped_column(Integer, nullable=False)
+    reason: Mapped[StockMovementReason] = mapped_column(Enum(StockMovementReason), nullable=False)
+    order_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    actor_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    note: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
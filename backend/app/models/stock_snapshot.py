@@ -0,0 +1,15 @@
+from datetime import datetime
+from sqlalchemy import BigInteger, Integer, ForeignKey, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class StockSnapshot(Base):
+    """Stock of a product with all movements up to `last_movement_id` folded in"""
+    __tablename__ = "stock_snapshots"
+
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    last_movement_id: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+    taken_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -9,6 +9,8 @@ class Supplier(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String(255), unique=True, index=True)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # bumped on tier / negotiated price edits; stamps cached price tables (app/pricing/engine.py)
+    pricing_version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
 
     owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
     owner = relationship(User, lazy="joined")
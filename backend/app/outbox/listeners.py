@@ -0,0 +1,122 @@
+"""
+Mapper events that write outbox rows for ORM inserts/updates.
+
+They run inside the flush, on the flush's connection, so each outbox row is
+committed atomically with the message/order/link/complaint change. Bulk
+UPDATE statements bypass mapper events and write their events explicitly
+through OutboxRepo.add_many.
+
+The acting user is read from `session.info["actor_id"]`, set by auth_bearer.
+"""
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import object_session
+
+from app.enums import ComplaintStatus
+from app.models.complaint import Complaint
+from app.models.link import Link
+from app.models.message import Message
+from app.models.order import Order
+from app.models.product import Product
+from app.repositories.outbox_repo import OutboxRepo
+
+
+def _value(v):
+    return getattr(v, "value", v)
+
+
+def _actor_id(target):
+    session = object_session(target)
+    return session.info.get("actor_id") if session is not None else None
+
+
+def _status_change(target):
+    """(old, new) status values if `status` changed in this flush, else None"""
+    history = inspect(target).attrs.status.history
+    if not history.has_changes():
+        return None
+    old = _value(history.deleted[0]) if history.deleted else None
+    new = _value(target.status)
+    if old == new:
+        return None
+    return old, new
+
+
+def _emit(connection, target, event_type: str, aggregate_type: str, payload: dict) -> None:
+    OutboxRepo.add_on_connection(
+        connection,
+        event_type=event_type,
+        aggregate_type=aggregate_type,
+        aggregate_id=target.id,
+        actor_id=_actor_id(target),
+        payload=payload,
+    )
+
+
+@event.listens_for(Message, "after_insert")
+def _message_created(mapper, connection, target: Message):
+    _emit(connection, target, "message.created", "message", {
+        "link_id": target.link_id,
+        "sender_id": target.sender_id,
+        "has_file": bool(target.file_url),
+        "has_audio": bool(target.audio_url),
+    })
+
+
+@event.listens_for(Order, "after_insert")
+def _order_created(mapper, connection, target: Order):
+    _emit(connection, target, "order.created", "order", {
+        "supplier_id": target.supplier_id,
+        "consumer_id": target.consumer_id,
+        "total_amount": str(target.total_amount),
+    })
+
+
+@event.listens_for(Order, "after_update")
+def _order_updated(mapper, connection, target: Order):
+    change = _status_change(target)
+    if change:
+        _emit(connection, target, "order.status_changed", "order", {
+            "supplier_id": target.supplier_id,
+            "consumer_id": target.consumer_id,
+            "from": change[0],
+            "to": change[1],
+        })
+
+
+@event.listens_for(Link, "after_insert")
+def _link_requested(mapper, connection, target: Link):
+    _emit(connection, target, "link.requested", "link", {
+        "supplier_id": target.supplier_id,
+        "consumer_id": target.consumer_id,
+    })
+
+
+@event.listens_for(Link, "after_update")
+def _link_updated(mapper, connection, target: Link):
+    change = _status_change(target)
+    if change:
+        _emit(connection, target, "link.status_changed", "link", {
+            "supplier_id": target.supplier_id,
+            "consumer_id": target.consumer_id,
+            "from": change[0],
+            "to": change[1],
+        })
+
+
+@event.listens_for(Complaint, "after_update")
+def _complaint_updated(mapper, connection, target: Complaint):
+    change = _status_change(target)
+    if change and change[1] == ComplaintStatus.ESCALATED.value:
+        _emit(connection, target, "complaint.escalated", "complaint", {
+            "supplier_id": target.supplier_id,
+            "assigned_to_id": target.assigned_to_id,
+            "from": change[0],
+        })
+
+
+@event.listens_for(Product, "after_insert")
+@event.listens_for(Product, "after_update")
+@event.listens_for(Product, "after_delete")
+def _product_changed(mapper, connection, target: Product):
+    # rebuilds the supplier's catalog snapshot (CatalogSnapshotSink)
+    _emit(connection, target, "product.changed", "product", {"supplier_id": target.supplier_id})
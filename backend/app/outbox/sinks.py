@@ -0,0 +1,139 @@
+"""
+Outbox sinks: where drained events are dispatched.
+
+A sink gets each event once per successful batch; raising marks the event
+for retry. Sinks that coalesce work return True from `handle` for events
+whose effect only happens in `flush`; if `flush` raises, those events are
+retried too. Enable sinks with `OUTBOX_SINKS` (comma-separated names).
+"""
+import json
+import logging
+from typing import Dict, List, Optional, Type
+
+import httpx
+
+from app.core.config import get_settings
+from app.core.transitions import STOCK_RELEASING_STATUSES
+from app.models.outbox_event import OutboxEvent
+
+logger = logging.getLogger("scp.outbox")
+
+
+def event_to_dict(event: OutboxEvent) -> dict:
+    return {
+        "id": event.id,
+        "type": event.event_type,
+        "aggregate_type": event.aggregate_type,
+        "aggregate_id": event.aggregate_id,
+        "actor_id": event.actor_id,
+        "payload": event.payload,
+        "created_at": event.created_at.isoformat() if event.created_at else None,
+    }
+
+
+class OutboxSink:
+    name = "base"
+
+    def handle(self, event: OutboxEvent) -> Optional[bool]:
+        """Dispatch one event; True if it left work for `flush`"""
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """Called once per batch before events are marked processed, for sinks that coalesce work"""
+
+
+class AuditLogSink(OutboxSink):
+    """Structured audit line per event"""
+    name = "audit"
+
+    def __init__(self):
+        self.logger = logging.getLogger("scp.audit")
+
+    def handle(self, event: OutboxEvent) -> None:
+        self.logger.info(json.dumps(event_to_dict(event), default=str))
+
+
+class PushNotificationSink(OutboxSink):
+    """Stub: resolves the recipient and logs instead of calling a push provider"""
+    name = "push"
+
+    RECIPIENT_FIELD = {
+        "message.created": None,  # the other side of the link; resolved by the real provider
+        "order.created": "supplier_id",
+        "order.status_changed": "consumer_id",
+        "link.requested": "supplier_id",
+        "link.status_changed": "consumer_id",
+        "complaint.escalated": "assigned_to_id",
+    }
+
+    def handle(self, event: OutboxEvent) -> None:
+        if event.event_type not in self.RECIPIENT_FIELD:
+            return
+        field = self.RECIPIENT_FIELD[event.event_type]
+        recipient = event.payload.get(field) if field else None
+        logger.info("push stub: %s %s#%s -> %s=%s", event.event_type, event.aggregate_type, event.aggregate_id, field, recipient)
+
+
+class WebhookSink(OutboxSink):
+    """POSTs the event JSON to OUTBOX_WEBHOOK_URL; no-op when unset"""
+    name = "webhook"
+
+    def __init__(self):
+        settings = get_settings()
+        self.url = settings.OUTBOX_WEBHOOK_URL
+        self.client = httpx.Client(timeout=settings.OUTBOX_WEBHOOK_TIMEOUT) if self.url else None
+
+    def handle(self, event: OutboxEvent) -> None:
+        if not self.client:
+            logger.debug("webhook stub: %s %s#%s", event.event_type, event.aggregate_type, event.aggregate_id)
+            return
+        response = self.client.post(self.url, json=event_to_dict(event))
+        response.raise_for_status()
+
+
+# events that change what the snapshot shows (products, available stock)
+STOCK_EVENTS = frozenset({"product.changed", "inventory.changed", "order.created"})
+RELEASE_TARGETS = frozenset(s.value for s in STOCK_RELEASING_STATUSES)
+
+
+class CatalogSnapshotSink(OutboxSink):
+    """Rebuilds catalog snapshot files, once per supplier per batch"""
+    name = "catalog"
+
+    def __init__(self):
+        self.pending: set[int] = set()
+
+    def handle(self, event: OutboxEvent) -> bool:
+        if event.event_type in STOCK_EVENTS or (
+            event.event_type == "order.status_changed" and event.payload.get("to") in RELEASE_TARGETS
+        ):
+            self.pending.add(event.payload["supplier_id"])
+            return True
+        return False
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        from app.catalog.snapshot import rebuild
+        supplier_ids, self.pending = sorted(self.pending), set()
+        rebuild(supplier_ids)
+        logger.info("catalog snapshots rebuilt for suppliers %s", supplier_ids)
+
+
+SINKS: Dict[str, Type[OutboxSink]] = {
+    AuditLogSink.name: AuditLogSink,
+    PushNotificationSink.name: PushNotificationSink,
+    WebhookSink.name: WebhookSink,
+    CatalogSnapshotSink.name: CatalogSnapshotSink,
+}
+
+
+def build_sinks(names: str) -> List[OutboxSink]:
+    sinks = []
+    for name in (n.strip() for n in names.split(",")):
+        if not name:
+            continue
+        if name not in SINKS:
+            raise ValueError(f"Unknown outbox sink: {name}")
+        sinks.append(SINKS[name]())
+    return sinks
@@ -0,0 +1,123 @@
+"""
+Outbox worker: drains outbox_events in batches and dispatches them to sinks.
+
+Run as a separate process:
+
+    python -m app.outbox.worker
+
+Several workers can run side by side; batches are claimed with
+SELECT ... FOR UPDATE SKIP LOCKED.
+"""
+import logging
+import signal
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db import base  # noqa: F401  (register all models)
+from app.db.session import SessionLocal, get_engine
+from app.models.outbox_event import OutboxEvent
+from app.outbox.sinks import OutboxSink, build_sinks
+from app.repositories.outbox_repo import OutboxRepo
+
+logger = logging.getLogger("scp.outbox")
+
+
+def _mark_failed(event: OutboxEvent, error: Exception, now: datetime, max_attempts: int) -> None:
+    event.attempts += 1
+    event.last_error = f"{type(error).__name__}: {error}"[:2000]
+    if event.attempts >= max_attempts:
+        event.failed_at = now
+        logger.error("outbox event %s dead-lettered after %s attempts: %s", event.id, event.attempts, error)
+    else:
+        logger.warning("outbox event %s failed (attempt %s): %s", event.id, event.attempts, error)
+
+
+def drain_once(db: Session, sinks: List[OutboxSink]) -> int:
+    """Process one batch in one transaction. Returns the number of events claimed."""
+    settings = get_settings()
+    events = OutboxRepo.claim_batch(db, settings.OUTBOX_BATCH_SIZE, settings.OUTBOX_MAX_ATTEMPTS)
+    now = datetime.now(timezone.utc)
+    handled: List[OutboxEvent] = []
+    buffered: Dict[str, List[OutboxEvent]] = {sink.name: [] for sink in sinks}
+    for event in events:
+        try:
+            for sink in sinks:
+                if sink.handle(event):
+                    buffered[sink.name].append(event)
+        except Exception as e:
+            _mark_failed(event, e, now, settings.OUTBOX_MAX_ATTEMPTS)
+            continue
+        handled.append(event)
+
+    # flush before marking processed: events whose coalesced work did not land stay pending
+    flush_errors: Dict[int, Exception] = {}
+    for sink in sinks:
+        try:
+            sink.flush()
+        except Exception as e:
+            logger.exception("outbox sink %s flush failed", sink.name)
+            for event in buffered[sink.name]:
+                flush_errors.setdefault(event.id, e)
+
+    for event in handled:
+        if event.id in flush_errors:
+            _mark_failed(event, flush_errors[event.id], now, settings.OUTBOX_MAX_ATTEMPTS)
+        else:
+            event.processed_at = now
+    db.commit()
+    return len(events)
+
+
+def prune(db: Session) -> None:
+    """Delete processed events and dead letters past their retention"""
+    settings = get_settings()
+    now = datetime.now(timezone.utc)
+    OutboxRepo.delete_processed_before(db, now - timedelta(hours=settings.OUTBOX_RETENTION_HOURS))
+    OutboxRepo.dead_letter_exhausted(db, settings.OUTBOX_MAX_ATTEMPTS, now)
+    OutboxRepo.delete_failed_before(db, now - timedelta(hours=settings.OUTBOX_DEAD_RETENTION_HOURS))
+    dead = OutboxRepo.count_dead_letters(db)
+    if dead:
+        logger.warning("outbox has %s dead-lettered events (last_error holds the cause)", dead)
+
+
+def run() -> None:
+    settings = get_settings()
+    get_engine()
+    sinks = build_sinks(settings.OUTBOX_SINKS)
+    logger.info("outbox worker started with sinks: %s", [s.name for s in sinks])
+
+    stopping = False
+
+    def _stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    last_prune = 0.0
+    while not stopping:
+        db = SessionLocal()
+        try:
+            claimed = drain_once(db, sinks)
+            if time.monotonic() - last_prune > 3600:
+                prune(db)
+                last_prune = time.monotonic()
+        except Exception:
+            db.rollback()
+            logger.exception("outbox drain failed")
+            claimed = 0
+        finally:
+            db.close()
+        # keep draining while there is a backlog, otherwise poll
+        if claimed < settings.OUTBOX_BATCH_SIZE:
+            time.sleep(settings.OUTBOX_POLL_INTERVAL)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run()
@@ -0,0 +1,165 @@
+"""
+Tiered and negotiated pricing.
+
+A supplier's quantity breaks (product_price_tiers) and per-consumer prices
+(link_prices) are compiled into a PriceTable: per product / (link, product),
+the sorted break quantities and their prices. Pricing a basket is then a
+bisect per line, with no queries.
+
+Tables are cached per process and stamped with `suppliers.pricing_version`,
+which every tier / negotiated price edit bumps in its transaction. The
+basket validation query returns the current stamp, so a stale table is
+noticed (and recompiled) without an extra round trip, on every worker.
+
+A line pays the lowest price it qualifies for: the product's base price,
+the best quantity break reached, or the best negotiated price reached.
+"""
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+
+# sorted min quantities, lowest price among the breaks up to each of them
+Breaks = Tuple[Tuple[int, ...], Tuple[Decimal, ...]]
+
+
+def _compile_breaks(rows: Iterable[Tuple[int, Decimal]]) -> Breaks:
+    mins, best = [], []
+    for quantity, price in sorted(rows):
+        mins.append(quantity)
+        best.append(min(price, best[-1]) if best else price)
+    return tuple(mins), tuple(best)
+
+
+def _best(breaks: Optional[Breaks], quantity: int) -> Optional[Decimal]:
+    """Lowest price among breaks with min_quantity <= quantity"""
+    if breaks is None:
+        return None
+    mins, best = breaks
+    reached = bisect_right(mins, quantity)
+    return best[reached - 1] if reached else None
+
+
+class PriceTable:
+    """Compiled tiers and negotiated prices of one supplier"""
+
+    __slots__ = ("supplier_id", "stamp", "_tiers", "_links")
+
+    def __init__(
+        self,
+        supplier_id: int,
+        stamp: int,
+        tiers: Dict[int, Breaks],
+        links: Dict[Tuple[int, int], Breaks],
+    ):
+        self.supplier_id = supplier_id
+        self.stamp = stamp
+        self._tiers = tiers
+        self._links = links
+
+    @classmethod
+    def compile(
+        cls,
+        supplier_id: int,
+        stamp: int,
+        tier_rows: Iterable[Tuple[int, int, Decimal]],
+        link_rows: Iterable[Tuple[int, int, int, Decimal]],
+    ) -> "PriceTable":
+        """
+        tier_rows: (product_id, min_quantity, price)
+        link_rows: (link_id, product_id, min_quantity, price)
+        """
+        tiers: Dict[int, List[Tuple[int, Decimal]]] = {}
+        for product_id, min_quantity, price in tier_rows:
+            tiers.setdefault(product_id, []).append((min_quantity, price))
+        links: Dict[Tuple[int, int], List[Tuple[int, Decimal]]] = {}
+        for link_id, product_id, min_quantity, price in link_rows:
+            links.setdefault((link_id, product_id), []).append((min_quantity, price))
+        return cls(
+            supplier_id,
+            stamp,
+            {k: _compile_breaks(v) for k, v in tiers.items()},
+            {k: _compile_breaks(v) for k, v in links.items()},
+        )
+
+    def unit_price(self, product_id: int, quantity: int, base_price: Decimal, link_id: Optional[int] = None) -> Decimal:
+        price = base_price
+        tier = _best(self._tiers.get(product_id), quantity)
+        if tier is not None and tier < price:
+            price = tier
+        if link_id is not None:
+            negotiated = _best(self._links.get((link_id, product_id)), quantity)
+            if negotiated is not None and negotiated < price:
+                price = negotiated
+        return price
+
+    def price_basket(
+        self, lines: Sequence[Tuple[int, int, Decimal]], link_id: Optional[int] = None,
+    ) -> List[Decimal]:
+        """Unit prices for (product_id, quantity, base_price) lines, in order"""
+        unit_price = self.unit_price
+        return [unit_price(product_id, quantity, base, link_id) for product_id, quantity, base in lines]
+
+
+class PriceTableCache:
+    """LRU of compiled price tables by supplier, checked against the caller's stamp"""
+
+    def __init__(self, max_suppliers: int):
+        self.max_suppliers = max_suppliers
+        self._tables: "OrderedDict[int, PriceTable]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, supplier_id: int, stamp: int) -> PriceTable:
+        with self._lock:
+            table = self._tables.get(supplier_id)
+            if table is not None and table.stamp == stamp:
+                self._tables.move_to_end(supplier_id)
+                return table
+        table = load_price_table(db, supplier_id)
+        with self._lock:
+            self._tables[supplier_id] = table
+            self._tables.move_to_end(supplier_id)
+            while len(self._tables) > self.max_suppliers:
+                self._tables.popitem(last=False)
+        return table
+
+    def invalidate(self, supplier_id: int) -> None:
+        with self._lock:
+            self._tables.pop(supplier_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tables.clear()
+
+
+def load_price_table(db: Session, supplier_id: int) -> PriceTable:
+    from app.repositories.pricing_repo import PricingRepo
+
+    # stamp is read before the rows: an edit committed in between makes the
+    # table look older than it is, which only costs one more compile
+    stamp = PricingRepo.get_version(db, supplier_id)
+    return PriceTable.compile(
+        supplier_id,
+        stamp,
+        PricingRepo.tier_rows_for_supplier(db, supplier_id),
+        PricingRepo.link_rows_for_supplier(db, supplier_id),
+    )
+
+
+_cache: Optional[PriceTableCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_price_cache() -> PriceTableCache:
+    """Process-wide price table cache, sized from settings on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = PriceTableCache(get_settings().PRICING_CACHE_SUPPLIERS)
+    return _cache
@@ -0,0 +1,158 @@
+"""
+Rate-limit and per-client concurrency middleware (pure ASGI, no DB access).
+
+Clients are keyed by the JWT subject when the request carries a valid bearer
+token, otherwise by client IP. Verified tokens are cached, so a signature
+check happens once per token, not once per request. Each request is matched
+against `RATE_LIMIT_POLICIES` ("METHOD /path-prefix" -> "count/seconds"; the
+longest matching prefix wins, "*" matches any method) and falls back to
+`RATE_LIMIT_DEFAULT`. A client also may not have more than
+`RATE_LIMIT_MAX_CONCURRENT` requests in flight in one worker. Rejections are
+`429` with `Retry-After`.
+"""
+import json
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from jose import JWTError, jwt
+
+from app.ratelimit.store import RateLimitStore, build_store
+
+ALGORITHM = "HS256"
+_TOKEN_CACHE_SIZE = 10_000
+
+
+@dataclass(frozen=True)
+class Policy:
+    name: str
+    capacity: int
+    rate: float  # tokens per second
+
+
+def parse_rate(name: str, spec: str) -> Policy:
+    """"10/60" -> 10 requests per 60 seconds, bursting up to 10"""
+    try:
+        count, seconds = spec.split("/")
+        capacity, period = int(count), float(seconds)
+    except ValueError:
+        raise ValueError(f"Invalid rate limit {spec!r} for {name!r}, expected 'count/seconds'")
+    if capacity < 1 or period <= 0:
+        raise ValueError(f"Invalid rate limit {spec!r} for {name!r}")
+    return Policy(name=name, capacity=capacity, rate=capacity / period)
+
+
+class PolicyTable:
+    def __init__(self, policies: Dict[str, str], default: Optional[str]):
+        by_method: Dict[str, List[Tuple[str, Policy]]] = {}
+        for route, spec in policies.items():
+            method, _, prefix = route.strip().partition(" ")
+            if not prefix.startswith("/"):
+                raise ValueError(f"Invalid rate limit route {route!r}, expected 'METHOD /path'")
+            by_method.setdefault(method.upper(), []).append((prefix, parse_rate(route, spec)))
+        for rules in by_method.values():
+            rules.sort(key=lambda r: len(r[0]), reverse=True)
+        self._any = by_method.pop("*", [])
+        self._by_method = by_method
+        self.default = parse_rate("default", default) if default else None
+
+    def match(self, method: str, path: str) -> Optional[Policy]:
+        best = None
+        for prefix, policy in self._by_method.get(method, ()):
+            if path.startswith(prefix):
+                best = (prefix, policy)
+                break
+        for prefix, policy in self._any:
+            if path.startswith(prefix):
+                if best is None or len(prefix) > len(best[0]):
+                    best = (prefix, policy)
+                break
+        return best[1] if best else self.default
+
+
+class RateLimitMiddleware:
+    def __init__(self, app, settings, store: Optional[RateLimitStore] = None):
+        self.app = app
+        self.secret = settings.SECRET_KEY
+        self.table = PolicyTable(settings.RATE_LIMIT_POLICIES, settings.RATE_LIMIT_DEFAULT)
+        self.max_concurrent = settings.RATE_LIMIT_MAX_CONCURRENT
+        self.store = store or build_store(settings.RATE_LIMIT_BACKEND)
+        self._tokens: Dict[bytes, Tuple[Optional[str], float]] = {}  # token -> (sub, expires_at)
+        self._inflight: Dict[str, int] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        policy = self.table.match(scope["method"], scope["path"])
+        if policy is None and not self.max_concurrent:
+            await self.app(scope, receive, send)
+            return
+
+        client = self._client_key(scope)
+        if policy is not None:
+            wait = await self.store.take(f"{policy.name}|{client}", policy.capacity, policy.rate)
+            if wait:
+                await self._reject(send, wait)
+                return
+
+        if not self.max_concurrent:
+            await self.app(scope, receive, send)
+            return
+
+        inflight = self._inflight.get(client, 0)
+        if inflight >= self.max_concurrent:
+            await self._reject(send, 1)
+            return
+        self._inflight[client] = inflight + 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            left = self._inflight[client] - 1
+            if left:
+                self._inflight[client] = left
+            else:
+                del self._inflight[client]
+
+    def _client_key(self, scope) -> str:
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                if value[:7].lower() == b"bearer ":
+                    sub = self._subject(value[7:])
+                    if sub:
+                        return "user:" + sub
+                break
+        client = scope.get("client")
+        return "ip:" + (client[0] if client else "unknown")
+
+    def _subject(self, token: bytes) -> Optional[str]:
+        """JWT `sub` if the signature checks out; forged tokens fall back to the IP key"""
+        cached = self._tokens.get(token)
+        now = time.time()
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        try:
+            payload = jwt.decode(token.decode("latin-1"), self.secret, algorithms=[ALGORITHM])
+            sub, expires_at = payload.get("sub"), float(payload.get("exp", now + 60))
+        except (JWTError, ValueError, TypeError):
+            sub, expires_at = None, now + 60
+        if len(self._tokens) >= _TOKEN_CACHE_SIZE:
+            self._tokens.clear()
+        self._tokens[token] = (sub, expires_at)
+        return sub
+
+    @staticmethod
+    async def _reject(send, wait: float) -> None:
+        body = json.dumps({"detail": "Too many requests"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(wait))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
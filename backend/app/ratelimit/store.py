@@ -0,0 +1,124 @@
+"""
+Token-bucket stores for the rate limiter.
+
+`take(key, capacity, rate)` removes one token from the bucket `key` (holding
+at most `capacity` tokens, refilled at `rate` tokens/second) and returns 0.0
+when the request may proceed, or the number of seconds until a token is
+available. Choose the store with `RATE_LIMIT_BACKEND`:
+
+- "memory": per-process dict; with N gunicorn workers a client effectively
+  gets up to N x the configured rate.
+- "redis": shared across workers/hosts (needs the `redis` package and
+  `RATE_LIMIT_REDIS_URL`).
+"""
+import time
+from typing import Dict, List, Type
+
+
+class RateLimitStore:
+    name = "base"
+
+    async def take(self, key: str, capacity: int, rate: float) -> float:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryStore(RateLimitStore):
+    """In-process buckets. Only touched from the event loop thread, so no locking."""
+    name = "memory"
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: Dict[str, List[float]] = {}  # key -> [tokens, updated_at, full_at]
+
+    async def take(self, key: str, capacity: int, rate: float) -> float:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self._evict(now)
+            tokens = capacity
+        else:
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+
+        if tokens < 1:
+            bucket[0], bucket[1] = tokens, now
+            return (1 - tokens) / rate
+
+        tokens -= 1
+        full_at = now + (capacity - tokens) / rate
+        if bucket is None:
+            self._buckets[key] = [tokens, now, full_at]
+        else:
+            bucket[0], bucket[1], bucket[2] = tokens, now, full_at
+        return 0.0
+
+    def _evict(self, now: float) -> None:
+        # a bucket that has refilled completely is the same as no bucket
+        full = [k for k, b in self._buckets.items() if b[2] <= now]
+        for k in full:
+            del self._buckets[k]
+        if len(self._buckets) >= self.max_keys:
+            self._buckets.clear()
+
+
+# KEYS[1] bucket; ARGV: capacity, rate, now. Returns seconds to wait as a string ("0" = allowed).
+_TAKE_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local b = redis.call('HMGET', KEYS[1], 't', 'u')
+local tokens = tonumber(b[1])
+if tokens == nil then
+  tokens = capacity
+else
+  tokens = math.min(capacity, tokens + (now - tonumber(b[2])) * rate)
+end
+local wait = 0
+if tokens < 1 then
+  wait = (1 - tokens) / rate
+else
+  tokens = tokens - 1
+end
+redis.call('HSET', KEYS[1], 't', tokens, 'u', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisStore(RateLimitStore):
+    """Buckets shared by every worker; one EVALSHA round trip per request"""
+    name = "redis"
+
+    def __init__(self, url: str | None = None):
+        from app.core.config import get_settings
+        try:
+            from redis import asyncio as aioredis
+        except ImportError as e:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the 'redis' package") from e
+        url = url or get_settings().RATE_LIMIT_REDIS_URL
+        if not url:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires RATE_LIMIT_REDIS_URL")
+        self.client = aioredis.from_url(url)
+        self._take = self.client.register_script(_TAKE_LUA)
+
+    async def take(self, key: str, capacity: int, rate: float) -> float:
+        wait = await self._take(keys=[f"rl:{key}"], args=[capacity, rate, time.time()])
+        return float(wait)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+STORES: Dict[str, Type[RateLimitStore]] = {
+    MemoryStore.name: MemoryStore,
+    RedisStore.name: RedisStore,
+}
+
+
+def build_store(name: str) -> RateLimitStore:
+    if name not in STORES:
+        raise ValueError(f"Unknown rate limit backend: {name}")
+    return STORES[name]()
@@ -0,0 +1,64 @@
+from datetime import datetime
+from typing import List
+from sqlalchemy.orm import Session
+from sqlalchemy import text, bindparam, ARRAY, Integer
+from app.core.transitions import ACTIVE_ORDER_STATUSES
+
+
+def _ids_param(ids: List[int]):
+    return bindparam("ids", ids, type_=ARRAY(Integer))
+
+
+class ArchiveRepo:
+    @staticmethod
+    def archive_products(db: Session, deleted_before: datetime, limit: int) -> tuple[int, int]:
+        """
+        Move one batch of products soft-deleted before `deleted_before` to
+        products_archive, with their order lines to order_items_archive, in one
+        transaction. Returns (products, order lines) moved.
+
+        Products still on an open order are left alone: the order may need
+        its lines to be released or shipped. Template lines are dropped (a
+        deleted product cannot be reordered) and tiers, prices, stock and
+        price history go with the product (ON DELETE CASCADE). Rows locked by
+        a concurrent writer are skipped until the next run.
+        """
+        ids = db.execute(
+            text("""
+                SELECT p.id FROM products p
+                WHERE p.deleted_at < :cutoff
+                  AND NOT EXISTS (
+                      SELECT 1 FROM order_items i JOIN orders o ON o.id = i.order_id
+                      WHERE i.product_id = p.id AND o.status = ANY(CAST(:open AS orderstatus[]))
+                  )
+                ORDER BY p.deleted_at
+                LIMIT :limit
+                FOR UPDATE OF p SKIP LOCKED
+            """),
+            {"cutoff": deleted_before, "limit": limit, "open": [s.value for s in ACTIVE_ORDER_STATUSES]},
+        ).scalars().all()
+        if not ids:
+            db.rollback()
+            return 0, 0
+
+        db.execute(
+            text("""
+                INSERT INTO products_archive (id, supplier_id, name, unit, price, moq, version, deleted_at)
+                SELECT id, supplier_id, name, unit, price, moq, version, deleted_at
+                FROM products WHERE id = ANY(:ids)
+            """).bindparams(_ids_param(ids))
+        )
+        lines = db.execute(
+            text("""
+                WITH moved AS (
+                    DELETE FROM order_items WHERE product_id = ANY(:ids)
+                    RETURNING id, order_id, product_id, quantity, unit_price
+                )
+                INSERT INTO order_items_archive (id, order_id, product_id, quantity, unit_price)
+                SELECT id, order_id, product_id, quantity, unit_price FROM moved
+            """).bindparams(_ids_param(ids))
+        ).rowcount
+        db.execute(text("DELETE FROM order_template_items WHERE product_id = ANY(:ids)").bindparams(_ids_param(ids)))
+        db.execute(text("DELETE FROM products WHERE id = ANY(:ids)").bindparams(_ids_param(ids)))
+        db.commit()
+        return len(ids), lines
@@ -0,0 +1,41 @@
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.attachment import Attachment
+
+
+class AttachmentRepo:
+    @staticmethod
+    def create(db: Session, **data) -> Attachment:
+        obj = Attachment(**data)
+        db.add(obj)
+        db.commit()
+        db.refresh(obj)
+        return obj
+
+    @staticmethod
+    def get(db: Session, attachment_id: str) -> Optional[Attachment]:
+        return db.get(Attachment, attachment_id)
+
+    @staticmethod
+    def lock_for_upload(db: Session, attachment_id: str) -> Optional[Attachment]:
+        """
+        Re-read and row-lock the attachment until the session commits or rolls
+        back; None if another request holds the lock (SKIP LOCKED).
+        """
+        stmt = (
+            select(Attachment)
+            .where(Attachment.id == attachment_id)
+            .with_for_update(skip_locked=True)
+            .execution_options(populate_existing=True)
+        )
+        return db.execute(stmt).scalar_one_or_none()
+
+    @staticmethod
+    def mark_complete(db: Session, attachment: Attachment, sha256: str) -> Attachment:
+        attachment.sha256 = sha256
+        attachment.completed_at = datetime.now(timezone.utc)
+        db.commit()
+        db.refresh(attachment)
+        return attachment
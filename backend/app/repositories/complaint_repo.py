@@ -1,13 +1,30 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+from datetime import timedelta
+from sqlalchemy.orm import Session, lazyload
+from sqlalchemy import select, case, func, literal, Row
 from typing import Optional, Sequence
 from app.models.complaint import Complaint
-from app.enums import ComplaintStatus
+from app.enums import ComplaintStatus, ComplaintAgeBucket
+
+# Upper bounds of the SLA aging buckets; anything older falls into GT_3D
+AGE_BUCKET_BOUNDS = [
+    (timedelta(hours=4), ComplaintAgeBucket.LT_4H),
+    (timedelta(hours=24), ComplaintAgeBucket.H4_24),
+    (timedelta(days=3), ComplaintAgeBucket.D1_3),
+]
+
+
+def _age_bucket_expr():
+    """SQL CASE bucketing now() - coalesce(escalated_at, created_at)"""
+    age = func.now() - func.coalesce(Complaint.escalated_at, Complaint.created_at)
+    return case(
+        *[(age < bound, literal(bucket.value)) for bound, bucket in AGE_BUCKET_BOUNDS],
+        else_=literal(ComplaintAgeBucket.GT_3D.value),
+    )
 
 class ComplaintRepo:
     @staticmethod
-    def create(db: Session, *, link_id: Optional[int], order_id: Optional[int], description: str, created_by: int) -> Complaint:
-        obj = Complaint(link_id=link_id, order_id=order_id, description=description, status=ComplaintStatus.OPEN.value, created_by=created_by)
+    def create(db: Session, *, link_id: Optional[int], order_id: Optional[int], supplier_id: int, description: str, created_by: int) -> Complaint:
+        obj = Complaint(link_id=link_id, order_id=order_id, supplier_id=supplier_id, description=description, status=ComplaintStatus.OPEN.value, created_by=created_by)
         db.add(obj)
         db.commit()
         db.refresh(obj)
@@ -17,6 +34,17 @@ class ComplaintRepo:
     def get(db: Session, complaint_id: int) -> Optional[Complaint]:
         return db.get(Complaint, complaint_id)
 
+    @staticmethod
+    def get_with_supplier_owner(db: Session, complaint_id: int) -> Optional[Row]:
+        """(Complaint, supplier owner_id) in one query via the denormalized supplier_id"""
+        from app.models.supplier import Supplier
+        stmt = (
+            select(Complaint, Supplier.owner_id)
+            .outerjoin(Supplier, Supplier.id == Complaint.supplier_id)
+            .where(Complaint.id == complaint_id)
+        )
+        return db.execute(stmt).unique().first()
+
     @staticmethod
     def update_status(db: Session, *, complaint: Complaint, status: ComplaintStatus) -> Complaint:
         complaint.status = status.value
@@ -35,13 +63,54 @@ class ComplaintRepo:
 
     @staticmethod
     def list_for_supplier_owner(db: Session, supplier_id: int, status: Optional[ComplaintStatus], limit: int, offset: int) -> Sequence[Complaint]:
-        from app.models.link import Link  
-        stmt = (
-            select(Complaint)
-            .join(Link, Complaint.link_id == Link.id)
-            .where(Link.supplier_id == supplier_id)
-        )
+        stmt = select(Complaint).where(Complaint.supplier_id == supplier_id)
         if status:
             stmt = stmt.where(Complaint.status == status.value)
         stmt = stmt.order_by(Complaint.id.desc()).offset(offset).limit(limit)
         return db.execute(stmt).scalars().unique().all()
+
+    @staticmethod
+    def queue_for_supplier(
+        db: Session,
+        *,
+        supplier_id: int,
+        status: Optional[ComplaintStatus],
+        assigned_to_id: Optional[int],
+        before_id: Optional[int],
+        limit: int,
+    ) -> Sequence[Row]:
+        """
+        Supplier complaint queue, newest first, keyset-paginated on id.
+        Rows are (Complaint, age_bucket) with the bucket computed in SQL.
+        """
+        stmt = (
+            select(Complaint, _age_bucket_expr().label("age_bucket"))
+            .where(Complaint.supplier_id == supplier_id)
+            .options(lazyload(Complaint.creator), lazyload(Complaint.assigned_to))
+        )
+        if status:
+            stmt = stmt.where(Complaint.status == status)
+        if assigned_to_id:
+            stmt = stmt.where(Complaint.assigned_to_id == assigned_to_id)
+        if before_id:
+            stmt = stmt.where(Complaint.id < before_id)
+        stmt = stmt.order_by(Complaint.id.desc()).limit(limit)
+        return db.execute(stmt).all()
+
+    @staticmethod
+    def aging_summary_for_supplier(
+        db: Session,
+        *,
+        supplier_id: int,
+        assigned_to_id: Optional[int],
+    ) -> Sequence[Row]:
+        """Counts of unresolved complaints per (status, age_bucket), grouped in SQL"""
+        bucket = _age_bucket_expr().label("age_bucket")
+        stmt = (
+            select(Complaint.status, bucket, func.count().label("count"))
+            .where(Complaint.supplier_id == supplier_id, Complaint.status != ComplaintStatus.RESOLVED)
+        )
+        if assigned_to_id:
+            stmt = stmt.where(Complaint.assigned_to_id == assigned_to_id)
+        stmt = stmt.group_by(Complaint.status, bucket)
+        return db.execute(stmt).all()
@@ -0,0 +1,119 @@
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, delete, func, text, any_, bindparam, literal, ARRAY, Integer, Row
+from app.enums import StockMovementReason
+from app.models.order_item import OrderItem
+from app.models.product import Product
+from app.models.stock_movement import StockMovement
+from app.models.stock_snapshot import StockSnapshot
+from app.repositories.outbox_repo import OutboxRepo
+
+
+class InventoryRepo:
+    @staticmethod
+    def add_movements(db: Session, movements: List[dict[str, Any]]) -> None:
+        """Queue movements in the caller's transaction as one multi-row INSERT (the caller commits)"""
+        if movements:
+            actor_id = OutboxRepo.actor_id(db)
+            db.execute(insert(StockMovement), [{"actor_id": actor_id, **m} for m in movements])
+
+    @staticmethod
+    def add_supplier_movements(db: Session, supplier_id: int, movements: List[dict[str, Any]]) -> None:
+        """Movements of one supplier's products plus one `inventory.changed` outbox event (the caller commits)"""
+        InventoryRepo.add_movements(db, movements)
+        OutboxRepo.add_many(db, [{
+            "event_type": "inventory.changed",
+            "aggregate_type": "supplier",
+            "aggregate_id": supplier_id,
+            "actor_id": OutboxRepo.actor_id(db),
+            "payload": {"supplier_id": supplier_id, "movements": len(movements)},
+        }])
+
+    @staticmethod
+    def record(db: Session, supplier_id: int, movements: List[dict[str, Any]]) -> None:
+        """Write a batch of warehouse movements in one transaction"""
+        InventoryRepo.add_supplier_movements(db, supplier_id, movements)
+        db.commit()
+
+    @staticmethod
+    def release_orders(db: Session, order_ids: List[int]) -> None:
+        """Give the stock reserved by these orders back, INSERT ... SELECT from their items (caller commits)"""
+        items = (
+            select(
+                OrderItem.product_id,
+                OrderItem.quantity,
+                literal(StockMovementReason.ORDER_RELEASE, StockMovement.reason.type),
+                OrderItem.order_id,
+                literal(OutboxRepo.actor_id(db), Integer),
+            )
+            .where(OrderItem.order_id == any_(bindparam("release_ids", order_ids, type_=ARRAY(Integer))))
+        )
+        db.execute(
+            insert(StockMovement).from_select(["product_id", "delta", "reason", "order_id", "actor_id"], items)
+        )
+
+    @staticmethod
+    def levels(db: Session, product_ids: List[int]) -> Sequence[Row]:
+        """(product_id, stock) for the given products"""
+        stmt = select(Product.id.label("product_id"), Product.stock).where(
+            Product.id == any_(bindparam("product_ids", product_ids, type_=ARRAY(Integer)))
+        ).order_by(Product.id)
+        return db.execute(stmt).all()
+
+    @staticmethod
+    def list_movements(
+        db: Session, product_id: int, *, before_id: Optional[int] = None, limit: int = 100,
+    ) -> List[StockMovement]:
+        stmt = select(StockMovement).where(StockMovement.product_id == product_id)
+        if before_id:
+            stmt = stmt.where(StockMovement.id < before_id)
+        stmt = stmt.order_by(StockMovement.id.desc()).limit(limit)
+        return db.execute(stmt).scalars().all()
+
+    @staticmethod
+    def compact(db: Session, lock_timeout_ms: int) -> int:
+        """
+        Fold movements newer than each product's snapshot into it. Returns the
+        number of snapshots touched.
+
+        SHARE mode waits for in-flight movement inserts to commit and holds new
+        ones back until this transaction ends, so no movement with a lower id
+        can appear after the fold and be skipped by readers. The fold is one
+        statement over the unfolded tail only (ids above the highest folded
+        id), so the pause is short; lock_timeout bounds it if a long
+        transaction is holding the table.
+        """
+        db.execute(text(f"SET LOCAL lock_timeout = {int(lock_timeout_ms)}"))
+        db.execute(text("LOCK TABLE stock_movements IN SHARE MODE"))
+        # every movement up to the highest folded id is folded (see above)
+        watermark = db.execute(select(func.coalesce(func.max(StockSnapshot.last_movement_id), 0))).scalar_one()
+        result = db.execute(text("""
+            WITH folded AS (
+                SELECT m.product_id, sum(m.delta) AS delta, max(m.id) AS last_id
+                FROM stock_movements m
+                LEFT JOIN stock_snapshots s ON s.product_id = m.product_id
+                WHERE m.id > :watermark AND m.id > coalesce(s.last_movement_id, 0)
+                GROUP BY m.product_id
+            )
+            INSERT INTO stock_snapshots (product_id, quantity, last_movement_id, taken_at)
+            SELECT product_id, delta, last_id, now() FROM folded
+            ON CONFLICT (product_id) DO UPDATE
+            SET quantity = stock_snapshots.quantity + EXCLUDED.quantity,
+                last_movement_id = EXCLUDED.last_movement_id,
+                taken_at = EXCLUDED.taken_at
+        """), {"watermark": watermark})
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def prune(db: Session, older_than: datetime) -> int:
+        """Delete folded movements created before `older_than`; they no longer affect stock"""
+        folded_upto = select(func.coalesce(func.max(StockSnapshot.last_movement_id), 0)).scalar_subquery()
+        result = db.execute(
+            delete(StockMovement)
+            .where(StockMovement.id <= folded_upto, StockMovement.created_at < older_than)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount
@@ -1,11 +1,12 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, update, any_, bindparam, ARRAY, Integer, Select
 from app.models.link import Link
 from app.enums import LinkStatus, Role
 from typing import Optional
 from sqlalchemy import select
 from app.models.user import User
 from app.repositories.supplier_repo import SupplierRepo
+from app.repositories.outbox_repo import OutboxRepo
 
 class LinkRepo:
     @staticmethod
@@ -35,14 +36,111 @@ class LinkRepo:
         return link
 
     @staticmethod
-    def list_for_consumer(db: Session, consumer_id: int) -> list[Link]:
-        stmt = select(Link).where(Link.consumer_id == consumer_id).order_by(Link.id.desc())
+    def list_for_consumer(
+        db: Session,
+        consumer_id: int,
+        *,
+        status: Optional[LinkStatus] = None,
+        before_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> list[Link]:
+        """Consumer's links, newest first; keyset-paginated by `before_id` when given"""
+        stmt = select(Link).where(Link.consumer_id == consumer_id)
+        if status:
+            stmt = stmt.where(Link.status == status)
+        if before_id:
+            stmt = stmt.where(Link.id < before_id)
+        stmt = stmt.order_by(Link.id.desc())
+        if limit:
+            stmt = stmt.limit(limit)
         return db.execute(stmt).scalars().unique().all()
 
     @staticmethod
-    def list_for_supplier(db: Session, supplier_id: int) -> list[Link]:
-        stmt = select(Link).where(Link.supplier_id == supplier_id).order_by(Link.id.desc())
+    def accepted_supplier_ids(consumer_id: int) -> Select:
+        """
+        Ids of the suppliers the consumer has an ACCEPTED link with, as a subquery.
+        Reads only supplier_id, so it is an index-only scan on ix_links_consumer_status.
+        """
+        return select(Link.supplier_id).where(
+            Link.consumer_id == consumer_id,
+            Link.status == LinkStatus.ACCEPTED,
+        )
+
+    @staticmethod
+    def list_for_supplier(
+        db: Session,
+        supplier_id: int,
+        *,
+        status: Optional[LinkStatus] = None,
+        before_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> list[Link]:
+        """Supplier's links, newest first; keyset-paginated by `before_id` when given"""
+        stmt = select(Link).where(Link.supplier_id == supplier_id)
+        if status:
+            stmt = stmt.where(Link.status == status)
+        if before_id:
+            stmt = stmt.where(Link.id < before_id)
+        stmt = stmt.order_by(Link.id.desc())
+        if limit:
+            stmt = stmt.limit(limit)
         return db.execute(stmt).scalars().unique().all()
+
+    @staticmethod
+    def get_states(db: Session, link_ids: list[int]) -> list:
+        """(id, supplier_id, status) for the given ids, without joined consumer/supplier"""
+        stmt = select(Link.id, Link.supplier_id, Link.status).where(
+            Link.id == any_(bindparam("link_ids", link_ids, type_=ARRAY(Integer)))
+        )
+        return db.execute(stmt).all()
+
+    @staticmethod
+    def bulk_set_status(
+        db: Session,
+        *,
+        supplier_id: int,
+        link_ids: list[int],
+        from_statuses: list[LinkStatus],
+        to_status: LinkStatus,
+    ) -> list[int]:
+        """
+        Set status on many links of one supplier with a single UPDATE ... RETURNING.
+        Only rows currently in `from_statuses` are touched. Returns updated ids.
+        """
+        # Core UPDATE self-joined to the pre-update row so RETURNING can report the old status
+        links = Link.__table__
+        old = links.alias("old")
+        stmt = (
+            update(links)
+            .where(
+                links.c.id == old.c.id,
+                links.c.id == any_(bindparam("link_ids", link_ids, type_=ARRAY(Integer))),
+                links.c.supplier_id == supplier_id,
+                links.c.status.in_(from_statuses),
+            )
+            .values(status=to_status)
+            .returning(links.c.id, links.c.consumer_id, old.c.status.label("old_status"))
+        )
+        rows = db.execute(stmt).all()
+        # bulk UPDATE bypasses mapper events, so outbox rows are written here, same transaction
+        actor_id = OutboxRepo.actor_id(db)
+        OutboxRepo.add_many(db, [
+            {
+                "event_type": "link.status_changed",
+                "aggregate_type": "link",
+                "aggregate_id": row.id,
+                "actor_id": actor_id,
+                "payload": {
+                    "supplier_id": supplier_id,
+                    "consumer_id": row.consumer_id,
+                    "from": row.old_status.value,
+                    "to": to_status.value,
+                },
+            }
+            for row in rows
+        ])
+        db.commit()
+        return [row.id for row in rows]
     
 
     @staticmethod
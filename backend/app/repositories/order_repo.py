@@ -1,9 +1,14 @@
+from decimal import Decimal
 from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import select, update, insert, any_, bindparam, ARRAY, Integer, Row
 from app.models.order import Order
 from app.models.order_item import OrderItem
-from app.enums import OrderStatus
+from app.models.order_status_history import OrderStatusHistory
+from app.enums import OrderStatus, StockMovementReason
+from app.core.transitions import ACTIVE_ORDER_STATUSES, STOCK_RELEASING_STATUSES
+from app.repositories.inventory_repo import InventoryRepo
+from app.repositories.outbox_repo import OutboxRepo
 
 
 class OrderRepo:
@@ -12,10 +17,10 @@ class OrderRepo:
         db: Session,
         consumer_id: int,
         supplier_id: int,
-        total_amount: float,
+        total_amount: Decimal,
         items_data: list[dict]
     ) -> Order:
-        """Create order with items"""
+        """Create order with items; their quantities are reserved in the stock ledger"""
         order = Order(
             consumer_id=consumer_id,
             supplier_id=supplier_id,
@@ -34,7 +39,15 @@ class OrderRepo:
                 unit_price=item_data['unit_price']
             )
             db.add(order_item)
-        
+        InventoryRepo.add_movements(db, [
+            {"product_id": i['product_id'], "delta": -i['quantity'], "reason": StockMovementReason.ORDER, "order_id": order.id}
+            for i in items_data
+        ])
+
+        db.add(OrderStatusHistory(
+            order_id=order.id, from_status=None, to_status=OrderStatus.CREATED,
+            actor_id=OutboxRepo.actor_id(db),
+        ))
         db.commit()
         db.refresh(order)
         return order
@@ -46,29 +59,110 @@ class OrderRepo:
         return db.execute(stmt).unique().scalar_one_or_none()
 
     @staticmethod
-    def list_for_consumer(db: Session, consumer_id: int, status: Optional[OrderStatus] = None) -> List[Order]:
-        """List orders for consumer with optional status filter"""
-        stmt = select(Order).where(Order.consumer_id == consumer_id)
+    def list_for_consumer(
+        db: Session, consumer_id: int, status: Optional[OrderStatus] = None, active: bool = False
+    ) -> List[Order]:
+        """List orders for consumer with optional status filter (active: open orders only)"""
+        stmt = select(Order).where(Order.consumer_id == consumer_id).options(selectinload(Order.archived_items))
         if status:
             stmt = stmt.where(Order.status == status)
+        if active:
+            stmt = stmt.where(Order.status.in_(ACTIVE_ORDER_STATUSES))
         stmt = stmt.order_by(Order.created_at.desc())
         return db.execute(stmt).scalars().unique().all()
 
     @staticmethod
-    def list_for_supplier(db: Session, supplier_id: int, status: Optional[OrderStatus] = None) -> List[Order]:
-        """List orders for supplier with optional status filter"""
-        stmt = select(Order).where(Order.supplier_id == supplier_id)
+    def list_for_supplier(
+        db: Session, supplier_id: int, status: Optional[OrderStatus] = None, active: bool = False
+    ) -> List[Order]:
+        """List orders for supplier with optional status filter (active: open orders only)"""
+        stmt = select(Order).where(Order.supplier_id == supplier_id).options(selectinload(Order.archived_items))
         if status:
             stmt = stmt.where(Order.status == status)
+        if active:
+            stmt = stmt.where(Order.status.in_(ACTIVE_ORDER_STATUSES))
         stmt = stmt.order_by(Order.created_at.desc())
         return db.execute(stmt).scalars().unique().all()
 
     @staticmethod
-    def update_status(db: Session, order: Order, status: OrderStatus) -> Order:
-        """Update order status"""
-        order.status = status
-        db.add(order)
+    def get_states(db: Session, order_ids: List[int]) -> List[Row]:
+        """(id, supplier_id, consumer_id, status, version) for the given ids, without loading relationships"""
+        stmt = select(Order.id, Order.supplier_id, Order.consumer_id, Order.status, Order.version).where(
+            Order.id == any_(bindparam("order_ids", order_ids, type_=ARRAY(Integer)))
+        )
+        return db.execute(stmt).all()
+
+    @staticmethod
+    def transition(
+        db: Session,
+        order_ids: List[int],
+        from_status: OrderStatus,
+        to_status: OrderStatus,
+        *,
+        supplier_id: Optional[int] = None,
+        consumer_id: Optional[int] = None,
+        version: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Compare-and-set: move orders that are still in `from_status` to
+        `to_status` with one UPDATE ... WHERE status = :from RETURNING, scoped
+        to a supplier and/or consumer, and optionally to a row `version`.
+        Orders whose status changed concurrently are skipped. Writes history and outbox rows in the same transaction
+        and returns the ids actually updated.
+        """
+        conditions = [
+            Order.id == any_(bindparam("order_ids", order_ids, type_=ARRAY(Integer))),
+            Order.status == from_status,
+        ]
+        if supplier_id is not None:
+            conditions.append(Order.supplier_id == supplier_id)
+        if consumer_id is not None:
+            conditions.append(Order.consumer_id == consumer_id)
+        if version is not None:
+            conditions.append(Order.version == version)
+        stmt = (
+            update(Order)
+            .where(*conditions)
+            # Core UPDATE bypasses version_id_col, bump it so ORM writers see the change
+            .values(status=to_status, version=Order.version + 1)
+            .returning(Order.id, Order.supplier_id, Order.consumer_id)
+            .execution_options(synchronize_session=False)
+        )
+        rows = db.execute(stmt).all()
+        if not rows:
+            db.rollback()
+            return []
+        actor_id = OutboxRepo.actor_id(db)
+        db.execute(insert(OrderStatusHistory), [
+            {"order_id": row.id, "from_status": from_status, "to_status": to_status, "actor_id": actor_id}
+            for row in rows
+        ])
+        if to_status in STOCK_RELEASING_STATUSES:
+            InventoryRepo.release_orders(db, [row.id for row in rows])
+        # bulk UPDATE bypasses mapper events, so outbox rows are written here, same transaction
+        OutboxRepo.add_many(db, [
+            {
+                "event_type": "order.status_changed",
+                "aggregate_type": "order",
+                "aggregate_id": row.id,
+                "actor_id": actor_id,
+                "payload": {
+                    "supplier_id": row.supplier_id,
+                    "consumer_id": row.consumer_id,
+                    "from": from_status.value,
+                    "to": to_status.value,
+                },
+            }
+            for row in rows
+        ])
         db.commit()
-        db.refresh(order)
-        return order
+        return [row.id for row in rows]
 
+    @staticmethod
+    def history(db: Session, order_id: int) -> List[OrderStatusHistory]:
+        stmt = (
+            select(OrderStatusHistory)
+            .where(OrderStatusHistory.order_id == order_id)
+            .order_by(OrderStatusHistory.at, OrderStatusHistory.id)
+        )
+        return db.execute(stmt).scalars().all()
@@ -0,0 +1,51 @@
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from app.models.order_template import OrderTemplate
+from app.models.order_template_item import OrderTemplateItem
+
+
+class OrderTemplateRepo:
+    @staticmethod
+    def create(
+        db: Session,
+        *,
+        consumer_id: int,
+        supplier_id: int,
+        name: str,
+        items_data: list[dict]
+    ) -> OrderTemplate:
+        """Create template with its lines in one flush"""
+        template = OrderTemplate(
+            consumer_id=consumer_id,
+            supplier_id=supplier_id,
+            name=name,
+            items=[
+                OrderTemplateItem(product_id=item['product_id'], quantity=item['quantity'])
+                for item in items_data
+            ],
+        )
+        db.add(template)
+        db.commit()
+        db.refresh(template)
+        return template
+
+    @staticmethod
+    def get_by_id(db: Session, template_id: int) -> Optional[OrderTemplate]:
+        """Get template by ID with items loaded"""
+        stmt = select(OrderTemplate).where(OrderTemplate.id == template_id)
+        return db.execute(stmt).unique().scalar_one_or_none()
+
+    @staticmethod
+    def list_for_consumer(db: Session, consumer_id: int, supplier_id: Optional[int] = None) -> List[OrderTemplate]:
+        """List consumer's templates, optionally for one supplier"""
+        stmt = select(OrderTemplate).where(OrderTemplate.consumer_id == consumer_id)
+        if supplier_id:
+            stmt = stmt.where(OrderTemplate.supplier_id == supplier_id)
+        stmt = stmt.order_by(OrderTemplate.id.desc())
+        return db.execute(stmt).scalars().unique().all()
+
+    @staticmethod
+    def delete(db: Session, template: OrderTemplate) -> None:
+        db.delete(template)
+        db.commit()
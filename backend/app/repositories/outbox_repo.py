@@ -0,0 +1,102 @@
+from datetime import datetime
+from typing import Any, List, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, update, delete, func
+from sqlalchemy.engine import Connection
+from app.models.outbox_event import OutboxEvent
+
+
+class OutboxRepo:
+    """
+    Outbox writes never commit: they ride on the caller's transaction so the
+    event exists if and only if the change that caused it was committed.
+    """
+
+    @staticmethod
+    def actor_id(db: Session) -> Optional[int]:
+        """Acting user of this request's session (set by auth_bearer)"""
+        return db.info.get("actor_id")
+
+    @staticmethod
+    def add_many(db: Session, events: List[dict[str, Any]]) -> None:
+        """Queue events in the session's transaction (one multi-row INSERT)"""
+        if events:
+            db.execute(insert(OutboxEvent), events)
+
+    @staticmethod
+    def add_on_connection(
+        connection: Connection,
+        *,
+        event_type: str,
+        aggregate_type: str,
+        aggregate_id: int,
+        payload: dict[str, Any],
+        actor_id: Optional[int] = None,
+    ) -> None:
+        """Insert from inside a flush (mapper events), on the flush's connection"""
+        connection.execute(
+            insert(OutboxEvent.__table__).values(
+                event_type=event_type,
+                aggregate_type=aggregate_type,
+                aggregate_id=aggregate_id,
+                actor_id=actor_id,
+                payload=payload,
+            )
+        )
+
+    @staticmethod
+    def claim_batch(db: Session, limit: int, max_attempts: int) -> List[OutboxEvent]:
+        """
+        Lock up to `limit` pending events, oldest first. SKIP LOCKED lets several
+        workers drain concurrently without handing out the same event twice.
+        """
+        stmt = (
+            select(OutboxEvent)
+            .where(
+                OutboxEvent.processed_at.is_(None),
+                OutboxEvent.failed_at.is_(None),
+                OutboxEvent.attempts < max_attempts,
+            )
+            .order_by(OutboxEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return db.execute(stmt).scalars().all()
+
+    @staticmethod
+    def delete_processed_before(db: Session, cutoff: datetime) -> int:
+        stmt = delete(OutboxEvent).where(OutboxEvent.processed_at < cutoff)
+        result = db.execute(stmt)
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def dead_letter_exhausted(db: Session, max_attempts: int, now: datetime) -> int:
+        """
+        Mark pending events that already used up `max_attempts` as dead letters,
+        e.g. after OUTBOX_MAX_ATTEMPTS was lowered. The worker marks the rest as they fail.
+        """
+        stmt = (
+            update(OutboxEvent)
+            .where(
+                OutboxEvent.processed_at.is_(None),
+                OutboxEvent.failed_at.is_(None),
+                OutboxEvent.attempts >= max_attempts,
+            )
+            .values(failed_at=now)
+        )
+        result = db.execute(stmt)
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def count_dead_letters(db: Session) -> int:
+        stmt = select(func.count()).select_from(OutboxEvent).where(OutboxEvent.failed_at.is_not(None))
+        return db.execute(stmt).scalar_one()
+
+    @staticmethod
+    def delete_failed_before(db: Session, cutoff: datetime) -> int:
+        stmt = delete(OutboxEvent).where(OutboxEvent.failed_at < cutoff)
+        result = db.execute(stmt)
+        db.commit()
+        return result.rowcount
@@ -0,0 +1,165 @@
+import re
+from datetime import date
+from typing import Dict, List, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from app.core.transitions import ACTIVE_ORDER_STATUSES, OPEN_COMPLAINT_STATUSES
+
+# Tables partitioned by month: table -> partition column. Monthly partitions
+# are named <table>_pYYYYMM; <table>_default catches rows outside all of them.
+PARTITIONED_TABLES = {
+    "orders": "created_at",
+    "messages": "created_at",
+}
+
+# Tables holding orders.id without a FK (a partitioned table can only be
+# referenced by its full key). Their rows follow an archived orders month,
+# and PartitionRepo.orphan_counts stands in for the dropped constraints.
+ORDER_CHILDREN = ("order_items", "order_items_archive", "order_status_history", "complaints")
+
+
+def month_start(d: date) -> date:
+    return date(d.year, d.month, 1)
+
+
+def add_months(d: date, months: int) -> date:
+    index = d.year * 12 + d.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def _bound(month: date) -> str:
+    # '+00' pins timestamptz bounds to UTC and is ignored for plain timestamps
+    return f"'{month:%Y-%m-%d} 00:00:00+00'"
+
+
+class PartitionRepo:
+    @staticmethod
+    def list_months(db: Session, table: str) -> List[Tuple[str, date]]:
+        """Monthly partitions attached to `table`: (name, first day of the month), oldest first"""
+        names = db.execute(
+            text("""
+                SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = CAST(:table AS regclass)
+            """),
+            {"table": table},
+        ).scalars().all()
+        pattern = re.compile(rf"^{re.escape(table)}_p(\d{{4}})(\d{{2}})$")
+        months = []
+        for name in names:
+            m = pattern.match(name)
+            if m:
+                months.append((name, date(int(m.group(1)), int(m.group(2)), 1)))
+        return sorted(months, key=lambda item: item[1])
+
+    @staticmethod
+    def create_month(db: Session, table: str, month: date, lock_timeout_ms: int) -> bool:
+        """
+        Create the partition for `month` if missing; False if it exists.
+
+        The partition is created as a plain table and then attached, which
+        only blocks other DDL on `table`, not reads and writes. Rows that
+        already landed in the default partition for that month are moved
+        into the new one: the default is detached meanwhile, which postgres
+        requires and which does block writes for the move. lock_timeout
+        bounds the wait behind long transactions (OperationalError: retry
+        on the next run).
+        """
+        column = PARTITIONED_TABLES[table]
+        name = partition_name(table, month)
+        if db.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None:
+            db.rollback()
+            return False
+        db.execute(text(f"SET LOCAL lock_timeout = {int(lock_timeout_ms)}"))
+        lower, upper = _bound(month), _bound(add_months(month, 1))
+        default = f"{table}_default"
+        stray = db.execute(text(
+            f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {column} >= {lower} AND {column} < {upper})"
+        )).scalar()
+        if stray:
+            db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+        db.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+        db.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM ({lower}) TO ({upper})"))
+        if stray:
+            db.execute(text(f"""
+                WITH moved AS (
+                    DELETE FROM {default} WHERE {column} >= {lower} AND {column} < {upper} RETURNING *
+                )
+                INSERT INTO {table} SELECT * FROM moved
+            """))
+            db.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+        db.commit()
+        return True
+
+    @staticmethod
+    def archivable(db: Session, table: str, name: str) -> bool:
+        """False for an orders month with an order that is not finished or has an unresolved complaint"""
+        if table != "orders":
+            return True
+        return not db.execute(
+            text(f"""
+                SELECT count(*) FROM {name} o
+                WHERE o.status = ANY(CAST(:open AS orderstatus[]))
+                   OR EXISTS (
+                       SELECT 1 FROM complaints c
+                       WHERE c.order_id = o.id AND c.status = ANY(CAST(:unresolved AS complaintstatus[]))
+                   )
+            """),
+            {
+                "open": [s.value for s in ACTIVE_ORDER_STATUSES],
+                "unresolved": [s.value for s in OPEN_COMPLAINT_STATUSES],
+            },
+        ).scalar()
+
+    @staticmethod
+    def archive_month(db: Session, table: str, name: str, schema: str, lock_timeout_ms: int) -> bool:
+        """
+        Detach partition `name` and move it to `schema`: its rows leave `table`
+        but are kept. False (nothing changed) for an orders month that still
+        has an open order or an unresolved complaint.
+
+        For orders, the rows of ORDER_CHILDREN pointing at the month's orders
+        move to `schema`.<child> in the same transaction, so nothing is left
+        referencing an order that is no longer in `orders`. Open orders are
+        counted before taking any lock and again once the partition is
+        detached (the parent is locked then, so no order can change).
+        """
+        if not PartitionRepo.archivable(db, table, name):
+            db.rollback()
+            return False
+        db.execute(text(f"SET LOCAL lock_timeout = {int(lock_timeout_ms)}"))
+        db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema}"))
+        db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        if table == "orders":
+            if not PartitionRepo.archivable(db, table, name):
+                db.rollback()
+                return False
+            for child in ORDER_CHILDREN:
+                db.execute(text(f"CREATE TABLE IF NOT EXISTS {schema}.{child} (LIKE public.{child})"))
+                db.execute(text(f"""
+                    WITH moved AS (
+                        DELETE FROM {child} WHERE order_id IN (SELECT id FROM {name}) RETURNING *
+                    )
+                    INSERT INTO {schema}.{child} SELECT * FROM moved
+                """))
+        db.execute(text(f"ALTER TABLE {name} SET SCHEMA {schema}"))
+        db.commit()
+        return True
+
+    @staticmethod
+    def orphan_counts(db: Session) -> Dict[str, int]:
+        """Rows of ORDER_CHILDREN whose order is not in `orders`, per table (only tables with any)"""
+        counts = {}
+        for child in ORDER_CHILDREN:
+            count = db.execute(text(f"""
+                SELECT count(*) FROM {child} c
+                WHERE c.order_id IS NOT NULL
+                  AND NOT EXISTS (SELECT 1 FROM orders o WHERE o.id = c.order_id)
+            """)).scalar()
+            if count:
+                counts[child] = count
+        db.rollback()
+        return counts
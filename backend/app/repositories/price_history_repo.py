@@ -0,0 +1,48 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional, Sequence
+from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, any_, bindparam, ARRAY, Integer, Row
+from app.models.product import Product
+from app.models.product_price_history import ProductPriceHistory
+from app.repositories.outbox_repo import OutboxRepo
+
+
+class PriceHistoryRepo:
+    @staticmethod
+    def add(db: Session, product_id: int, price: Decimal) -> None:
+        """Record a new price in the caller's transaction (the caller commits)"""
+        db.execute(insert(ProductPriceHistory).values(
+            product_id=product_id, price=price, changed_by=OutboxRepo.actor_id(db),
+        ))
+
+    @staticmethod
+    def list_for_product(
+        db: Session, product_id: int, *, since: Optional[datetime] = None, limit: int = 100,
+    ) -> List[ProductPriceHistory]:
+        stmt = select(ProductPriceHistory).where(ProductPriceHistory.product_id == product_id)
+        if since:
+            stmt = stmt.where(ProductPriceHistory.valid_from >= since)
+        stmt = stmt.order_by(ProductPriceHistory.valid_from.desc(), ProductPriceHistory.id.desc()).limit(limit)
+        return db.execute(stmt).scalars().all()
+
+    @staticmethod
+    def as_of(
+        db: Session, supplier_id: int, at: datetime, product_ids: Optional[List[int]] = None,
+    ) -> Sequence[Row]:
+        """
+        (product_id, price, valid_from, changed_by) in effect at `at` for a supplier's
+        products: DISTINCT ON walks ix_product_price_history_product_valid_from
+        backwards from `at`, one index probe per product.
+        """
+        h = ProductPriceHistory
+        stmt = (
+            select(h.product_id, h.price, h.valid_from, h.changed_by)
+            .join(Product, Product.id == h.product_id)
+            .where(Product.supplier_id == supplier_id, h.valid_from <= at)
+            .distinct(h.product_id)
+            .order_by(h.product_id, h.valid_from.desc(), h.id.desc())
+        )
+        if product_ids:
+            stmt = stmt.where(h.product_id == any_(bindparam("product_ids", product_ids, type_=ARRAY(Integer))))
+        return db.execute(stmt).all()
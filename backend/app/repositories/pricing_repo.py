@@ -0,0 +1,84 @@
+from decimal import Decimal
+from typing import List, Sequence
+from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, delete, update, Row
+from app.models.link_price import LinkPrice
+from app.models.price_tier import PriceTier
+from app.models.product import Product
+from app.models.supplier import Supplier
+
+
+class PricingRepo:
+    @staticmethod
+    def get_version(db: Session, supplier_id: int) -> int:
+        return db.execute(
+            select(Supplier.pricing_version).where(Supplier.id == supplier_id)
+        ).scalar_one_or_none() or 0
+
+    @staticmethod
+    def _bump_version(db: Session, supplier_id: int) -> None:
+        db.execute(
+            update(Supplier)
+            .where(Supplier.id == supplier_id)
+            .values(pricing_version=Supplier.pricing_version + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def tier_rows_for_supplier(db: Session, supplier_id: int) -> Sequence[Row]:
+        stmt = (
+            select(PriceTier.product_id, PriceTier.min_quantity, PriceTier.price)
+            .join(Product, Product.id == PriceTier.product_id)
+            .where(Product.supplier_id == supplier_id)
+        )
+        return db.execute(stmt).all()
+
+    @staticmethod
+    def link_rows_for_supplier(db: Session, supplier_id: int) -> Sequence[Row]:
+        stmt = (
+            select(LinkPrice.link_id, LinkPrice.product_id, LinkPrice.min_quantity, LinkPrice.price)
+            .join(Product, Product.id == LinkPrice.product_id)
+            .where(Product.supplier_id == supplier_id)
+        )
+        return db.execute(stmt).all()
+
+    @staticmethod
+    def list_tiers(db: Session, product_id: int) -> List[PriceTier]:
+        stmt = select(PriceTier).where(PriceTier.product_id == product_id).order_by(PriceTier.min_quantity)
+        return db.execute(stmt).scalars().all()
+
+    @staticmethod
+    def replace_tiers(db: Session, supplier_id: int, product_id: int, tiers: List[tuple[int, Decimal]]) -> List[PriceTier]:
+        """Swap a product's quantity breaks and bump the supplier's pricing version, one transaction"""
+        db.execute(delete(PriceTier).where(PriceTier.product_id == product_id))
+        if tiers:
+            db.execute(insert(PriceTier), [
+                {"product_id": product_id, "min_quantity": q, "price": p} for q, p in tiers
+            ])
+        PricingRepo._bump_version(db, supplier_id)
+        db.commit()
+        return PricingRepo.list_tiers(db, product_id)
+
+    @staticmethod
+    def list_link_prices(db: Session, link_id: int) -> List[LinkPrice]:
+        stmt = (
+            select(LinkPrice)
+            .where(LinkPrice.link_id == link_id)
+            .order_by(LinkPrice.product_id, LinkPrice.min_quantity)
+        )
+        return db.execute(stmt).scalars().all()
+
+    @staticmethod
+    def replace_link_prices(
+        db: Session, supplier_id: int, link_id: int, prices: List[tuple[int, int, Decimal]],
+    ) -> List[LinkPrice]:
+        """Swap a link's negotiated (product_id, min_quantity, price) rows and bump the pricing version"""
+        db.execute(delete(LinkPrice).where(LinkPrice.link_id == link_id))
+        if prices:
+            db.execute(insert(LinkPrice), [
+                {"link_id": link_id, "product_id": product_id, "min_quantity": q, "price": p}
+                for product_id, q, p in prices
+            ])
+        PricingRepo._bump_version(db, supplier_id)
+        db.commit()
+        return PricingRepo.list_link_prices(db, link_id)
@@ -1,27 +1,68 @@
-from typing import Iterable, Optional, List
-from sqlalchemy.orm import Session
-from sqlalchemy import select, update, delete
-from app.models.product import Product
+import re
+from decimal import Decimal
+from typing import Optional, List, Sequence
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy import select, values, column, case, literal, tuple_, func, Integer, Row
+from app.models.product import Product, NAME_TSVECTOR, SEARCH_CONFIG
+from app.models.supplier import Supplier
+from app.repositories.price_history_repo import PriceHistoryRepo
+from app.repositories.inventory_repo import InventoryRepo
+from app.repositories.link_repo import LinkRepo
+from app.enums import StockMovementReason
+
+# Catalog sort orders: (key columns, descending); id is the tiebreaker of every key
+CATALOG_SORTS = {
+    "-id": ((Product.id,), True),
+    "name": ((Product.name, Product.id), False),
+    "price": ((Product.price, Product.id), False),
+    "-price": ((Product.price, Product.id), True),
+}
+
+
+def escape_like(q: str) -> str:
+    return q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_tsquery(q: str) -> Optional[str]:
+    """'red toma' -> 'red:* & toma:*': every word, matched as a word prefix"""
+    words = re.findall(r"[^\W_]+", q.lower())[:8]
+    return " & ".join(f"{w}:*" for w in words) or None
+
+
+# Failure codes produced by ProductRepo.validate_basket
+LINE_NOT_FOUND = "NOT_FOUND"
+LINE_WRONG_SUPPLIER = "WRONG_SUPPLIER"
+LINE_INACTIVE = "INACTIVE"
+LINE_BELOW_MOQ = "BELOW_MOQ"
+LINE_OUT_OF_STOCK = "OUT_OF_STOCK"
 
 class ProductRepo:
     @staticmethod
-    def create(db: Session, *, supplier_id: int, name: str, unit: str, price: float, stock: int = 0, is_active: bool = True) -> Product:
+    def create(db: Session, *, supplier_id: int, name: str, unit: str, price: Decimal, stock: int = 0, is_active: bool = True) -> Product:
         obj = Product(
             supplier_id=supplier_id,
             name=name,
             unit=unit,
             price=price,
-            stock=stock,
             is_active=is_active,
         )
         db.add(obj)
+        db.flush()
+        PriceHistoryRepo.add(db, obj.id, price)
+        if stock:
+            InventoryRepo.add_supplier_movements(db, supplier_id, [{
+                "product_id": obj.id, "delta": stock, "reason": StockMovementReason.ADJUSTMENT, "note": "initial stock",
+            }])
         db.commit()
         db.refresh(obj)
         return obj
 
     @staticmethod
-    def by_id(db: Session, product_id: int) -> Optional[Product]:
-        return db.get(Product, product_id)
+    def by_id(db: Session, product_id: int, *, include_deleted: bool = False) -> Optional[Product]:
+        product = db.get(Product, product_id)
+        if product is not None and product.deleted_at is not None and not include_deleted:
+            return None
+        return product
 
     @staticmethod
     def get_by_ids(db: Session, product_ids: List[int]) -> List[Product]:
@@ -30,23 +71,183 @@ class ProductRepo:
         return db.execute(stmt).scalars().unique().all()
 
     @staticmethod
-    def list_by_supplier(db: Session, supplier_id: int, *, only_active: bool | None = None) -> Iterable[Product]:
-        stmt = select(Product).where(Product.supplier_id == supplier_id)
+    def validate_basket(db: Session, supplier_id: int, lines: list[tuple[int, int]]) -> Sequence[Row]:
+        """
+        Validate a whole basket of (product_id, quantity) lines in one query.
+
+        The lines are sent as a VALUES table and left-joined to products, so every
+        line comes back (in input order) with its current base price and the
+        first failed check as `failure`, or `failure=None` when the line is
+        orderable. Every row also carries the supplier's `pricing_version`, the
+        stamp of its cached price table (app/pricing/engine.py).
+        """
+        if not lines:
+            return []
+        basket = values(
+            column("line_no", Integer),
+            column("product_id", Integer),
+            column("quantity", Integer),
+            name="basket",
+        ).data([(i, product_id, quantity) for i, (product_id, quantity) in enumerate(lines)])
+
+        failure = case(
+            (Product.id.is_(None) | Product.deleted_at.isnot(None), literal(LINE_NOT_FOUND)),
+            (Product.supplier_id != supplier_id, literal(LINE_WRONG_SUPPLIER)),
+            (Product.is_active.is_(False), literal(LINE_INACTIVE)),
+            (basket.c.quantity < Product.moq, literal(LINE_BELOW_MOQ)),
+            (basket.c.quantity > Product.stock, literal(LINE_OUT_OF_STOCK)),
+            else_=None,
+        )
+        stmt = (
+            select(
+                basket.c.line_no,
+                basket.c.product_id,
+                basket.c.quantity,
+                Product.name,
+                Product.price.label("unit_price"),
+                Product.moq,
+                Product.stock,
+                failure.label("failure"),
+                select(Supplier.pricing_version)
+                .where(Supplier.id == supplier_id)
+                .scalar_subquery()
+                .label("pricing_version"),
+            )
+            .select_from(basket.outerjoin(Product, Product.id == basket.c.product_id))
+            .order_by(basket.c.line_no)
+        )
+        return db.execute(stmt).all()
+
+    @staticmethod
+    def list_by_supplier(
+        db: Session,
+        supplier_id: int,
+        *,
+        only_active: bool | None = None,
+        q: Optional[str] = None,
+        unit: Optional[str] = None,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+        sort: str = "-id",
+        after: Optional[Sequence] = None,
+        limit: Optional[int] = None,
+    ) -> List[Product]:
+        """
+        A supplier's catalog, filtered and sorted in SQL. Keyset-paginated:
+        `after` is the sort key (see CATALOG_SORTS / sort_key) of the last row
+        of the previous page. `q` is a case-insensitive substring match served
+        by the trigram index on name.
+        """
+        keys, descending = CATALOG_SORTS[sort]
+        stmt = select(Product).where(Product.supplier_id == supplier_id, Product.deleted_at.is_(None))
         if only_active:
             stmt = stmt.where(Product.is_active.is_(True))
-        stmt = stmt.order_by(Product.id.desc())
+        if q:
+            stmt = stmt.where(Product.name.ilike(f"%{escape_like(q)}%", escape="\\"))
+        if unit:
+            stmt = stmt.where(Product.unit == unit)
+        if min_price is not None:
+            stmt = stmt.where(Product.price >= min_price)
+        if max_price is not None:
+            stmt = stmt.where(Product.price <= max_price)
+        if after is not None:
+            position = tuple_(*keys) if len(keys) > 1 else keys[0]
+            bound = tuple_(*after) if len(keys) > 1 else after[0]
+            stmt = stmt.where(position < bound if descending else position > bound)
+        stmt = stmt.order_by(*(k.desc() if descending else k.asc() for k in keys))
+        if limit:
+            stmt = stmt.limit(limit)
         return db.execute(stmt).scalars().unique().all()
 
+    @staticmethod
+    def search(
+        db: Session,
+        consumer_id: int,
+        q: str,
+        *,
+        unit: Optional[str] = None,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+        after: Optional[Sequence] = None,
+        limit: int = 50,
+    ) -> List[Row]:
+        """
+        Active products of every supplier the consumer has an ACCEPTED link
+        with, in one query: (Product with its supplier, relevance) rows.
+
+        Relevance: 0 name is `q`, 1 name starts with `q`, 2 all words of `q`
+        start words of the name (ix_products_name_tsv). Ordered by
+        (relevance, price, id); `after` is that key of the previous page's last
+        row. Returns [] when `q` has no searchable word.
+        """
+        tsquery = search_tsquery(q)
+        if tsquery is None:
+            return []
+        phrase = " ".join(q.lower().split())
+        lower_name = func.lower(Product.name)
+        relevance = case(
+            (lower_name == phrase, 0),
+            (func.starts_with(lower_name, phrase), 1),
+            else_=2,
+        )
+        stmt = (
+            select(Product, relevance.label("relevance"))
+            .join(Product.supplier)
+            .options(contains_eager(Product.supplier))
+            .where(
+                Product.supplier_id.in_(LinkRepo.accepted_supplier_ids(consumer_id)),
+                Product.is_active.is_(True),
+                Product.deleted_at.is_(None),
+                NAME_TSVECTOR.op("@@")(func.to_tsquery(SEARCH_CONFIG, tsquery)),
+            )
+        )
+        if unit:
+            stmt = stmt.where(Product.unit == unit)
+        if min_price is not None:
+            stmt = stmt.where(Product.price >= min_price)
+        if max_price is not None:
+            stmt = stmt.where(Product.price <= max_price)
+        if after is not None:
+            stmt = stmt.where(tuple_(relevance, Product.price, Product.id) > tuple_(*after))
+        stmt = stmt.order_by(relevance, Product.price, Product.id).limit(limit)
+        return db.execute(stmt).unique().all()
+
+    @staticmethod
+    def sort_key(product: Product, sort: str) -> list:
+        """Cursor values of `product` for `sort`, the `after` of the next page"""
+        keys, _ = CATALOG_SORTS[sort]
+        return [getattr(product, k.key) for k in keys]
+
     @staticmethod
     def update(db: Session, product: Product, **data) -> Product:
+        """
+        Apply `data`; a changed price is appended to product_price_history in
+        the same transaction. `stock` is not a column: a new value is written
+        as an ADJUSTMENT movement of the difference.
+        """
+        new_stock = data.pop("stock", None)
+        if new_stock is not None and new_stock != product.stock:
+            InventoryRepo.add_supplier_movements(db, product.supplier_id, [{
+                "product_id": product.id, "delta": new_stock - product.stock,
+                "reason": StockMovementReason.ADJUSTMENT, "note": "set via product update",
+            }])
+        new_price = data.get("price")
+        price_changed = new_price is not None and Decimal(new_price) != product.price
         for k, v in data.items():
             setattr(product, k, v)
         db.add(product)
+        if price_changed:
+            PriceHistoryRepo.add(db, product.id, new_price)
         db.commit()
         db.refresh(product)
         return product
 
     @staticmethod
     def delete(db: Session, product: Product) -> None:
-        db.delete(product)
+        """
+        Soft delete: the row stays for the orders that reference it and is
+        moved to products_archive later (app/archive/products.py)
+        """
+        product.deleted_at = func.now()
+        db.add(product)
         db.commit()
@@ -0,0 +1,48 @@
+import hmac
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import get_settings
+from app.core.profiling import get_profile_store
+
+
+def require_admin_token(x_admin_token: str | None = Header(None)) -> None:
+    """Operational endpoints: a shared ADMIN_TOKEN, there is no admin user role"""
+    expected = get_settings().ADMIN_TOKEN
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
+
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin_token)])
+
+
+@router.get("/profiles")
+def list_profiles():
+    """Profiled routes of this worker: requests, stack samples, mean latency"""
+    return get_profile_store().summary()
+
+
+@router.get("/profiles/stacks")
+def get_profile(
+    route: str = Query(..., description='e.g. "GET /orders/me"'),
+    format: str = Query("collapsed", pattern="^(collapsed|speedscope)$"),
+):
+    """Collapsed stacks (one `frame;frame;... count` line each) or a speedscope document"""
+    store = get_profile_store()
+    if format == "speedscope":
+        doc = store.speedscope(route)
+        if doc is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No samples for this route")
+        return doc
+    text = store.collapsed(route)
+    if text is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No samples for this route")
+    return PlainTextResponse(text)
+
+
+@router.delete("/profiles", status_code=204)
+def clear_profiles():
+    get_profile_store().clear()
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Header, HTTPException, Query, Response, status
+from fastapi.responses import FileResponse
+
+from app.catalog import snapshot
+
+router = APIRouter(prefix="/catalog", tags=["catalog"])
+
+
+@router.get("/{supplier_id}/snapshot")
+def download_catalog_snapshot(
+    supplier_id: int,
+    consumer_id: int = Query(...),
+    expires: int = Query(...),
+    sig: str = Query(..., max_length=64),
+    accept_encoding: str = Header(""),
+    if_none_match: str | None = Header(None),
+):
+    """
+    Precomputed catalog file from a URL issued by GET /products/snapshot.
+    Only the signature is checked: no JWT decode, no DB.
+    """
+    if not snapshot.verify_snapshot_signature(supplier_id, consumer_id, expires, sig):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid or expired snapshot URL")
+
+    file = snapshot.select_file(supplier_id, accept_encoding)
+    if file is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Catalog snapshot not built yet")
+
+    headers = {"ETag": file.etag, "Vary": "Accept-Encoding", "Cache-Control": "private, no-cache"}
+    if if_none_match and file.etag in (t.strip() for t in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if file.encoding:
+        headers["Content-Encoding"] = file.encoding
+    return FileResponse(file.path, media_type="application/json", headers=headers)
@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.core.deps import get_db, auth_bearer  # твои зависимости
+from app.core.deps import get_db, auth_bearer, get_read_db  # твои зависимости
 from app.schemas.message import MessageCreate, MessageOut
+from app.schemas.attachment import AttachmentCreate, AttachmentOut
 from app.services.chat_service import ChatService
+from app.services.attachment_service import AttachmentService
+from app.storage.backends import get_storage
 from typing import List
 
 router = APIRouter(prefix="/chat", tags=["chat"])
@@ -22,7 +27,72 @@ def list_messages(
     link_id: int,
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user = Depends(auth_bearer),
 ):
     return ChatService.list_messages(db, link_id=link_id, current_user=current_user, limit=limit, offset=offset)
+
+# --- attachments (resumable upload, see app/services/attachment_service.py) ---
+
+@router.post("/{link_id}/attachments", response_model=AttachmentOut, status_code=201)
+def create_attachment(
+    link_id: int,
+    data: AttachmentCreate,
+    db: Session = Depends(get_db),
+    current_user = Depends(auth_bearer),
+):
+    return AttachmentService.create(db, link_id=link_id, current_user=current_user, data=data)
+
+@router.get("/{link_id}/attachments/{attachment_id}", response_model=AttachmentOut)
+def get_attachment(
+    link_id: int,
+    attachment_id: str,
+    db: Session = Depends(get_db),
+    current_user = Depends(auth_bearer),
+):
+    attachment = AttachmentService.get_for_participant(db, link_id=link_id, attachment_id=attachment_id, current_user=current_user)
+    return AttachmentService.status(attachment)
+
+@router.head("/{link_id}/attachments/{attachment_id}")
+def get_attachment_offset(
+    link_id: int,
+    attachment_id: str,
+    db: Session = Depends(get_db),
+    current_user = Depends(auth_bearer),
+):
+    """Upload-Offset to resume from"""
+    attachment = AttachmentService.get_for_participant(db, link_id=link_id, attachment_id=attachment_id, current_user=current_user)
+    info = AttachmentService.status(attachment)
+    return Response(headers={"Upload-Offset": str(info["offset"]), "Upload-Length": str(info["size"])})
+
+@router.patch("/{link_id}/attachments/{attachment_id}", response_model=AttachmentOut)
+async def upload_attachment_chunk(
+    request: Request,
+    link_id: int,
+    attachment_id: str,
+    upload_offset: int = Header(..., alias="Upload-Offset", ge=0),
+    db: Session = Depends(get_db),
+    current_user = Depends(auth_bearer),
+):
+    """Raw body (no multipart) with the bytes starting at Upload-Offset"""
+    attachment = await run_in_threadpool(
+        AttachmentService.get_for_upload, db, link_id=link_id, attachment_id=attachment_id, current_user=current_user
+    )
+    return await AttachmentService.receive(db, attachment, upload_offset, request.stream())
+
+@router.get("/{link_id}/attachments/{attachment_id}/content")
+def download_attachment(
+    link_id: int,
+    attachment_id: str,
+    db: Session = Depends(get_db),
+    current_user = Depends(auth_bearer),
+):
+    attachment = AttachmentService.get_for_participant(db, link_id=link_id, attachment_id=attachment_id, current_user=current_user)
+    if attachment.completed_at is None:
+        raise HTTPException(status_code=404, detail="Attachment upload not complete")
+    storage = get_storage()
+    headers = {"ETag": f'"{attachment.sha256}"'}
+    path = storage.local_path(attachment.storage_key)
+    if path:
+        return FileResponse(path, media_type=attachment.content_type, filename=attachment.filename, headers=headers)
+    return StreamingResponse(storage.iter_object(attachment.storage_key), media_type=attachment.content_type, headers=headers)
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Query, Response
 from sqlalchemy.orm import Session
 from typing import Optional
 
+from app.core.concurrency import parse_if_match, set_etag
 from app.core.deps import get_db, auth_bearer as get_current_user
 from app.core.permissions import require_roles
 from app.models.user import User
-from app.schemas.complaint import ComplaintCreate, ComplaintOut, ComplaintStatusUpdate
+from app.schemas.complaint import (
+    ComplaintCreate, ComplaintOut, ComplaintStatusUpdate, ComplaintQueueItem, ComplaintAgingCount,
+)
 from app.enums import ComplaintStatus, Role
 from app.services.complaint_service import ComplaintService
 
@@ -21,24 +24,65 @@ def create_complaint(payload: ComplaintCreate, db: Session = Depends(get_db), cu
         description=payload.description,
     )
 
+@router.get("/queue", response_model=list[ComplaintQueueItem])
+def complaint_queue(
+    status: Optional[ComplaintStatus] = Query(None),
+    mine: bool = Query(False, description="Only complaints assigned to me"),
+    assigned_to_id: Optional[int] = Query(None),
+    before_id: Optional[int] = Query(None, ge=1, description="Keyset cursor: complaints with id < before_id"),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Supplier staff complaint queue, newest first, with SLA aging bucket"""
+    return ComplaintService.queue(
+        db,
+        current_user=current_user,
+        status=status,
+        mine=mine,
+        assigned_to_id=assigned_to_id,
+        before_id=before_id,
+        limit=limit,
+    )
+
+@router.get("/queue/aging", response_model=list[ComplaintAgingCount])
+def complaint_queue_aging(
+    mine: bool = Query(False, description="Only complaints assigned to me"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Unresolved complaint counts per status and aging bucket"""
+    return ComplaintService.aging_summary(db, current_user=current_user, mine=mine)
+
 @router.patch("/{complaint_id}/status", response_model=ComplaintOut)
 def update_complaint_status(
     complaint_id: int,
     payload: ComplaintStatusUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return ComplaintService.update_status(db, current_user=current_user, complaint_id=complaint_id, status_to=payload.status)
+    complaint = ComplaintService.update_status(
+        db, current_user=current_user, complaint_id=complaint_id, status_to=payload.status,
+        expected_version=parse_if_match(if_match),
+    )
+    set_etag(response, complaint.version)
+    return complaint
 
 @router.post("/{complaint_id}/escalate", response_model=ComplaintOut)
 @require_roles(Role.SUPPLIER_SALES)
 def escalate_complaint(
     complaint_id: int,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """Sales escalates complaint to Manager/Owner"""
-    return ComplaintService.escalate(db, complaint_id, current_user)
+    complaint = ComplaintService.escalate(db, complaint_id, current_user, parse_if_match(if_match))
+    set_etag(response, complaint.version)
+    return complaint
 
 @router.get("", response_model=list[ComplaintOut])
 def list_complaints(
@@ -1,15 +1,28 @@
-from fastapi import APIRouter, Depends
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_db, auth_bearer
+from app.core.deps import get_db, auth_bearer, get_read_db
 from app.core.permissions import require_roles
-from app.schemas.link import LinkCreate, LinkOut
+from app.schemas.link import LinkCreate, LinkOut, LinkBatchStatusUpdate, LinkBatchStatusResult
+from app.schemas.pricing import LinkPriceOut, LinkPricesUpdate
 from app.services.link_service import LinkService
+from app.services.pricing_service import PricingService
 from app.models.user import User
-from app.enums import Role
+from app.enums import Role, LinkStatus
 
 router = APIRouter(prefix="/links", tags=["links"])
 
+@router.post("/batch-status", response_model=LinkBatchStatusResult)
+@require_roles(Role.SUPPLIER_OWNER, Role.SUPPLIER_MANAGER)
+def batch_set_link_status(
+    data: LinkBatchStatusUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(auth_bearer),
+):
+    """Supplier Owner/Manager accepts, blocks or removes many links in one request"""
+    return LinkService.batch_set_status(db, current_user, data)
+
 @router.post("/{supplier_id}", response_model=LinkOut, status_code=201)
 @require_roles(Role.CONSUMER)
 def request_link(
@@ -52,16 +65,37 @@ def remove_link(
     return LinkService.remove_link(db, current_user, link_id)
 
 @router.get("", response_model=list[LinkOut])
-def list_links(
+@router.get("/me", response_model=list[LinkOut])
+def get_my_links(
+    status: Optional[LinkStatus] = Query(None, description="Filter by link status"),
+    before_id: Optional[int] = Query(None, ge=1, description="Keyset cursor: return links with id < before_id"),
+    limit: Optional[int] = Query(None, ge=1, le=500),
     db: Session = Depends(get_db),
     current_user: User = Depends(auth_bearer),
 ):
-    return LinkService.list_my_links(db, current_user)
+    """Get links for current user (Consumer: outgoing, Supplier: incoming), newest first"""
+    return LinkService.list_my_links(
+        db, current_user, status_filter=status, before_id=before_id, limit=limit
+    )
 
-@router.get("/me", response_model=list[LinkOut])
-def get_my_links(
+@router.get("/{link_id}/prices", response_model=List[LinkPriceOut])
+def get_link_prices(
+    link_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(auth_bearer),
+):
+    """Prices negotiated on this link (its consumer or the supplier's staff)"""
+    return PricingService.get_link_prices(db, current_user=current_user, link_id=link_id)
+
+@router.put("/{link_id}/prices", response_model=List[LinkPriceOut])
+def set_link_prices(
+    link_id: int,
+    data: LinkPricesUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(auth_bearer),
 ):
-    """Get links for current user (Consumer: outgoing, Supplier: incoming)"""
-    return LinkService.list_my_links(db, current_user)
+    """
+    Supplier Owner replaces the link's negotiated prices. At checkout a line
+    pays the lowest of base price, quantity break and negotiated price it reaches.
+    """
+    return PricingService.set_link_prices(db, current_user=current_user, link_id=link_id, data=data)
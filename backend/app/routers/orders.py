@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from app.core.deps import get_db, auth_bearer
+from app.core.concurrency import parse_if_match, set_etag
+from app.core.deps import get_db, auth_bearer, get_read_db
 from app.core.permissions import require_roles
-from app.schemas.order import OrderCreate, OrderOut
+from app.schemas.order import (
+    OrderCreate, OrderOut, ReorderResult,
+    OrderBatchStatusUpdate, OrderBatchStatusResult,
+    OrderStatusUpdate, OrderStatusHistoryOut,
+)
+from app.schemas.order_template import OrderTemplateCreate, OrderTemplateOut
 from app.services.order_service import OrderService
 from app.models.user import User
 from app.enums import Role, OrderStatus
@@ -26,7 +32,8 @@ def create_order(
 @router.get("/me", response_model=List[OrderOut])
 def get_my_orders(
     status: Optional[OrderStatus] = Query(None, description="Filter by order status"),
-    db: Session = Depends(get_db),
+    active: bool = Query(False, description="Only open orders (CREATED, ACCEPTED, SHIPPED)"),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(auth_bearer),
 ):
     """
@@ -35,14 +42,89 @@ def get_my_orders(
     - **Consumer**: returns their orders
     - **Supplier (Owner/Manager/Sales)**: returns orders to their company
     - **status**: optional filter (CREATED, ACCEPTED, REJECTED, etc.)
+    - **active**: only orders that are not finished yet
+    """
+    return OrderService.list_my_orders(db, current_user, status, active)
+
+
+@router.post("/batch-status", response_model=OrderBatchStatusResult)
+@require_roles(Role.SUPPLIER_OWNER, Role.SUPPLIER_MANAGER, Role.SUPPLIER_SALES)
+def batch_update_order_status(
+    data: OrderBatchStatusUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(auth_bearer),
+):
+    """
+    Supplier staff move many orders to one status in one request
+    (accept/reject/cancel: Owner/Manager; ship/deliver: any staff).
+
+    Returns the ids that changed and a reason for each id that did not.
+    """
+    return OrderService.batch_update_status(db, current_user, data)
+
+
+# --- Order templates (declared before /{order_id} so "templates" is not parsed as an id) ---
+
+@router.post("/templates", response_model=OrderTemplateOut, status_code=201)
+@require_roles(Role.CONSUMER)
+def create_order_template(
+    data: OrderTemplateCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(auth_bearer),
+):
+    """Consumer saves a basket (explicit items or copied from `source_order_id`)"""
+    return OrderService.create_template(db, current_user, data)
+
+
+@router.get("/templates", response_model=List[OrderTemplateOut])
+@require_roles(Role.CONSUMER)
+def list_order_templates(
+    supplier_id: Optional[int] = Query(None, description="Filter by supplier"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(auth_bearer),
+):
+    """Consumer lists saved order templates"""
+    return OrderService.list_templates(db, current_user, supplier_id)
+
+
+@router.delete("/templates/{template_id}", status_code=204)
+@require_roles(Role.CONSUMER)
+def delete_order_template(
+    template_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(auth_bearer),
+):
+    """Consumer deletes a saved order template"""
+    OrderService.delete_template(db, current_user, template_id)
+    return None
+
+
+@router.post("/templates/{template_id}/order", response_model=ReorderResult, status_code=201)
+@require_roles(Role.CONSUMER)
+def order_from_template(
+    template_id: int,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(auth_bearer),
+):
     """
-    return OrderService.list_my_orders(db, current_user, status)
+    Consumer places an order from a saved template.
+
+    Lines that fail validation (inactive, wrong supplier, below MOQ, out of stock)
+    are skipped and listed in `failures`. If no line passed, nothing is
+    created: 200 with `order` null.
+    """
+    result = OrderService.order_from_template(db, current_user, template_id)
+    if result.order is None:
+        response.status_code = 200
+    return result
 
 
 @router.get("/{order_id}", response_model=OrderOut)
 def get_order_detail(
     order_id: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(auth_bearer),
 ):
     """
@@ -50,28 +132,89 @@ def get_order_detail(
 
     - Consumer can view their own orders
     - Supplier staff can view orders to their company
+
+    The `ETag` is the order version, for `If-Match` on status changes.
     """
-    return OrderService.get_order_detail(db, current_user, order_id)
+    order = OrderService.get_order_detail(db, current_user, order_id)
+    set_etag(response, order.version)
+    return order
 
 
 @router.post("/{order_id}/accept", response_model=OrderOut)
 @require_roles(Role.SUPPLIER_OWNER, Role.SUPPLIER_MANAGER)
 def accept_order(
     order_id: int,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(auth_bearer),
 ):
     """Supplier Owner/Manager accepts order"""
-    return OrderService.accept_order(db, current_user, order_id)
+    order = OrderService.accept_order(db, current_user, order_id, parse_if_match(if_match))
+    set_etag(response, order.version)
+    return order
 
 
 @router.post("/{order_id}/reject", response_model=OrderOut)
 @require_roles(Role.SUPPLIER_OWNER, Role.SUPPLIER_MANAGER)
 def reject_order(
     order_id: int,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(auth_bearer),
 ):
     """Supplier Owner/Manager rejects order"""
-    return OrderService.reject_order(db, current_user, order_id)
+    order = OrderService.reject_order(db, current_user, order_id, parse_if_match(if_match))
+    set_etag(response, order.version)
+    return order
+
+
+@router.post("/{order_id}/status", response_model=OrderOut)
+def change_order_status(
+    order_id: int,
+    data: OrderStatusUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(auth_bearer),
+):
+    """
+    Move an order along its lifecycle:
+    CREATED -> ACCEPTED/REJECTED/CANCELLED, ACCEPTED -> SHIPPED/CANCELLED, SHIPPED -> DELIVERED.
+    Consumers may cancel CREATED orders and confirm delivery; 409 if the status changed meanwhile,
+    412 if `If-Match` names an outdated version.
+    """
+    order = OrderService.change_status(db, current_user, order_id, data.status, parse_if_match(if_match))
+    set_etag(response, order.version)
+    return order
+
+
+@router.get("/{order_id}/history", response_model=List[OrderStatusHistoryOut])
+def get_order_status_history(
+    order_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(auth_bearer),
+):
+    """Status changes of the order, oldest first"""
+    return OrderService.status_history(db, current_user, order_id)
 
+
+@router.post("/{order_id}/reorder", response_model=ReorderResult, status_code=201)
+@require_roles(Role.CONSUMER)
+def reorder(
+    order_id: int,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(auth_bearer),
+):
+    """
+    Consumer re-places one of their previous orders.
+
+    Lines that fail validation are skipped and listed in `failures`. If no
+    line passed, nothing is created: 200 with `order` null.
+    """
+    result = OrderService.reorder(db, current_user, order_id)
+    if result.order is None:
+        response.status_code = 200
+    return result
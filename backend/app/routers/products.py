@@ -1,10 +1,17 @@
+from datetime import datetime
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Query, Response
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_db, auth_bearer
-from app.schemas.product import ProductCreate, ProductUpdate, ProductOut
+from app.core.concurrency import parse_if_match, set_etag
+from app.core.pagination import set_next_cursor
+from app.core.deps import get_db, auth_bearer, get_read_db
+from app.schemas.product import ProductCreate, ProductUpdate, ProductOut, ProductPriceOut, ProductFilter, ProductSearch, CatalogSnapshotLink
+from app.schemas.inventory import StockAdjustment, StockMovementBatch, StockMovementOut, StockLevel
+from app.schemas.pricing import PriceTierOut, PriceTiersUpdate
 from app.services.product_service import ProductService
+from app.services.pricing_service import PricingService
+from app.services.inventory_service import InventoryService
 from app.models.user import User
 from app.enums.role import Role
 
@@ -25,42 +32,177 @@ def create_product(
 def update_product(
     product_id: int,
     data: ProductUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     current_user: User = Depends(auth_bearer),
     db: Session = Depends(get_db),
 ):
-    return ProductService.update(db, current_user=current_user, product_id=product_id, data=data)
+    """
+    Send `If-Match: "<version>"` to update only the version you read:
+    412 if it is already outdated, 409 if another update wins meanwhile.
+    """
+    product = ProductService.update(
+        db, current_user=current_user, product_id=product_id, data=data,
+        expected_version=parse_if_match(if_match),
+    )
+    set_etag(response, product.version)
+    return product
 
 @router.delete("/{product_id}", status_code=204)
 def delete_product(
     product_id: int,
+    if_match: Optional[str] = Header(None),
     current_user: User = Depends(auth_bearer),
     db: Session = Depends(get_db),
 ):
-    ProductService.delete(db, current_user=current_user, product_id=product_id)
+    ProductService.delete(
+        db, current_user=current_user, product_id=product_id,
+        expected_version=parse_if_match(if_match),
+    )
     return
 
 @router.get("/mine", response_model=List[ProductOut])
 def list_my_products(
+    response: Response,
+    filters: ProductFilter = Depends(),
     current_user: User = Depends(auth_bearer),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    return ProductService.list_for_my_supplier(db, current_user=current_user)
+    items, next_cursor = ProductService.list_for_my_supplier(db, current_user=current_user, filters=filters)
+    set_next_cursor(response, next_cursor)
+    return items
 
 @router.get("/me", response_model=List[ProductOut])
 def get_my_products(
+    response: Response,
+    filters: ProductFilter = Depends(),
     current_user: User = Depends(auth_bearer),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Alias for /mine - get products for current supplier"""
-    return ProductService.list_for_my_supplier(db, current_user=current_user)
+    items, next_cursor = ProductService.list_for_my_supplier(db, current_user=current_user, filters=filters)
+    set_next_cursor(response, next_cursor)
+    return items
 
 # --- Consumer route ---
 
 @router.get("", response_model=List[ProductOut])
 def list_products_for_supplier(
+    response: Response,
     supplier_id: int = Query(..., description="Supplier ID"),
+    filters: ProductFilter = Depends(),
     current_user: User = Depends(auth_bearer),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
+    """
+    Filter with q / unit / min_price / max_price. With `limit`, a full page
+    carries X-Next-Cursor; pass it back as `cursor` (same filters and sort).
+    """
     # В сервисе: проверка роли consumer и ACCEPTED link
-    return ProductService.list_for_consumer(db, current_user=current_user, supplier_id=supplier_id)
+    items, next_cursor = ProductService.list_for_consumer(
+        db, current_user=current_user, supplier_id=supplier_id, filters=filters,
+    )
+    set_next_cursor(response, next_cursor)
+    return items
+
+@router.get("/search", response_model=List[ProductOut])
+def search_products(
+    response: Response,
+    params: ProductSearch = Depends(),
+    current_user: User = Depends(auth_bearer),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Search active products of every supplier you have an accepted link with.
+    Each product comes with its supplier. A full page carries X-Next-Cursor;
+    pass it back as `cursor` with the same q and filters.
+    """
+    items, next_cursor = ProductService.search(db, current_user=current_user, params=params)
+    set_next_cursor(response, next_cursor)
+    return items
+
+@router.get("/prices", response_model=List[ProductPriceOut])
+def get_prices_as_of(
+    supplier_id: int = Query(..., description="Supplier ID"),
+    at: datetime = Query(..., description="Point in time, e.g. an order's created_at"),
+    product_ids: Optional[List[int]] = Query(None, description="Limit to these products"),
+    current_user: User = Depends(auth_bearer),
+    db: Session = Depends(get_read_db),
+):
+    """Price of each product that was in effect at `at` (supplier staff or linked consumers)"""
+    return ProductService.prices_as_of(
+        db, current_user=current_user, supplier_id=supplier_id, at=at, product_ids=product_ids,
+    )
+
+@router.get("/{product_id}/prices", response_model=List[ProductPriceOut])
+def get_price_history(
+    product_id: int,
+    since: Optional[datetime] = Query(None),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: User = Depends(auth_bearer),
+    db: Session = Depends(get_read_db),
+):
+    """Price changes of a product, newest first"""
+    return ProductService.price_history(
+        db, current_user=current_user, product_id=product_id, since=since, limit=limit,
+    )
+
+@router.post("/stock/movements", response_model=List[StockLevel])
+def record_stock_movements(
+    data: StockMovementBatch,
+    current_user: User = Depends(auth_bearer),
+    db: Session = Depends(get_db),
+):
+    """Owner/Manager records a warehouse import or bulk correction in one batch"""
+    return InventoryService.record_batch(db, current_user=current_user, data=data)
+
+@router.post("/{product_id}/stock", response_model=StockLevel)
+def adjust_stock(
+    product_id: int,
+    data: StockAdjustment,
+    current_user: User = Depends(auth_bearer),
+    db: Session = Depends(get_db),
+):
+    """Owner/Manager adds or removes units; recorded as a movement, the product row is not locked"""
+    return InventoryService.adjust(db, current_user=current_user, product_id=product_id, data=data)
+
+@router.get("/{product_id}/stock/movements", response_model=List[StockMovementOut])
+def list_stock_movements(
+    product_id: int,
+    before_id: Optional[int] = Query(None, ge=1, description="Keyset cursor: movements with id < before_id"),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: User = Depends(auth_bearer),
+    db: Session = Depends(get_read_db),
+):
+    """Stock ledger of a product, newest first (supplier staff)"""
+    return InventoryService.movements(
+        db, current_user=current_user, product_id=product_id, before_id=before_id, limit=limit,
+    )
+
+@router.get("/{product_id}/tiers", response_model=List[PriceTierOut])
+def get_price_tiers(
+    product_id: int,
+    current_user: User = Depends(auth_bearer),
+    db: Session = Depends(get_read_db),
+):
+    """Quantity breaks of a product (supplier staff or linked consumers)"""
+    return PricingService.get_tiers(db, current_user=current_user, product_id=product_id)
+
+@router.put("/{product_id}/tiers", response_model=List[PriceTierOut])
+def set_price_tiers(
+    product_id: int,
+    data: PriceTiersUpdate,
+    current_user: User = Depends(auth_bearer),
+    db: Session = Depends(get_db),
+):
+    """Owner replaces the product's quantity breaks (unit price from `min_quantity` up)"""
+    return PricingService.set_tiers(db, current_user=current_user, product_id=product_id, data=data)
+
+@router.get("/snapshot", response_model=CatalogSnapshotLink)
+def get_catalog_snapshot_link(
+    supplier_id: int = Query(..., description="Supplier ID"),
+    current_user: User = Depends(auth_bearer),
+    db: Session = Depends(get_db),
+):
+    """Signed URL of the supplier's precomputed catalog file (see GET /catalog/{supplier_id}/snapshot)"""
+    return ProductService.snapshot_link(db, current_user=current_user, supplier_id=supplier_id)
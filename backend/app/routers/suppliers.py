@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.core.deps import get_db, auth_bearer
+from app.core.deps import get_db, auth_bearer, get_read_db
 from app.schemas.supplier import SupplierCreate, SupplierOut
 from app.services.supplier_service import SupplierService
 from app.models.user import User
@@ -32,7 +32,7 @@ def list_suppliers(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     search: str | None = Query(None, max_length=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(auth_bearer),
 ):
     """Consumer discovery: list all suppliers"""
@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class AttachmentCreate(BaseModel):
+    filename: str = Field(..., min_length=1, max_length=255)
+    content_type: str = Field(..., max_length=127)
+    size: int = Field(..., gt=0)
+    sha256: Optional[str] = Field(default=None, pattern=r"^[0-9a-f]{64}$")  # verified on completion
+
+
+class AttachmentOut(BaseModel):
+    id: str
+    link_id: int
+    filename: str
+    content_type: str
+    size: int
+    offset: int                      # bytes received; resume PATCH from here
+    complete: bool
+    sha256: Optional[str] = None
+    url: Optional[str] = None        # pass as file_url/audio_url to POST /chat/{link_id}/messages
+    created_at: datetime
@@ -1,6 +1,7 @@
+from datetime import datetime
 from pydantic import BaseModel, Field, model_validator
 from typing import Optional
-from app.enums import ComplaintStatus
+from app.enums import ComplaintStatus, ComplaintAgeBucket
 
 class ComplaintCreate(BaseModel):
    
@@ -21,8 +22,21 @@ class ComplaintOut(BaseModel):
     id: int
     link_id: Optional[int] = None
     order_id: Optional[int] = None
+    supplier_id: Optional[int] = None
     description: str
     status: ComplaintStatus
+    version: int
 
     class Config:
         from_attributes = True
+
+class ComplaintQueueItem(ComplaintOut):
+    created_at: datetime
+    assigned_to_id: Optional[int] = None
+    escalated_at: Optional[datetime] = None
+    age_bucket: Optional[ComplaintAgeBucket] = None
+
+class ComplaintAgingCount(BaseModel):
+    status: ComplaintStatus
+    age_bucket: ComplaintAgeBucket
+    count: int
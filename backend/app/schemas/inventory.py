@@ -0,0 +1,51 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field, field_validator
+
+from app.enums import StockMovementReason
+
+
+class StockAdjustment(BaseModel):
+    delta: int = Field(..., description="Units added (>0) or removed (<0)")
+    note: Optional[str] = Field(default=None, max_length=255)
+
+    @field_validator("delta")
+    @classmethod
+    def non_zero(cls, v: int) -> int:
+        if v == 0:
+            raise ValueError("delta must not be 0")
+        return v
+
+class StockMovementIn(StockAdjustment):
+    product_id: int
+    reason: StockMovementReason = StockMovementReason.ADJUSTMENT
+
+    @field_validator("reason")
+    @classmethod
+    def manual_reason(cls, v: StockMovementReason) -> StockMovementReason:
+        if v not in (StockMovementReason.ADJUSTMENT, StockMovementReason.IMPORT):
+            raise ValueError("reason must be ADJUSTMENT or IMPORT")
+        return v
+
+class StockMovementBatch(BaseModel):
+    movements: List[StockMovementIn] = Field(..., min_length=1, max_length=10000)
+
+class StockMovementOut(BaseModel):
+    id: int
+    product_id: int
+    delta: int
+    reason: StockMovementReason
+    order_id: Optional[int] = None
+    actor_id: Optional[int] = None
+    note: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class StockLevel(BaseModel):
+    product_id: int
+    stock: int
+
+    class Config:
+        from_attributes = True
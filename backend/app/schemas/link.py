@@ -1,6 +1,6 @@
 from __future__ import annotations
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from app.enums import LinkStatus
 
 class LinkCreate(BaseModel):
@@ -17,6 +17,21 @@ class LinkOut(BaseModel):
     class Config:
         from_attributes = True
 
+class LinkBatchStatusUpdate(BaseModel):
+    link_ids: List[int] = Field(..., min_length=1, max_length=1000)
+    status: LinkStatus
+
+
+class LinkBatchFailure(BaseModel):
+    link_id: int
+    reason: str
+
+
+class LinkBatchStatusResult(BaseModel):
+    status: LinkStatus
+    succeeded: List[int] = []
+    failed: List[LinkBatchFailure] = []
+
 # Resolve forward references
 from app.schemas.supplier import SupplierOut
 from app.schemas.user import UserBasic
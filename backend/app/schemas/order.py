@@ -1,7 +1,7 @@
 from __future__ import annotations
 from datetime import datetime
 from typing import List, Optional
-from pydantic import BaseModel, conint
+from pydantic import AliasChoices, BaseModel, Field, conint, field_validator
 
 from app.enums import OrderStatus
 
@@ -35,17 +35,71 @@ class OrderOut(BaseModel):
     total_amount: float
     status: OrderStatus
     created_at: datetime
+    version: int
     supplier: Optional['SupplierOut'] = None
     consumer: Optional['UserBasic'] = None
-    items: List[OrderItemOut] = []
+    # Order.lines: hot lines plus archived ones
+    items: List[OrderItemOut] = Field(default=[], validation_alias=AliasChoices("lines", "items"))
 
     class Config:
         from_attributes = True
 
+
+class OrderLineFailure(BaseModel):
+    """Basket line that could not be ordered, with the failed check"""
+    product_id: int
+    quantity: int
+    reason: str
+    moq: Optional[int] = None
+    stock: Optional[int] = None
+
+
+class ReorderResult(BaseModel):
+    """Order placed from the valid lines (None if no line passed) plus per-line failures"""
+    order: Optional[OrderOut] = None
+    failures: List[OrderLineFailure] = []
+
+class OrderBatchStatusUpdate(BaseModel):
+    order_ids: List[int] = Field(..., min_length=1, max_length=1000)
+    status: OrderStatus
+
+    @field_validator("status")
+    @classmethod
+    def validate_target(cls, v: OrderStatus) -> OrderStatus:
+        if v == OrderStatus.CREATED:
+            raise ValueError("Target status cannot be CREATED")
+        return v
+
+
+class OrderStatusUpdate(BaseModel):
+    status: OrderStatus
+
+
+class OrderStatusHistoryOut(BaseModel):
+    from_status: Optional[OrderStatus] = None
+    to_status: OrderStatus
+    actor_id: Optional[int] = None
+    at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class OrderBatchFailure(BaseModel):
+    order_id: int
+    reason: str
+
+
+class OrderBatchStatusResult(BaseModel):
+    status: OrderStatus
+    succeeded: List[int] = []
+    failed: List[OrderBatchFailure] = []
+
 # Resolve forward references
 from app.schemas.supplier import SupplierOut
 from app.schemas.user import UserBasic
 from app.schemas.product import ProductOut
 OrderItemOut.model_rebuild()
 OrderOut.model_rebuild()
+ReorderResult.model_rebuild()
 
@@ -0,0 +1,43 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field, conint, model_validator
+
+from app.schemas.order import OrderItemCreate
+
+
+class OrderTemplateCreate(BaseModel):
+    """Either explicit supplier_id + items, or source_order_id to copy an order's lines"""
+    name: str = Field(min_length=1, max_length=255)
+    supplier_id: Optional[int] = None
+    items: Optional[List[OrderItemCreate]] = None
+    source_order_id: Optional[int] = None
+
+    @model_validator(mode="after")
+    def validate_source(self):
+        if self.source_order_id:
+            return self
+        if not self.supplier_id or not self.items:
+            raise ValueError("Either source_order_id or supplier_id with items must be provided")
+        return self
+
+
+class OrderTemplateItemOut(BaseModel):
+    id: int
+    product_id: int
+    quantity: conint(ge=1)
+
+    class Config:
+        from_attributes = True
+
+
+class OrderTemplateOut(BaseModel):
+    id: int
+    consumer_id: int
+    supplier_id: int
+    name: str
+    created_at: datetime
+    items: List[OrderTemplateItemOut] = []
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,49 @@
+from typing import List
+from pydantic import BaseModel, Field, conint, condecimal, field_validator
+
+
+class PriceTierIn(BaseModel):
+    min_quantity: conint(ge=1)
+    price: condecimal(gt=0, max_digits=12, decimal_places=2)
+
+class PriceTierOut(BaseModel):
+    min_quantity: int
+    price: float
+
+    class Config:
+        from_attributes = True
+
+class PriceTiersUpdate(BaseModel):
+    """Replaces all quantity breaks of the product; an empty list removes them"""
+    tiers: List[PriceTierIn] = Field(default_factory=list, max_length=100)
+
+    @field_validator("tiers")
+    @classmethod
+    def unique_quantities(cls, v: List[PriceTierIn]) -> List[PriceTierIn]:
+        if len({t.min_quantity for t in v}) != len(v):
+            raise ValueError("min_quantity must be unique")
+        return v
+
+class LinkPriceIn(BaseModel):
+    product_id: int
+    min_quantity: conint(ge=1) = 1
+    price: condecimal(gt=0, max_digits=12, decimal_places=2)
+
+class LinkPriceOut(BaseModel):
+    product_id: int
+    min_quantity: int
+    price: float
+
+    class Config:
+        from_attributes = True
+
+class LinkPricesUpdate(BaseModel):
+    """Replaces all prices negotiated on the link; an empty list removes them"""
+    prices: List[LinkPriceIn] = Field(default_factory=list, max_length=10000)
+
+    @field_validator("prices")
+    @classmethod
+    def unique_breaks(cls, v: List[LinkPriceIn]) -> List[LinkPriceIn]:
+        if len({(p.product_id, p.min_quantity) for p in v}) != len(v):
+            raise ValueError("(product_id, min_quantity) must be unique")
+        return v
@@ -1,6 +1,7 @@
 from __future__ import annotations
-from typing import Optional
-from pydantic import BaseModel, ConfigDict, conint, condecimal
+from datetime import datetime
+from typing import Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field, conint, condecimal
 
 class ProductCreate(BaseModel):
     name: str
@@ -18,6 +19,25 @@ class ProductUpdate(BaseModel):
     moq: Optional[conint(ge=1)] = None
     is_active: Optional[bool] = None
 
+class ProductFilter(BaseModel):
+    """Catalog query parameters; pass `limit` to page, then the X-Next-Cursor header back as `cursor`"""
+    q: Optional[str] = Field(default=None, min_length=2, max_length=100, description="Name contains (case-insensitive)")
+    unit: Optional[str] = None
+    min_price: Optional[condecimal(ge=0)] = None
+    max_price: Optional[condecimal(ge=0)] = None
+    sort: Literal["-id", "name", "price", "-price"] = "-id"
+    cursor: Optional[str] = None
+    limit: Optional[conint(ge=1, le=500)] = None
+
+class ProductSearch(BaseModel):
+    """Cross-supplier search; results come best match first, then cheapest"""
+    q: str = Field(min_length=2, max_length=100, description="Words or word beginnings, e.g. 'cherry tom'")
+    unit: Optional[str] = None
+    min_price: Optional[condecimal(ge=0)] = None
+    max_price: Optional[condecimal(ge=0)] = None
+    cursor: Optional[str] = None
+    limit: conint(ge=1, le=100) = 50
+
 class ProductOut(BaseModel):
     id: int
     supplier_id: int
@@ -27,10 +47,26 @@ class ProductOut(BaseModel):
     stock: int
     moq: int
     is_active: bool
+    version: int
     supplier: Optional['SupplierOut'] = None
 
     model_config = ConfigDict(from_attributes=True)
 
+class ProductPriceOut(BaseModel):
+    """A price valid from `valid_from` until the next change"""
+    product_id: int
+    price: float
+    valid_from: datetime
+    changed_by: Optional[int] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class CatalogSnapshotLink(BaseModel):
+    """Signed, expiring URL of a supplier's precomputed catalog file"""
+    url: str
+    version: str
+    expires_at: datetime
+
 # Resolve forward references
 from app.schemas.supplier import SupplierOut
 ProductOut.model_rebuild()
@@ -0,0 +1,234 @@
+"""
+Resumable attachment uploads (tus-style, raw request bodies).
+
+1. POST  /chat/{link_id}/attachments                -> upload id, offset 0
+2. PATCH /chat/{link_id}/attachments/{id}           Upload-Offset: N, body = bytes N..
+   (repeat after a dropped connection; HEAD returns the offset to resume from)
+3. when offset == size the object is completed and `url` can be sent as a
+   message's file_url/audio_url.
+
+Bodies are streamed to the storage backend in bounded chunks and hashed as
+they arrive; nothing holds a whole file in memory.
+"""
+import hashlib
+import os
+import re
+import uuid
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
+
+from app.core.config import get_settings
+from app.models.attachment import Attachment
+from app.repositories.attachment_repo import AttachmentRepo
+from app.schemas.attachment import AttachmentCreate
+from app.services.chat_service import ChatService
+from app.storage.backends import get_storage
+
+WRITE_CHUNK = 256 * 1024
+_URL_RE = re.compile(r"^/chat/(\d+)/attachments/([0-9a-f]{32})/content$")
+
+# hash state of uploads in progress in this process:
+# id -> (offset, storage partial_version after the write, sha256)
+_hashers: Dict[str, Tuple[int, Optional[str], "hashlib._Hash"]] = {}
+_MAX_HASHERS = 1000
+
+
+def content_url(attachment: Attachment) -> str:
+    return f"/chat/{attachment.link_id}/attachments/{attachment.id}/content"
+
+
+class AttachmentService:
+    @staticmethod
+    def _out(attachment: Attachment, offset: int) -> dict:
+        complete = attachment.completed_at is not None
+        return {
+            "id": attachment.id,
+            "link_id": attachment.link_id,
+            "filename": attachment.filename,
+            "content_type": attachment.content_type,
+            "size": attachment.size,
+            "offset": attachment.size if complete else offset,
+            "complete": complete,
+            "sha256": attachment.sha256,
+            "url": content_url(attachment) if complete else None,
+            "created_at": attachment.created_at,
+        }
+
+    @staticmethod
+    def create(db: Session, *, link_id: int, current_user, data: AttachmentCreate) -> dict:
+        link = ChatService._get_link_and_check(db, link_id=link_id, current_user=current_user)
+        settings = get_settings()
+        if data.size > settings.ATTACHMENT_MAX_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Attachment exceeds {settings.ATTACHMENT_MAX_BYTES} bytes",
+            )
+        allowed = tuple(t.strip() for t in settings.ATTACHMENT_CONTENT_TYPES.split(",") if t.strip())
+        if not data.content_type.lower().startswith(allowed):
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail=f"Content type {data.content_type} is not allowed",
+            )
+        filename = os.path.basename(data.filename.replace("\\", "/")).strip() or "file"
+
+        attachment_id = uuid.uuid4().hex
+        attachment = AttachmentRepo.create(
+            db,
+            id=attachment_id,
+            link_id=link.id,
+            uploader_id=current_user.id,
+            filename=filename,
+            content_type=data.content_type,
+            size=data.size,
+            storage_key=f"{link.id}/{attachment_id}",
+            expected_sha256=data.sha256,
+        )
+        return AttachmentService._out(attachment, 0)
+
+    @staticmethod
+    def get_for_participant(db: Session, *, link_id: int, attachment_id: str, current_user) -> Attachment:
+        ChatService._get_link_and_check(db, link_id=link_id, current_user=current_user)
+        attachment = AttachmentRepo.get(db, attachment_id)
+        if not attachment or attachment.link_id != link_id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Attachment not found")
+        return attachment
+
+    @staticmethod
+    def get_for_upload(db: Session, *, link_id: int, attachment_id: str, current_user) -> Attachment:
+        attachment = AttachmentService.get_for_participant(
+            db, link_id=link_id, attachment_id=attachment_id, current_user=current_user
+        )
+        if attachment.uploader_id != current_user.id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only the uploader can upload this attachment")
+        return attachment
+
+    @staticmethod
+    def status(attachment: Attachment) -> dict:
+        offset = 0 if attachment.completed_at else get_storage().size(attachment.storage_key)
+        return AttachmentService._out(attachment, offset)
+
+    @staticmethod
+    async def receive(db: Session, attachment: Attachment, offset: int, chunks: AsyncIterator[bytes]) -> dict:
+        """
+        Append the request body at `offset`; completes the upload when all bytes
+        are in. The attachment row stays locked until this request ends, so a
+        retried PATCH that overlaps a running one gets 409 instead of writing
+        into the same file.
+        """
+        storage = get_storage()
+        key = attachment.storage_key
+        locked = await run_in_threadpool(AttachmentRepo.lock_for_upload, db, attachment.id)
+        if locked is None:
+            received = await run_in_threadpool(storage.size, key)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Another request is uploading this attachment",
+                headers={"Upload-Offset": str(received)},
+            )
+        attachment = locked
+        if attachment.completed_at is not None:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Upload already complete")
+
+        received = await run_in_threadpool(storage.size, key)
+        if offset != received:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Upload-Offset must be {received}",
+                headers={"Upload-Offset": str(received)},
+            )
+
+        hasher = await AttachmentService._hasher(attachment, received)
+        f = await run_in_threadpool(storage.open_append, key, offset)
+        written, pending = offset, []
+        pending_size = 0
+        try:
+            async for chunk in chunks:
+                if written + pending_size + len(chunk) > attachment.size:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"Body exceeds declared size {attachment.size}",
+                    )
+                pending.append(chunk)
+                pending_size += len(chunk)
+                if pending_size >= WRITE_CHUNK:
+                    written = await AttachmentService._write(f, hasher, pending, written)
+                    pending, pending_size = [], 0
+            written = await AttachmentService._write(f, hasher, pending, written)
+        except ClientDisconnect:
+            # keep what was written; the client resumes from HEAD's Upload-Offset
+            pass
+        finally:
+            await run_in_threadpool(f.close)
+
+        if written < attachment.size:
+            version = await run_in_threadpool(storage.partial_version, key)
+            _hashers[attachment.id] = (written, version, hasher)
+            return AttachmentService._out(attachment, written)
+        return await run_in_threadpool(AttachmentService._finalize, db, attachment, hasher)
+
+    @staticmethod
+    async def _write(f, hasher, chunks, written: int) -> int:
+        if not chunks:
+            return written
+        data = b"".join(chunks)
+        await run_in_threadpool(f.write, data)
+        hasher.update(data)
+        return written + len(data)
+
+    @staticmethod
+    async def _hasher(attachment: Attachment, offset: int):
+        cached = _hashers.pop(attachment.id, None)
+        if cached is not None and cached[0] == offset and cached[1] is not None:
+            # the stored bytes must be the ones hashed here, not a file another
+            # worker wrote or recreated (e.g. restarted after a checksum mismatch)
+            version = await run_in_threadpool(get_storage().partial_version, attachment.storage_key)
+            if version == cached[1]:
+                return cached[2]
+        # resumed on another worker/process: re-hash what is already stored
+        if len(_hashers) >= _MAX_HASHERS:
+            _hashers.clear()
+
+        def rehash():
+            hasher, seen = hashlib.sha256(), 0
+            for chunk in get_storage().iter_partial(attachment.storage_key):
+                chunk = chunk[: offset - seen]
+                hasher.update(chunk)
+                seen += len(chunk)
+                if seen >= offset:
+                    break
+            return hasher
+
+        return await run_in_threadpool(rehash)
+
+    @staticmethod
+    def _finalize(db: Session, attachment: Attachment, hasher) -> dict:
+        digest = hasher.hexdigest()
+        storage = get_storage()
+        if attachment.expected_sha256 and attachment.expected_sha256 != digest:
+            storage.delete(attachment.storage_key)
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Checksum mismatch; upload discarded, restart from offset 0",
+            )
+        storage.complete(attachment.storage_key)
+        attachment = AttachmentRepo.mark_complete(db, attachment, digest)
+        return AttachmentService._out(attachment, attachment.size)
+
+    @staticmethod
+    def ensure_message_url(db: Session, *, link_id: int, url: Optional[str]) -> None:
+        """Attachment URLs in a message must point at a completed upload of the same link"""
+        if not url or not url.startswith("/chat/"):
+            return
+        m = _URL_RE.match(url)
+        attachment = AttachmentRepo.get(db, m.group(2)) if m else None
+        if (
+            attachment is None
+            or int(m.group(1)) != link_id
+            or attachment.link_id != link_id
+            or attachment.completed_at is None
+        ):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown or incomplete attachment: {url}")
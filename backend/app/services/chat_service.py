@@ -3,7 +3,6 @@ from fastapi import HTTPException, status
 from app.repositories.link_repo import LinkRepo
 from app.repositories.message_repo import MessageRepo
 from app.schemas.message import MessageCreate
-#from app.audit.logger import log_event  
 
 class ChatService:
     @staticmethod
@@ -36,6 +35,10 @@ class ChatService:
 
         link = ChatService._get_link_and_check(db, link_id=link_id, current_user=current_user)
 
+        from app.services.attachment_service import AttachmentService
+        for url in (data.file_url, data.audio_url):
+            AttachmentService.ensure_message_url(db, link_id=link.id, url=url)
+
         msg = MessageRepo.create(
             db,
             link_id=link.id,
@@ -44,12 +47,7 @@ class ChatService:
             file_url=data.file_url,
             audio_url=data.audio_url,
         )
-
-        # аудит (необязательно)
-        try:
-            log_event(current_user.id, "chat_message_created", "message", msg.id, {"link_id": link.id})
-        except Exception:
-            pass
+        # "message.created" goes to the outbox in the same commit (app/outbox/listeners.py)
 
         return msg
 
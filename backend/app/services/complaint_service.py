@@ -1,12 +1,15 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from typing import Optional, Sequence
+from typing import List, Optional, Sequence
 
-from app.enums import ComplaintStatus, Role, LinkStatus
+from app.enums import ComplaintStatus, ComplaintAgeBucket, Role, LinkStatus
+from app.core.concurrency import check_version, conflict_on_stale
+from app.core.transitions import COMPLAINT_FLOW, TransitionNotAllowed
 from app.models.user import User
 from app.repositories.complaint_repo import ComplaintRepo
 from app.repositories.link_repo import LinkRepo
 from app.repositories.supplier_repo import SupplierRepo
+from app.schemas.complaint import ComplaintQueueItem, ComplaintAgingCount
 
 class ComplaintService:
     # --- helpers
@@ -17,51 +20,75 @@ class ComplaintService:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a participant of this link")
         if link.status != LinkStatus.ACCEPTED:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Link is not ACCEPTED")
+        return link
 
     @staticmethod
-    def _ensure_owner_of_link_supplier(db: Session, *, link_id: int, owner_user_id: int):
-        link = LinkRepo.get(db, link_id)
-        if not link:
-            raise HTTPException(status_code=404, detail="Link not found")
-        supplier = SupplierRepo.get_by_owner_id(db, owner_user_id)
-        if not supplier or supplier.id != link.supplier_id:
-            raise HTTPException(status_code=403, detail="Only supplier_owner can change complaint status")
+    def _ensure_order_access_for_consumer(db: Session, *, order_id: int, consumer_id: int):
+        from app.models.order import Order
+        order = db.get(Order, order_id)
+        if not order or order.consumer_id != consumer_id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not your order")
+        return order
+
+    @staticmethod
+    def _get_staff_supplier_id_or_403(db: Session, user: User) -> int:
+        if user.role not in [Role.SUPPLIER_OWNER, Role.SUPPLIER_MANAGER, Role.SUPPLIER_SALES]:
+            raise HTTPException(status_code=403, detail="Only supplier staff can view the complaint queue")
+        from app.repositories.staff_repo import StaffRepo
+        supplier_id = StaffRepo.get_supplier_for_user(db, user.id)
+        if not supplier_id:
+            raise HTTPException(status_code=404, detail="Supplier not found for user")
+        return supplier_id
 
     # --- actions
     @staticmethod
     def create(db: Session, *, current_user: User, link_id: Optional[int], order_id: Optional[int], description: str):
         if current_user.role != Role.CONSUMER:
             raise HTTPException(status_code=403, detail="Only consumer can create complaints")
+        # supplier_id is denormalized onto the complaint from the link or the order
+        supplier_id = None
         if link_id:
-            ComplaintService._ensure_link_access_for_consumer(db, link_id=link_id, consumer_id=current_user.id)
-        # (если order_id используется — можно дополнить проверку принадлежности заказа)
-        return ComplaintRepo.create(db, link_id=link_id, order_id=order_id, description=description, created_by=current_user.id)
+            link = ComplaintService._ensure_link_access_for_consumer(db, link_id=link_id, consumer_id=current_user.id)
+            supplier_id = link.supplier_id
+        if order_id:
+            order = ComplaintService._ensure_order_access_for_consumer(db, order_id=order_id, consumer_id=current_user.id)
+            if supplier_id and order.supplier_id != supplier_id:
+                raise HTTPException(status_code=400, detail="Order and link belong to different suppliers")
+            supplier_id = order.supplier_id
+        return ComplaintRepo.create(
+            db,
+            link_id=link_id,
+            order_id=order_id,
+            supplier_id=supplier_id,
+            description=description,
+            created_by=current_user.id,
+        )
 
     @staticmethod
-    def update_status(db: Session, *, current_user: User, complaint_id: int, status_to: ComplaintStatus):
+    def update_status(
+        db: Session, *, current_user: User, complaint_id: int, status_to: ComplaintStatus,
+        expected_version: Optional[int] = None,
+    ):
         if current_user.role != Role.SUPPLIER_OWNER:
             raise HTTPException(status_code=403, detail="Only supplier_owner can change complaint status")
         complaint = ComplaintRepo.get(db, complaint_id)
         if not complaint:
             raise HTTPException(status_code=404, detail="Complaint not found")
-        if not complaint.link_id:
-            raise HTTPException(status_code=400, detail="Complaint must be linked to a supplier link")
-        ComplaintService._ensure_owner_of_link_supplier(db, link_id=complaint.link_id, owner_user_id=current_user.id)
-        # простая валидация переходов
-        allowed = {
-            ComplaintStatus.OPEN: {ComplaintStatus.IN_PROGRESS, ComplaintStatus.RESOLVED},
-            ComplaintStatus.IN_PROGRESS: {ComplaintStatus.RESOLVED},
-            ComplaintStatus.ESCALATED: {ComplaintStatus.IN_PROGRESS, ComplaintStatus.RESOLVED},
-            ComplaintStatus.RESOLVED: set(),
-        }
-        from app.enums import ComplaintStatus as CS
+        supplier = SupplierRepo.get_by_owner_id(db, current_user.id)
+        if not supplier or supplier.id != complaint.supplier_id:
+            raise HTTPException(status_code=403, detail="Only supplier_owner can change complaint status")
+        check_version(complaint.version, expected_version, "Complaint")
+        # переходы: COMPLAINT_FLOW (app/core/transitions.py)
         current = ComplaintStatus(complaint.status)
-        if status_to not in allowed[current]:
+        try:
+            COMPLAINT_FLOW.ensure(current, status_to, current_user.role)
+        except (TransitionNotAllowed, PermissionError):
             raise HTTPException(status_code=400, detail=f"Transition {current.value} -> {status_to.value} is not allowed")
-        return ComplaintRepo.update_status(db, complaint=complaint, status=status_to)
+        with conflict_on_stale(db, "Complaint"):
+            return ComplaintRepo.update_status(db, complaint=complaint, status=status_to)
 
     @staticmethod
-    def escalate(db: Session, complaint_id: int, user: User):
+    def escalate(db: Session, complaint_id: int, user: User, expected_version: Optional[int] = None):
         """Sales escalates complaint to Manager/Owner"""
         if user.role != Role.SUPPLIER_SALES:
             raise HTTPException(
@@ -69,35 +96,22 @@ class ComplaintService:
                 detail="Only Sales can escalate complaints"
             )
         
-        complaint = ComplaintRepo.get(db, complaint_id)
-        if not complaint:
+        # Complaint and its supplier's owner in one query (denormalized supplier_id)
+        row = ComplaintRepo.get_with_supplier_owner(db, complaint_id)
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Complaint not found"
             )
+        complaint, owner_id = row
         
-        if complaint.status not in [ComplaintStatus.OPEN, ComplaintStatus.IN_PROGRESS]:
+        if ComplaintStatus.ESCALATED not in COMPLAINT_FLOW.targets(complaint.status, user.role):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Cannot escalate complaint with status {complaint.status.value}"
             )
         
-        # Find Manager or Owner for the supplier
-        if not complaint.link_id:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Complaint must be linked to a supplier link"
-            )
-        
-        link = LinkRepo.get(db, complaint.link_id)
-        if not link:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Link not found"
-            )
-        
-        supplier = SupplierRepo.get(db, link.supplier_id)
-        if not supplier:
+        if not complaint.supplier_id or owner_id is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Supplier not found"
@@ -106,20 +120,22 @@ class ComplaintService:
         # Verify that the sales user belongs to this supplier
         from app.repositories.staff_repo import StaffRepo
         user_supplier_id = StaffRepo.get_supplier_for_user(db, user.id)
-        if not user_supplier_id or user_supplier_id != supplier.id:
+        if not user_supplier_id or user_supplier_id != complaint.supplier_id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Sales user does not belong to this supplier"
             )
+        check_version(complaint.version, expected_version, "Complaint")
         
         # Assign to owner (in a real system, we'd find a manager first)
         from datetime import datetime
-        complaint.assigned_to_id = supplier.owner_id
+        complaint.assigned_to_id = owner_id
         complaint.escalated_at = datetime.utcnow()
         complaint.status = ComplaintStatus.ESCALATED
         
         db.add(complaint)
-        db.commit()
+        with conflict_on_stale(db, "Complaint"):
+            db.commit()
         db.refresh(complaint)
         return complaint
 
@@ -145,3 +161,47 @@ class ComplaintService:
         else:
             # другие роли пока не имеют доступа
             raise HTTPException(status_code=403, detail="Forbidden")
+
+    @staticmethod
+    def queue(
+        db: Session,
+        *,
+        current_user: User,
+        status: Optional[ComplaintStatus],
+        mine: bool,
+        assigned_to_id: Optional[int],
+        before_id: Optional[int],
+        limit: int,
+    ) -> List[ComplaintQueueItem]:
+        """Supplier complaint queue with SQL-computed aging bucket per complaint"""
+        supplier_id = ComplaintService._get_staff_supplier_id_or_403(db, current_user)
+        if mine:
+            assigned_to_id = current_user.id
+        rows = ComplaintRepo.queue_for_supplier(
+            db,
+            supplier_id=supplier_id,
+            status=status,
+            assigned_to_id=assigned_to_id,
+            before_id=before_id,
+            limit=limit,
+        )
+        return [
+            ComplaintQueueItem.model_validate(complaint).model_copy(
+                update={"age_bucket": ComplaintAgeBucket(age_bucket)}
+            )
+            for complaint, age_bucket in rows
+        ]
+
+    @staticmethod
+    def aging_summary(db: Session, *, current_user: User, mine: bool) -> List[ComplaintAgingCount]:
+        """Unresolved complaint counts per status and aging bucket"""
+        supplier_id = ComplaintService._get_staff_supplier_id_or_403(db, current_user)
+        rows = ComplaintRepo.aging_summary_for_supplier(
+            db,
+            supplier_id=supplier_id,
+            assigned_to_id=current_user.id if mine else None,
+        )
+        return [
+            ComplaintAgingCount(status=row.status, age_bucket=ComplaintAgeBucket(row.age_bucket), count=row.count)
+            for row in rows
+        ]
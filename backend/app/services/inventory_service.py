@@ -0,0 +1,80 @@
+from typing import List, Optional
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.audit.logger import log_event
+from app.enums import Role, StockMovementReason
+from app.models.product import Product
+from app.models.supplier import Supplier
+from app.models.user import User
+from app.repositories.inventory_repo import InventoryRepo
+from app.repositories.product_repo import ProductRepo
+from app.schemas.inventory import StockAdjustment, StockMovementBatch
+from app.services.product_service import ProductService
+
+
+class InventoryService:
+    # --- helpers ---
+
+    @staticmethod
+    def _get_stock_manager_supplier(db: Session, user: User) -> Supplier:
+        if user.role not in (Role.SUPPLIER_OWNER, Role.SUPPLIER_MANAGER):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only Owner/Manager can change stock")
+        return ProductService._get_user_supplier_or_404(db, user)
+
+    @staticmethod
+    def _get_own_product_or_404(db: Session, supplier: Supplier, product_id: int) -> Product:
+        product = ProductRepo.by_id(db, product_id)
+        if not product or product.supplier_id != supplier.id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+        return product
+
+    # --- commands/queries ---
+
+    @staticmethod
+    def adjust(db: Session, *, current_user: User, product_id: int, data: StockAdjustment):
+        supplier = InventoryService._get_stock_manager_supplier(db, current_user)
+        product = InventoryService._get_own_product_or_404(db, supplier, product_id)
+        if product.stock + data.delta < 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Only {product.stock} units in stock",
+            )
+        InventoryRepo.record(db, supplier.id, [{
+            "product_id": product_id, "delta": data.delta,
+            "reason": StockMovementReason.ADJUSTMENT, "note": data.note,
+        }])
+        log_event(current_user.id, "stock.adjusted", "product", product_id, {"delta": data.delta})
+        return InventoryRepo.levels(db, [product_id])[0]
+
+    @staticmethod
+    def record_batch(db: Session, *, current_user: User, data: StockMovementBatch):
+        """Warehouse import / bulk correction: one ownership check, one multi-row INSERT"""
+        supplier = InventoryService._get_stock_manager_supplier(db, current_user)
+        product_ids = {m.product_id for m in data.movements}
+        owned = set(db.execute(
+            select(Product.id).where(
+                Product.id.in_(product_ids), Product.supplier_id == supplier.id, Product.deleted_at.is_(None),
+            )
+        ).scalars())
+        foreign = sorted(product_ids - owned)
+        if foreign:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Products {foreign} do not belong to supplier {supplier.id}",
+            )
+        InventoryRepo.record(db, supplier.id, [
+            {"product_id": m.product_id, "delta": m.delta, "reason": m.reason, "note": m.note}
+            for m in data.movements
+        ])
+        log_event(current_user.id, "stock.batch_recorded", "supplier", supplier.id, {"movements": len(data.movements)})
+        return InventoryRepo.levels(db, sorted(product_ids))
+
+    @staticmethod
+    def movements(
+        db: Session, *, current_user: User, product_id: int, before_id: Optional[int], limit: int,
+    ) -> List:
+        supplier = ProductService._get_user_supplier_or_404(db, current_user)
+        InventoryService._get_own_product_or_404(db, supplier, product_id)
+        return InventoryRepo.list_movements(db, product_id, before_id=before_id, limit=limit)
@@ -1,3 +1,4 @@
+from typing import Optional
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
@@ -7,6 +8,22 @@ from app.repositories.supplier_repo import SupplierRepo
 from app.models.user import User
 from app.models.link import Link
 from app.models.supplier import Supplier
+from app.schemas.link import LinkBatchStatusUpdate, LinkBatchStatusResult, LinkBatchFailure
+from app.audit.logger import log_event
+
+# Statuses a link may be moved from by the batch endpoint, per target status.
+# Accept keeps the single-link PENDING-only rule; block/remove skip no-op rows.
+BATCH_SOURCE_STATUSES = {
+    LinkStatus.ACCEPTED: [LinkStatus.PENDING],
+    LinkStatus.BLOCKED: [LinkStatus.PENDING, LinkStatus.ACCEPTED, LinkStatus.REMOVED],
+    LinkStatus.REMOVED: [LinkStatus.PENDING, LinkStatus.ACCEPTED, LinkStatus.BLOCKED],
+}
+
+# Batch transitions that go to the audit log
+AUDITED_BATCH_ACTIONS = {
+    LinkStatus.BLOCKED: "link.blocked",
+    LinkStatus.REMOVED: "link.removed",
+}
 
 class LinkService:
     # --- helpers / guards ---
@@ -72,7 +89,9 @@ class LinkService:
         if link.supplier_id != owned_supplier_id:
             raise HTTPException(status_code=403, detail="Not your supplier")
 
-        return LinkRepo.set_status(db, link, LinkStatus.BLOCKED)
+        link = LinkRepo.set_status(db, link, LinkStatus.BLOCKED)
+        log_event(current_user.id, "link.blocked", "link", link.id, {"consumer_id": link.consumer_id})
+        return link
 
     @staticmethod
     def remove_link(db: Session, current_user: User, link_id: int) -> Link:
@@ -86,19 +105,80 @@ class LinkService:
         if link.supplier_id != owned_supplier_id:
             raise HTTPException(status_code=403, detail="Not your supplier")
 
-        return LinkRepo.set_status(db, link, LinkStatus.REMOVED)
+        link = LinkRepo.set_status(db, link, LinkStatus.REMOVED)
+        log_event(current_user.id, "link.removed", "link", link.id, {"consumer_id": link.consumer_id})
+        return link
 
     @staticmethod
-    def list_my_links(db: Session, current_user: User) -> list[Link]:
+    def batch_set_status(db: Session, current_user: User, data: LinkBatchStatusUpdate) -> LinkBatchStatusResult:
+        """Accept/block/remove many links with one state read and one guarded UPDATE"""
+        LinkService._require_owner(current_user)
+        sources = BATCH_SOURCE_STATUSES.get(data.status)
+        if sources is None:
+            raise HTTPException(status_code=400, detail=f"Cannot batch-set link status to {data.status.value}")
+
+        owned_supplier_id = LinkService._get_owned_supplier_id_or_404(db, owner_id=current_user.id)
+        link_ids = list(dict.fromkeys(data.link_ids))
+        states = {row.id: row for row in LinkRepo.get_states(db, link_ids)}
+
+        failed: list[LinkBatchFailure] = []
+        eligible: list[int] = []
+        for link_id in link_ids:
+            row = states.get(link_id)
+            if row is None:
+                failed.append(LinkBatchFailure(link_id=link_id, reason="Link not found"))
+            elif row.supplier_id != owned_supplier_id:
+                failed.append(LinkBatchFailure(link_id=link_id, reason="Not your supplier"))
+            elif row.status not in sources:
+                failed.append(LinkBatchFailure(
+                    link_id=link_id,
+                    reason=f"Cannot set {data.status.value} on link in status={row.status.value}"
+                ))
+            else:
+                eligible.append(link_id)
+
+        succeeded: list[int] = []
+        if eligible:
+            updated = set(LinkRepo.bulk_set_status(
+                db,
+                supplier_id=owned_supplier_id,
+                link_ids=eligible,
+                from_statuses=sources,
+                to_status=data.status,
+            ))
+            audit_action = AUDITED_BATCH_ACTIONS.get(data.status)
+            for link_id in eligible:
+                if link_id in updated:
+                    succeeded.append(link_id)
+                    if audit_action:
+                        log_event(current_user.id, audit_action, "link", link_id, {"batch": True})
+                else:
+                    failed.append(LinkBatchFailure(link_id=link_id, reason="Link status changed concurrently"))
+
+        return LinkBatchStatusResult(status=data.status, succeeded=succeeded, failed=failed)
+
+    @staticmethod
+    def list_my_links(
+        db: Session,
+        current_user: User,
+        *,
+        status_filter: Optional[LinkStatus] = None,
+        before_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> list[Link]:
         if current_user.role == Role.CONSUMER:
-            return LinkRepo.list_for_consumer(db, consumer_id=current_user.id)
+            return LinkRepo.list_for_consumer(
+                db, consumer_id=current_user.id, status=status_filter, before_id=before_id, limit=limit
+            )
         elif current_user.role in [Role.SUPPLIER_OWNER, Role.SUPPLIER_MANAGER, Role.SUPPLIER_SALES]:
             # Use StaffRepo to get supplier_id for any supplier role
             from app.repositories.staff_repo import StaffRepo
             sup_id = StaffRepo.get_supplier_for_user(db, current_user.id)
             if not sup_id:
                 raise HTTPException(status_code=404, detail="Supplier not found for user")
-            return LinkRepo.list_for_supplier(db, supplier_id=sup_id)
+            return LinkRepo.list_for_supplier(
+                db, supplier_id=sup_id, status=status_filter, before_id=before_id, limit=limit
+            )
         else:
             # для других ролей пока запрещаем
             raise HTTPException(status_code=403, detail="Not allowed for this role")
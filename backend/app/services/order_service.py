@@ -1,31 +1,46 @@
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
+from decimal import Decimal
 from typing import List, Optional
 
 from app.repositories.order_repo import OrderRepo
 from app.repositories.link_repo import LinkRepo
-from app.repositories.product_repo import ProductRepo
+from app.repositories.product_repo import (
+    ProductRepo, LINE_NOT_FOUND, LINE_WRONG_SUPPLIER, LINE_INACTIVE, LINE_BELOW_MOQ,
+)
 from app.repositories.supplier_repo import SupplierRepo
 from app.repositories.staff_repo import StaffRepo
+from app.repositories.order_template_repo import OrderTemplateRepo
 from app.models.user import User
 from app.models.order import Order
+from app.models.order_template import OrderTemplate
 from app.enums import Role, LinkStatus, OrderStatus
-from app.schemas.order import OrderCreate
+from app.audit.logger import log_event
+from app.core.concurrency import check_version
+from app.pricing.engine import get_price_cache
+from app.core.transitions import ORDER_FLOW, TransitionNotAllowed
+from app.schemas.order import (
+    OrderCreate, OrderLineFailure, ReorderResult,
+    OrderBatchStatusUpdate, OrderBatchStatusResult, OrderBatchFailure,
+)
+from app.schemas.order_template import OrderTemplateCreate
 
 
 class OrderService:
+    # --- helpers ---
+
     @staticmethod
-    def create_order(db: Session, consumer: User, data: OrderCreate) -> Order:
-        """Consumer creates order"""
-        # 1. Check role
-        if consumer.role != Role.CONSUMER:
+    def _require_consumer(user: User, detail: str = "Only consumers can create orders") -> None:
+        if user.role != Role.CONSUMER:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only consumers can create orders"
+                detail=detail
             )
-        
-        # 2. Check link exists and is ACCEPTED
-        link = LinkRepo.get_by_pair(db, consumer_id=consumer.id, supplier_id=data.supplier_id)
+
+    @staticmethod
+    def _ensure_accepted_link(db: Session, consumer_id: int, supplier_id: int) -> int:
+        """Id of the consumer's ACCEPTED link to the supplier (it keys negotiated prices)"""
+        link = LinkRepo.get_by_pair(db, consumer_id=consumer_id, supplier_id=supplier_id)
         if not link:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -36,66 +51,114 @@ class OrderService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Link status is {link.status.value}, must be ACCEPTED to create orders"
             )
+        return link.id
+
+    @staticmethod
+    def _price_lines(db: Session, supplier_id: int, link_id: int, rows) -> List[dict]:
+        """
+        Unit prices for validated basket rows from the supplier's compiled price
+        table (tiers, negotiated prices), all lines at once
+        """
+        if not rows:
+            return []
+        table = get_price_cache().get(db, supplier_id, rows[0].pricing_version)
+        prices = table.price_basket([(r.product_id, r.quantity, r.unit_price) for r in rows], link_id)
+        return [
+            {'product_id': r.product_id, 'quantity': r.quantity, 'unit_price': price}
+            for r, price in zip(rows, prices)
+        ]
+
+    @staticmethod
+    def _get_own_order_or_404(db: Session, consumer: User, order_id: int) -> Order:
+        order = OrderRepo.get_by_id(db, order_id)
+        if not order or order.consumer_id != consumer.id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Order not found"
+            )
+        return order
+
+    @staticmethod
+    def _place_validated(db: Session, consumer: User, supplier_id: int, lines: list[tuple[int, int]]) -> ReorderResult:
+        """
+        Validate all lines with one set-based query, order the ones that pass
+        and report the rest. Query count does not depend on basket size.
+        """
+        link_id = OrderService._ensure_accepted_link(db, consumer.id, supplier_id)
+
+        ok_rows = []
+        failures = []
+        for row in ProductRepo.validate_basket(db, supplier_id, lines):
+            if row.failure:
+                failures.append(OrderLineFailure(
+                    product_id=row.product_id,
+                    quantity=row.quantity,
+                    reason=row.failure,
+                    moq=row.moq,
+                    stock=row.stock,
+                ))
+                continue
+            ok_rows.append(row)
+
+        items_data = OrderService._price_lines(db, supplier_id, link_id, ok_rows)
+        total_amount = sum((i['unit_price'] * i['quantity'] for i in items_data), Decimal("0"))
+
+        order = None
+        if items_data:
+            order = OrderRepo.create(
+                db=db,
+                consumer_id=consumer.id,
+                supplier_id=supplier_id,
+                total_amount=total_amount,
+                items_data=items_data
+            )
+        return ReorderResult(order=order, failures=failures)
+
+    @staticmethod
+    def _line_failure_detail(row, supplier_id: int) -> str:
+        if row.failure == LINE_WRONG_SUPPLIER:
+            return f"Product {row.product_id} does not belong to supplier {supplier_id}"
+        if row.failure == LINE_INACTIVE:
+            return f"Product {row.name} is not active"
+        if row.failure == LINE_BELOW_MOQ:
+            return f"Product {row.name} requires minimum order quantity of {row.moq}"
+        return f"Product {row.name} has only {row.stock} units in stock"
+
+    # --- use-cases ---
+
+    @staticmethod
+    def create_order(db: Session, consumer: User, data: OrderCreate) -> Order:
+        """Consumer creates order"""
+        # 1. Check role
+        OrderService._require_consumer(consumer)
+        
+        # 2. Check link exists and is ACCEPTED
+        link_id = OrderService._ensure_accepted_link(db, consumer.id, data.supplier_id)
         
-        # 3. Validate products and calculate total
+        # 3. Validate all lines in one set-based query, then price the basket
         if not data.items:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Order must have at least one item"
             )
         
-        product_ids = [item.product_id for item in data.items]
-        products = ProductRepo.get_by_ids(db, product_ids)
-        
-        if len(products) != len(product_ids):
+        rows = ProductRepo.validate_basket(
+            db, data.supplier_id, [(item.product_id, item.quantity) for item in data.items]
+        )
+        if any(row.failure == LINE_NOT_FOUND for row in rows):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="One or more products not found"
             )
-        
-        # Verify all products belong to the supplier
-        for product in products:
-            if product.supplier_id != data.supplier_id:
+        for row in rows:
+            if row.failure:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Product {product.id} does not belong to supplier {data.supplier_id}"
+                    detail=OrderService._line_failure_detail(row, data.supplier_id)
                 )
-            if not product.is_active:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Product {product.name} is not active"
-                )
-        
-        # Calculate total and prepare items data
-        products_map = {p.id: p for p in products}
-        items_data = []
-        total_amount = 0.0
         
-        for item in data.items:
-            product = products_map[item.product_id]
-            
-            # Check MOQ
-            if item.quantity < product.moq:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Product {product.name} requires minimum order quantity of {product.moq}"
-                )
-            
-            # Check stock
-            if item.quantity > product.stock:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Product {product.name} has only {product.stock} units in stock"
-                )
-            
-            unit_price = float(product.price)
-            total_amount += unit_price * item.quantity
-            
-            items_data.append({
-                'product_id': item.product_id,
-                'quantity': item.quantity,
-                'unit_price': unit_price
-            })
+        items_data = OrderService._price_lines(db, data.supplier_id, link_id, rows)
+        total_amount = sum((i['unit_price'] * i['quantity'] for i in items_data), Decimal("0"))
         
         # 4. Create order
         order = OrderRepo.create(
@@ -109,10 +172,12 @@ class OrderService:
         return order
 
     @staticmethod
-    def list_my_orders(db: Session, user: User, status_filter: Optional[OrderStatus] = None) -> List[Order]:
+    def list_my_orders(
+        db: Session, user: User, status_filter: Optional[OrderStatus] = None, active: bool = False
+    ) -> List[Order]:
         """Get orders for current user with optional status filter"""
         if user.role == Role.CONSUMER:
-            return OrderRepo.list_for_consumer(db, consumer_id=user.id, status=status_filter)
+            return OrderRepo.list_for_consumer(db, consumer_id=user.id, status=status_filter, active=active)
         elif user.role in [Role.SUPPLIER_OWNER, Role.SUPPLIER_MANAGER, Role.SUPPLIER_SALES]:
             # Get supplier for this user (Owner or Staff)
             supplier_id = StaffRepo.get_supplier_for_user(db, user.id)
@@ -121,7 +186,7 @@ class OrderService:
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Supplier not found for this user"
                 )
-            return OrderRepo.list_for_supplier(db, supplier_id=supplier_id, status=status_filter)
+            return OrderRepo.list_for_supplier(db, supplier_id=supplier_id, status=status_filter, active=active)
         else:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -163,66 +228,213 @@ class OrderService:
         return order
 
     @staticmethod
-    def accept_order(db: Session, user: User, order_id: int) -> Order:
-        """Supplier Owner/Manager accepts order"""
-        if user.role not in [Role.SUPPLIER_OWNER, Role.SUPPLIER_MANAGER]:
+    def change_status(
+        db: Session, user: User, order_id: int, to_status: OrderStatus,
+        expected_version: Optional[int] = None,
+    ) -> Order:
+        """
+        Move one order along ORDER_FLOW (app/core/transitions.py). The update is
+        a compare-and-set on the status (and on `expected_version`, from
+        If-Match) read here, so a concurrent change yields 409 instead of
+        being overwritten.
+        """
+        if user.role not in ORDER_FLOW.roles_for(to_status):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only supplier owners or managers can accept orders"
+                detail=f"Role {user.role.value} cannot set order status {to_status.value}"
             )
-        
-        order = OrderRepo.get_by_id(db, order_id)
-        if not order:
+
+        states = OrderRepo.get_states(db, [order_id])
+        if not states:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Order not found"
             )
-        
-        # Verify order belongs to user's supplier
-        supplier_id = StaffRepo.get_supplier_for_user(db, user.id)
-        if not supplier_id or order.supplier_id != supplier_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="This order does not belong to your supplier"
-            )
-        
-        if order.status != OrderStatus.CREATED:
+        row = states[0]
+
+        if user.role == Role.CONSUMER:
+            if row.consumer_id != user.id:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="You can only change your own orders"
+                )
+        else:
+            supplier_id = StaffRepo.get_supplier_for_user(db, user.id)
+            if not supplier_id or row.supplier_id != supplier_id:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="This order does not belong to your supplier"
+                )
+        # after the ownership checks: a 412 carries the current ETag of the order
+        check_version(row.version, expected_version, "Order")
+
+        try:
+            ORDER_FLOW.ensure(row.status, to_status, user.role)
+        except TransitionNotAllowed as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except PermissionError as e:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+
+        if not OrderRepo.transition(db, [order_id], row.status, to_status, version=expected_version):
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Cannot accept order with status {order.status.value}"
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Order status changed concurrently"
             )
-        
-        return OrderRepo.update_status(db, order, OrderStatus.ACCEPTED)
+        log_event(user.id, f"order.{to_status.value.lower()}", "order", order_id, {"supplier_id": row.supplier_id})
+        return OrderRepo.get_by_id(db, order_id)
+
+    @staticmethod
+    def accept_order(db: Session, user: User, order_id: int, expected_version: Optional[int] = None) -> Order:
+        """Supplier Owner/Manager accepts order"""
+        return OrderService.change_status(db, user, order_id, OrderStatus.ACCEPTED, expected_version)
 
     @staticmethod
-    def reject_order(db: Session, user: User, order_id: int) -> Order:
+    def reject_order(db: Session, user: User, order_id: int, expected_version: Optional[int] = None) -> Order:
         """Supplier Owner/Manager rejects order"""
-        if user.role not in [Role.SUPPLIER_OWNER, Role.SUPPLIER_MANAGER]:
+        return OrderService.change_status(db, user, order_id, OrderStatus.REJECTED, expected_version)
+
+    @staticmethod
+    def status_history(db: Session, user: User, order_id: int):
+        """Status changes of an order the user may view, oldest first"""
+        OrderService.get_order_detail(db, user, order_id)
+        return OrderRepo.history(db, order_id)
+
+    @staticmethod
+    def reorder(db: Session, consumer: User, order_id: int) -> ReorderResult:
+        """Consumer places a new order with the lines of one of their previous orders"""
+        OrderService._require_consumer(consumer)
+        source = OrderService._get_own_order_or_404(db, consumer, order_id)
+        # archived lines are included so they come back as NOT_FOUND failures
+        lines = [(item.product_id, item.quantity) for item in source.lines]
+        return OrderService._place_validated(db, consumer, source.supplier_id, lines)
+
+    @staticmethod
+    def batch_update_status(db: Session, user: User, data: OrderBatchStatusUpdate) -> OrderBatchStatusResult:
+        """
+        Supplier staff move many orders to one status at once (ORDER_FLOW rules).
+
+        Supplier is resolved once, ownership/status of all ids is read with one
+        query, and each source status is one guarded UPDATE ... RETURNING.
+        """
+        if user.role not in ORDER_FLOW.roles_for(data.status) or user.role == Role.CONSUMER:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only supplier owners or managers can reject orders"
+                detail=f"Role {user.role.value} cannot set order status {data.status.value}"
             )
-        
-        order = OrderRepo.get_by_id(db, order_id)
-        if not order:
+
+        supplier_id = StaffRepo.get_supplier_for_user(db, user.id)
+        if not supplier_id:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail="Order not found"
+                detail="Supplier not found for this user"
             )
-        
-        # Verify order belongs to user's supplier
-        supplier_id = StaffRepo.get_supplier_for_user(db, user.id)
-        if not supplier_id or order.supplier_id != supplier_id:
+
+        order_ids = list(dict.fromkeys(data.order_ids))
+        states = {row.id: row for row in OrderRepo.get_states(db, order_ids)}
+
+        failed: list[OrderBatchFailure] = []
+        eligible: dict[OrderStatus, list[int]] = {}
+        for order_id in order_ids:
+            row = states.get(order_id)
+            if row is None:
+                failed.append(OrderBatchFailure(order_id=order_id, reason="Order not found"))
+            elif row.supplier_id != supplier_id:
+                failed.append(OrderBatchFailure(order_id=order_id, reason="This order does not belong to your supplier"))
+            elif data.status not in ORDER_FLOW.targets(row.status, user.role):
+                failed.append(OrderBatchFailure(
+                    order_id=order_id,
+                    reason=f"Cannot change order status {row.status.value} -> {data.status.value}"
+                ))
+            else:
+                eligible.setdefault(row.status, []).append(order_id)
+
+        succeeded: list[int] = []
+        audit_action = f"order.{data.status.value.lower()}"
+        for from_status, ids in eligible.items():
+            updated = set(OrderRepo.transition(
+                db, ids, from_status, data.status, supplier_id=supplier_id
+            ))
+            for order_id in ids:
+                if order_id in updated:
+                    succeeded.append(order_id)
+                    log_event(user.id, audit_action, "order", order_id, {"supplier_id": supplier_id, "batch": True})
+                else:
+                    failed.append(OrderBatchFailure(order_id=order_id, reason="Order status changed concurrently"))
+
+        return OrderBatchStatusResult(status=data.status, succeeded=succeeded, failed=failed)
+
+    # --- templates ---
+
+    @staticmethod
+    def create_template(db: Session, consumer: User, data: OrderTemplateCreate) -> OrderTemplate:
+        """Consumer saves a basket, either explicit lines or copied from an order"""
+        OrderService._require_consumer(consumer, "Only consumers can manage order templates")
+
+        if data.source_order_id:
+            source = OrderService._get_own_order_or_404(db, consumer, data.source_order_id)
+            supplier_id = source.supplier_id
+            items_data = [
+                {'product_id': item.product_id, 'quantity': item.quantity}
+                for item in source.items
+            ]
+        else:
+            supplier_id = data.supplier_id
+            items_data = [
+                {'product_id': item.product_id, 'quantity': item.quantity}
+                for item in data.items
+            ]
+
+        # a template must be orderable later: ACCEPTED link, products of this supplier.
+        # Stock, MOQ and active flags change over time and are checked when ordering.
+        OrderService._ensure_accepted_link(db, consumer.id, supplier_id)
+        rows = ProductRepo.validate_basket(
+            db, supplier_id, [(i['product_id'], i['quantity']) for i in items_data]
+        )
+        if any(row.failure == LINE_NOT_FOUND for row in rows):
             raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="This order does not belong to your supplier"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="One or more products not found"
             )
-        
-        if order.status != OrderStatus.CREATED:
+        for row in rows:
+            if row.failure == LINE_WRONG_SUPPLIER:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=OrderService._line_failure_detail(row, supplier_id)
+                )
+
+        return OrderTemplateRepo.create(
+            db,
+            consumer_id=consumer.id,
+            supplier_id=supplier_id,
+            name=data.name,
+            items_data=items_data
+        )
+
+    @staticmethod
+    def list_templates(db: Session, consumer: User, supplier_id: Optional[int] = None) -> List[OrderTemplate]:
+        OrderService._require_consumer(consumer, "Only consumers can manage order templates")
+        return OrderTemplateRepo.list_for_consumer(db, consumer_id=consumer.id, supplier_id=supplier_id)
+
+    @staticmethod
+    def _get_own_template_or_404(db: Session, consumer: User, template_id: int) -> OrderTemplate:
+        OrderService._require_consumer(consumer, "Only consumers can manage order templates")
+        template = OrderTemplateRepo.get_by_id(db, template_id)
+        if not template or template.consumer_id != consumer.id:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Cannot reject order with status {order.status.value}"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Order template not found"
             )
-        
-        return OrderRepo.update_status(db, order, OrderStatus.REJECTED)
+        return template
 
+    @staticmethod
+    def delete_template(db: Session, consumer: User, template_id: int) -> None:
+        template = OrderService._get_own_template_or_404(db, consumer, template_id)
+        OrderTemplateRepo.delete(db, template)
+        log_event(consumer.id, "order_template.deleted", "order_template", template_id, {"supplier_id": template.supplier_id})
+
+    @staticmethod
+    def order_from_template(db: Session, consumer: User, template_id: int) -> ReorderResult:
+        """Consumer places an order from a saved template"""
+        template = OrderService._get_own_template_or_404(db, consumer, template_id)
+        lines = [(item.product_id, item.quantity) for item in template.items]
+        return OrderService._place_validated(db, consumer, template.supplier_id, lines)
@@ -0,0 +1,94 @@
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.audit.logger import log_event
+from app.enums import Role
+from app.models.product import Product
+from app.models.user import User
+from app.pricing.engine import get_price_cache
+from app.repositories.link_repo import LinkRepo
+from app.repositories.pricing_repo import PricingRepo
+from app.repositories.product_repo import ProductRepo
+from app.repositories.staff_repo import StaffRepo
+from app.schemas.pricing import PriceTiersUpdate, LinkPricesUpdate
+from app.services.product_service import ProductService
+
+
+class PricingService:
+    # --- helpers ---
+
+    @staticmethod
+    def _get_product_or_404(db: Session, product_id: int) -> Product:
+        product = ProductRepo.by_id(db, product_id)
+        if not product:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+        return product
+
+    @staticmethod
+    def _get_link_or_404(db: Session, link_id: int):
+        link = LinkRepo.get_by_id(db, link_id)
+        if not link:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Link not found")
+        return link
+
+    # --- quantity breaks ---
+
+    @staticmethod
+    def get_tiers(db: Session, *, current_user: User, product_id: int):
+        product = PricingService._get_product_or_404(db, product_id)
+        ProductService._ensure_can_view_supplier(db, current_user, product.supplier_id)
+        return PricingRepo.list_tiers(db, product_id)
+
+    @staticmethod
+    def set_tiers(db: Session, *, current_user: User, product_id: int, data: PriceTiersUpdate):
+        supplier = ProductService._get_owner_supplier_or_404(db, current_user)
+        product = PricingService._get_product_or_404(db, product_id)
+        if product.supplier_id != supplier.id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+        tiers = PricingRepo.replace_tiers(
+            db, supplier.id, product_id, [(t.min_quantity, t.price) for t in data.tiers]
+        )
+        get_price_cache().invalidate(supplier.id)
+        log_event(current_user.id, "product.tiers_updated", "product", product_id, {"tiers": len(tiers)})
+        return tiers
+
+    # --- negotiated prices ---
+
+    @staticmethod
+    def get_link_prices(db: Session, *, current_user: User, link_id: int):
+        link = PricingService._get_link_or_404(db, link_id)
+        if current_user.role == Role.CONSUMER:
+            allowed = link.consumer_id == current_user.id
+        else:
+            allowed = StaffRepo.get_supplier_for_user(db, current_user.id) == link.supplier_id
+        if not allowed:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not your link")
+        return PricingRepo.list_link_prices(db, link_id)
+
+    @staticmethod
+    def set_link_prices(db: Session, *, current_user: User, link_id: int, data: LinkPricesUpdate):
+        supplier = ProductService._get_owner_supplier_or_404(db, current_user)
+        link = PricingService._get_link_or_404(db, link_id)
+        if link.supplier_id != supplier.id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not your supplier")
+
+        product_ids = {p.product_id for p in data.prices}
+        if product_ids:
+            owned = set(db.execute(
+                select(Product.id).where(
+                    Product.id.in_(product_ids), Product.supplier_id == supplier.id, Product.deleted_at.is_(None),
+                )
+            ).scalars())
+            foreign = sorted(product_ids - owned)
+            if foreign:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Products {foreign} do not belong to supplier {supplier.id}",
+                )
+        prices = PricingRepo.replace_link_prices(
+            db, supplier.id, link_id, [(p.product_id, p.min_quantity, p.price) for p in data.prices]
+        )
+        get_price_cache().invalidate(supplier.id)
+        log_event(current_user.id, "link.prices_updated", "link", link_id, {"prices": len(prices)})
+        return prices
@@ -1,16 +1,23 @@
-from typing import Iterable
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import List, Optional, Tuple
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.core.concurrency import check_version, conflict_on_stale
+from app.core.pagination import decode_cursor, encode_cursor
 from app.enums.role import Role
 from app.enums.link_status import LinkStatus
 from app.models.product import Product
 from app.models.supplier import Supplier
 from app.repositories.link_repo import LinkRepo
-from app.repositories.product_repo import ProductRepo
+from app.repositories.product_repo import ProductRepo, CATALOG_SORTS
+from app.repositories.price_history_repo import PriceHistoryRepo
 from app.repositories.supplier_repo import SupplierRepo
-from app.schemas.product import ProductCreate, ProductUpdate
+from app.schemas.product import ProductCreate, ProductUpdate, ProductFilter, ProductSearch
 from app.models.user import User
+from app.audit.logger import log_event
+from app.catalog import snapshot
 
 class ProductService:
     # --- helpers ---
@@ -58,6 +65,16 @@ class ProductService:
                 detail="No ACCEPTED link between this consumer and supplier",
             )
 
+    @staticmethod
+    def _ensure_can_view_supplier(db: Session, user: User, supplier_id: int) -> None:
+        """Supplier staff of `supplier_id`, or a consumer with an ACCEPTED link to it"""
+        if user.role == Role.CONSUMER:
+            ProductService._ensure_consumer_link_accepted(db, consumer_id=user.id, supplier_id=supplier_id)
+            return
+        supplier = ProductService._get_user_supplier_or_404(db, user)
+        if supplier.id != supplier_id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not your supplier")
+
     # --- commands/queries ---
 
     @staticmethod
@@ -68,36 +85,83 @@ class ProductService:
             supplier_id=supplier.id,
             name=data.name,
             unit=data.unit,
-            price=float(data.price),
+            price=data.price,
             stock=int(data.stock),
             is_active=bool(data.is_active),
         )
 
     @staticmethod
-    def update(db: Session, *, current_user: User, product_id: int, data: ProductUpdate) -> Product:
+    def update(
+        db: Session, *, current_user: User, product_id: int, data: ProductUpdate,
+        expected_version: Optional[int] = None,
+    ) -> Product:
         supplier = ProductService._get_owner_supplier_or_404(db, current_user)
         product = ProductRepo.by_id(db, product_id)
         if not product or product.supplier_id != supplier.id:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+        check_version(product.version, expected_version, "Product")
 
         payload = data.model_dump(exclude_unset=True)
-        return ProductRepo.update(db, product, **payload)
+        with conflict_on_stale(db, "Product"):
+            return ProductRepo.update(db, product, **payload)
 
     @staticmethod
-    def delete(db: Session, *, current_user: User, product_id: int) -> None:
+    def delete(
+        db: Session, *, current_user: User, product_id: int, expected_version: Optional[int] = None,
+    ) -> None:
         supplier = ProductService._get_owner_supplier_or_404(db, current_user)
         product = ProductRepo.by_id(db, product_id)
         if not product or product.supplier_id != supplier.id:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
-        ProductRepo.delete(db, product)
+        check_version(product.version, expected_version, "Product")
+        with conflict_on_stale(db, "Product"):
+            ProductRepo.delete(db, product)
+        log_event(current_user.id, "product.deleted", "product", product_id, {"supplier_id": supplier.id})
 
     @staticmethod
-    def list_for_my_supplier(db: Session, *, current_user: User) -> Iterable[Product]:
+    def _catalog_page(
+        db: Session, supplier_id: int, filters: Optional[ProductFilter], *, only_active: bool | None = None,
+    ) -> Tuple[List[Product], Optional[str]]:
+        """(products, next cursor or None when this is the last page)"""
+        filters = filters or ProductFilter()
+        keys, _ = CATALOG_SORTS[filters.sort]
+        after = decode_cursor(filters.cursor, len(keys))
+        if after is not None:
+            try:
+                if keys[0].key == "price":
+                    after[0] = Decimal(after[0])
+                elif keys[0].key == "name" and not isinstance(after[0], str):
+                    raise TypeError
+                after[-1] = int(after[-1])
+            except (TypeError, ValueError, InvalidOperation):
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        items = ProductRepo.list_by_supplier(
+            db, supplier_id,
+            only_active=only_active,
+            q=filters.q,
+            unit=filters.unit,
+            min_price=filters.min_price,
+            max_price=filters.max_price,
+            sort=filters.sort,
+            after=after,
+            limit=filters.limit,
+        )
+        next_cursor = None
+        if filters.limit and len(items) == filters.limit:
+            next_cursor = encode_cursor(ProductRepo.sort_key(items[-1], filters.sort))
+        return items, next_cursor
+
+    @staticmethod
+    def list_for_my_supplier(
+        db: Session, *, current_user: User, filters: Optional[ProductFilter] = None,
+    ) -> Tuple[List[Product], Optional[str]]:
         supplier = ProductService._get_user_supplier_or_404(db, current_user)
-        return ProductRepo.list_by_supplier(db, supplier.id)
+        return ProductService._catalog_page(db, supplier.id, filters)
 
     @staticmethod
-    def list_for_consumer(db: Session, *, current_user: User, supplier_id: int) -> Iterable[Product]:
+    def list_for_consumer(
+        db: Session, *, current_user: User, supplier_id: int, filters: Optional[ProductFilter] = None,
+    ) -> Tuple[List[Product], Optional[str]]:
         """
         Выдаёт каталог, только если у consumer есть ACCEPTED линк с supplier_id.
         """
@@ -107,4 +171,64 @@ class ProductService:
         ProductService._ensure_consumer_link_accepted(
             db, consumer_id=current_user.id, supplier_id=supplier_id
         )
-        return ProductRepo.list_by_supplier(db, supplier_id, only_active=True)
+        return ProductService._catalog_page(db, supplier_id, filters, only_active=True)
+
+    @staticmethod
+    def search(
+        db: Session, *, current_user: User, params: ProductSearch,
+    ) -> Tuple[List[Product], Optional[str]]:
+        """One query over the catalogs of all suppliers linked (ACCEPTED) to the consumer"""
+        if current_user.role != Role.CONSUMER:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only consumers can view this")
+        after = decode_cursor(params.cursor, 3)
+        if after is not None:
+            try:
+                after = [int(after[0]), Decimal(after[1]), int(after[2])]
+            except (TypeError, ValueError, InvalidOperation):
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        rows = ProductRepo.search(
+            db, current_user.id, params.q,
+            unit=params.unit,
+            min_price=params.min_price,
+            max_price=params.max_price,
+            after=after,
+            limit=params.limit,
+        )
+        next_cursor = None
+        if len(rows) == params.limit:
+            last, relevance = rows[-1]
+            next_cursor = encode_cursor([relevance, last.price, last.id])
+        return [product for product, _ in rows], next_cursor
+
+    @staticmethod
+    def price_history(
+        db: Session, *, current_user: User, product_id: int, since: Optional[datetime], limit: int,
+    ):
+        product = ProductRepo.by_id(db, product_id)
+        if not product:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+        ProductService._ensure_can_view_supplier(db, current_user, product.supplier_id)
+        return PriceHistoryRepo.list_for_product(db, product_id, since=since, limit=limit)
+
+    @staticmethod
+    def prices_as_of(
+        db: Session, *, current_user: User, supplier_id: int, at: datetime, product_ids: Optional[List[int]],
+    ):
+        """Prices of a supplier's products in effect at `at` (e.g. an order's created_at)"""
+        ProductService._ensure_can_view_supplier(db, current_user, supplier_id)
+        return PriceHistoryRepo.as_of(db, supplier_id, at, product_ids)
+
+    @staticmethod
+    def snapshot_link(db: Session, *, current_user: User, supplier_id: int) -> dict:
+        """
+        Access check for the catalog snapshot file, done once per URL lifetime
+        instead of once per download. Builds the snapshot if none exists yet.
+        """
+        if current_user.role != Role.CONSUMER:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only consumers can view this")
+        ProductService._ensure_consumer_link_accepted(
+            db, consumer_id=current_user.id, supplier_id=supplier_id
+        )
+        version = snapshot.current_version(supplier_id) or snapshot.build_snapshot(db, supplier_id)
+        url, expires_at = snapshot.sign_snapshot_url(supplier_id, current_user.id)
+        return {"url": url, "version": version, "expires_at": expires_at}
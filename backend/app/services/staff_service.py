@@ -10,6 +10,7 @@ from app.models.supplier_staff import SupplierStaff
 from app.enums import Role
 from app.core.security import get_password_hash
 from app.schemas.staff import StaffCreate
+from app.audit.logger import log_event
 
 
 class StaffService:
@@ -141,6 +142,7 @@ class StaffService:
             )
 
         # Update both staff record and user record
+        old_role = staff.role
         staff = StaffRepo.update_role(db, staff, new_role)
 
         # Also update the user's role
@@ -150,6 +152,11 @@ class StaffService:
             db.add(user_obj)
             db.commit()
 
+        log_event(owner.id, "staff.role_changed", "staff", staff.id, {
+            "user_id": staff.user_id,
+            "from": old_role.value,
+            "to": new_role.value,
+        })
         return staff
 
     @staticmethod
@@ -191,3 +198,8 @@ class StaffService:
         if user_obj:
             db.delete(user_obj)
             db.commit()
+
+        log_event(owner.id, "staff.deleted", "staff", staff_id, {
+            "user_id": staff.user_id,
+            "supplier_id": supplier.id,
+        })
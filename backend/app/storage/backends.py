@@ -0,0 +1,132 @@
+"""
+Storage backends for chat attachments.
+
+An object is written through `open_append(key, offset)` in one or more
+requests (resumable uploads), then `complete(key)` makes it readable. The
+number of bytes received so far is `size(key)`, so the upload state needs
+no DB write per chunk. Choose the backend with `ATTACHMENT_STORAGE`.
+"""
+import os
+from typing import BinaryIO, Dict, Iterator, Optional, Type
+
+from app.core.config import get_settings
+
+READ_CHUNK = 256 * 1024
+
+
+class StorageBackend:
+    name = "base"
+
+    def size(self, key: str) -> int:
+        """Bytes received for an incomplete object (0 if nothing yet)"""
+        raise NotImplementedError
+
+    def open_append(self, key: str, offset: int) -> BinaryIO:
+        """Writable file positioned at `offset`; anything after it is discarded"""
+        raise NotImplementedError
+
+    def iter_partial(self, key: str) -> Iterator[bytes]:
+        """Bytes received so far, in chunks (re-hashing after a resumed upload)"""
+        raise NotImplementedError
+
+    def partial_version(self, key: str) -> Optional[str]:
+        """
+        Changes whenever the incomplete object is written, truncated or
+        recreated; None when the backend cannot tell (cached hash state is
+        then never reused).
+        """
+        return None
+
+    def complete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def local_path(self, key: str) -> Optional[str]:
+        """Filesystem path of a completed object, for FileResponse"""
+        return None
+
+    def iter_object(self, key: str) -> Iterator[bytes]:
+        raise NotImplementedError
+
+
+class LocalStorage(StorageBackend):
+    """Files under ATTACHMENT_DIR; partial uploads carry a `.part` suffix"""
+    name = "local"
+
+    def __init__(self, root: str | None = None):
+        self.root = os.path.abspath(root or get_settings().ATTACHMENT_DIR)
+
+    def _path(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, key))
+        if not path.startswith(self.root + os.sep):
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    def size(self, key: str) -> int:
+        try:
+            return os.path.getsize(self._path(key) + ".part")
+        except FileNotFoundError:
+            return 0
+
+    def open_append(self, key: str, offset: int) -> BinaryIO:
+        path = self._path(key) + ".part"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        f = open(path, "r+b" if os.path.exists(path) else "wb")
+        f.truncate(offset)
+        f.seek(offset)
+        return f
+
+    def iter_partial(self, key: str) -> Iterator[bytes]:
+        yield from self._iter_file(self._path(key) + ".part")
+
+    def partial_version(self, key: str) -> Optional[str]:
+        try:
+            st = os.stat(self._path(key) + ".part")
+        except FileNotFoundError:
+            return None
+        return f"{st.st_ino}.{st.st_mtime_ns}.{st.st_size}"
+
+    def complete(self, key: str) -> None:
+        path = self._path(key)
+        os.replace(path + ".part", path)
+
+    def delete(self, key: str) -> None:
+        for path in (self._path(key), self._path(key) + ".part"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def local_path(self, key: str) -> Optional[str]:
+        return self._path(key)
+
+    def iter_object(self, key: str) -> Iterator[bytes]:
+        yield from self._iter_file(self._path(key))
+
+    @staticmethod
+    def _iter_file(path: str) -> Iterator[bytes]:
+        try:
+            with open(path, "rb") as f:
+                while chunk := f.read(READ_CHUNK):
+                    yield chunk
+        except FileNotFoundError:
+            return
+
+
+BACKENDS: Dict[str, Type[StorageBackend]] = {
+    LocalStorage.name: LocalStorage,
+}
+
+_storage: Optional[StorageBackend] = None
+
+
+def get_storage() -> StorageBackend:
+    global _storage
+    if _storage is None:
+        name = get_settings().ATTACHMENT_STORAGE
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown attachment storage: {name}")
+        _storage = BACKENDS[name]()
+    return _storage
@@ -0,0 +1,55 @@
+"""
+Gunicorn config for production: gunicorn -c gunicorn_conf.py app.main:app
+
+Every value can be overridden with the environment variable next to it.
+"""
+import multiprocessing
+import os
+
+
+def _int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+# --- server socket ---
+bind = os.getenv("BIND", "0.0.0.0:8000")
+backlog = _int("GUNICORN_BACKLOG", 2048)
+
+# --- workers ---
+# Endpoints are sync and run in the worker's threadpool, so mostly DB-bound:
+# default to 2 x CPUs + 1, capped so the DB pool (workers x pool size) stays sane.
+_cpus = multiprocessing.cpu_count()
+workers = _int("WEB_CONCURRENCY", min(2 * _cpus + 1, _int("MAX_WORKERS", 17)))
+worker_class = "app.core.server.UvicornWorker"
+# recycle workers periodically to bound memory growth; jitter avoids restarting all at once
+max_requests = _int("GUNICORN_MAX_REQUESTS", 10000)
+max_requests_jitter = _int("GUNICORN_MAX_REQUESTS_JITTER", 1000)
+
+# --- timeouts ---
+keepalive = _int("GUNICORN_KEEPALIVE", 5)
+timeout = _int("GUNICORN_TIMEOUT", 60)
+graceful_timeout = _int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+
+# Each worker imports the app itself so DB connections are never shared across fork
+preload_app = False
+
+accesslog = os.getenv("GUNICORN_ACCESSLOG", None)
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info")
+
+
+# --- hooks ---
+
+def post_worker_init(worker):
+    """Warm the SQLAlchemy pool before the worker accepts traffic"""
+    from app.db.session import warm_pool
+    try:
+        warm_pool()
+    except Exception as e:  # the DB may still be starting; pool_pre_ping recovers later
+        worker.log.warning("DB pool warm-up failed: %s", e)
+
+
+def worker_exit(server, worker):
+    """Drain pooled DB connections once in-flight requests are done"""
+    from app.db.session import dispose_engine
+    dispose_engine()
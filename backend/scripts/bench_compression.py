@@ -0,0 +1,111 @@
+"""
+CPU vs. bytes for response compression.
+
+Builds payloads shaped like our heaviest responses (an order list with nested
+items/products, a chat history page, a catalog page), serializes them with
+the response models, and reports for each codec/level: compressed size,
+ratio, time per response and throughput. The last column is the cost of a
+hit in the compressed-body cache (hash + lookup) that replaces compression
+for repeated bodies. No database needed; run from backend/:
+
+    python scripts/bench_compression.py
+    python scripts/bench_compression.py --orders 200 --repeat 50
+"""
+import argparse
+import hashlib
+import os
+import sys
+import time
+import zlib
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.getcwd())
+
+from app.core.compression import CompressedCache, brotli  # noqa: E402
+from app.schemas.message import MessageOut  # noqa: E402
+from app.schemas.order import OrderOut  # noqa: E402
+from app.schemas.product import ProductOut  # noqa: E402
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+SUPPLIER = {"id": 7, "name": "Fresh Farm Supplies LLC", "description": "Dairy, vegetables and dry goods", "owner_id": 3}
+
+
+def _product(i: int) -> dict:
+    return {"id": i, "supplier_id": 7, "name": f"Product {i} organic", "unit": "kg",
+            "price": 10 + i % 17 * 0.25, "stock": 100 + i, "moq": 1 + i % 5, "is_active": True}
+
+
+def payloads(n_orders: int, n_messages: int, n_products: int) -> dict[str, bytes]:
+    orders = [
+        OrderOut.model_validate({
+            "id": o, "supplier_id": 7, "consumer_id": 11, "total_amount": 123.5 + o, "status": "CREATED",
+            "created_at": NOW, "supplier": SUPPLIER, "consumer": {"id": 11, "email": "buyer@example.com", "role": "CONSUMER"},
+            "items": [{"id": o * 10 + k, "order_id": o, "product_id": k, "quantity": 1 + k, "unit_price": 4.5 + k,
+                       "product": _product(k)} for k in range(5)],
+        })
+        for o in range(n_orders)
+    ]
+    messages = [
+        MessageOut.model_validate({
+            "id": m, "link_id": 5, "sender_id": 11 if m % 2 else 3, "created_at": NOW,
+            "text": f"Can you deliver order #{m} on Tuesday morning? Thanks!", "file_url": None, "audio_url": None,
+            "sender": {"id": 11 if m % 2 else 3, "email": "buyer@example.com", "role": "CONSUMER"},
+        })
+        for m in range(n_messages)
+    ]
+    products = [ProductOut.model_validate(_product(i)) for i in range(n_products)]
+
+    def dump(items):
+        return b"[" + b",".join(i.model_dump_json().encode() for i in items) + b"]"
+
+    return {"orders": dump(orders), "chat": dump(messages), "catalog": dump(products)}
+
+
+def codecs():
+    for level in (1, 6, 9):
+        yield f"gzip-{level}", lambda b, level=level: _gzip(b, level)
+    if brotli is not None:
+        for quality in (1, 4, 11):
+            yield f"br-{quality}", lambda b, quality=quality: brotli.compress(b, quality=quality)
+
+
+def _gzip(body: bytes, level: int) -> bytes:
+    c = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return c.compress(body) + c.flush()
+
+
+def _time(fn, body: bytes, repeat: int) -> float:
+    t = time.perf_counter()
+    for _ in range(repeat):
+        fn(body)
+    return (time.perf_counter() - t) / repeat
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--orders", type=int, default=50)
+    p.add_argument("--messages", type=int, default=50)
+    p.add_argument("--products", type=int, default=200)
+    p.add_argument("--repeat", type=int, default=30)
+    args = p.parse_args()
+
+    if brotli is None:
+        print("brotli not installed: gzip only\n")
+
+    for name, body in payloads(args.orders, args.messages, args.products).items():
+        cache = CompressedCache(64 * 1024 * 1024)
+        key_of = lambda b: ("gzip", hashlib.sha256(b).digest())  # noqa: E731
+        cache.put(key_of(body), b"x")
+        hit_us = _time(lambda b: cache.get(key_of(b)), body, args.repeat) * 1e6
+
+        print(f"== {name}: {len(body):,} bytes (cache hit {hit_us:.1f} us)")
+        print(f"  {'codec':<10}{'bytes':>10}{'ratio':>8}{'us/resp':>10}{'MB/s':>8}")
+        for codec, fn in codecs():
+            out = fn(body)
+            secs = _time(fn, body, args.repeat)
+            print(f"  {codec:<10}{len(out):>10,}{len(body) / len(out):>8.1f}{secs * 1e6:>10.0f}{len(body) / secs / 1e6:>8.0f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
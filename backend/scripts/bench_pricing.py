@@ -0,0 +1,136 @@
+"""
+Checkout pricing for large baskets.
+
+Builds a synthetic supplier catalog with quantity breaks and negotiated
+prices, compiles it into a PriceTable and reports, per basket size:
+compile time (paid once per pricing edit), time to price the basket from
+the compiled table, and the same basket priced by scanning tier rows line by
+line (the shape of a per-item lookup). No database needed; run from backend/:
+
+    python scripts/bench_pricing.py
+    python scripts/bench_pricing.py --products 20000 --lines 500 --repeat 200
+
+With --supplier-id/--consumer-id it also times the real checkout path
+against DATABASE_URL: one basket validation query plus pricing from the
+cached table, read-only (no order is created).
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.getcwd())
+
+from app.pricing.engine import PriceTable  # noqa: E402
+
+SUPPLIER_ID = 7
+
+
+def catalog(n_products: int, n_links: int, seed: int = 1):
+    rnd = random.Random(seed)
+    base = {p: Decimal(rnd.randint(100, 5000)) / 100 for p in range(1, n_products + 1)}
+    tiers = []
+    for p, price in base.items():
+        for k, q in enumerate((10, 50, 200)[: rnd.randint(0, 3)], start=1):
+            tiers.append((p, q, (price * (100 - 5 * k) / 100).quantize(Decimal("0.01"))))
+    links = []
+    for link_id in range(1, n_links + 1):
+        for p in rnd.sample(range(1, n_products + 1), max(1, n_products // 10)):
+            links.append((link_id, p, 1, (base[p] * Decimal("0.9")).quantize(Decimal("0.01"))))
+    return base, tiers, links
+
+
+def naive_prices(base, tiers, links, lines, link_id):
+    """Per line: filter all tier / negotiated rows for the product"""
+    out = []
+    for product_id, quantity, _ in lines:
+        candidates = [base[product_id]]
+        candidates += [p for pid, q, p in tiers if pid == product_id and q <= quantity]
+        candidates += [p for lid, pid, q, p in links if lid == link_id and pid == product_id and q <= quantity]
+        out.append(min(candidates))
+    return out
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def bench_memory(args) -> None:
+    base, tiers, links = catalog(args.products, args.links)
+    rnd = random.Random(2)
+    lines = [(p, rnd.randint(1, 300), base[p]) for p in rnd.sample(sorted(base), args.lines)]
+    link_id = 1
+
+    compile_s = timed(lambda: PriceTable.compile(SUPPLIER_ID, 1, tiers, links), max(1, args.repeat // 20))
+    table = PriceTable.compile(SUPPLIER_ID, 1, tiers, links)
+    fast = table.price_basket(lines, link_id)
+    basket_s = timed(lambda: table.price_basket(lines, link_id), args.repeat)
+
+    naive_repeat = max(1, args.repeat // 50)
+    slow = naive_prices(base, tiers, links, lines, link_id)
+    naive_s = timed(lambda: naive_prices(base, tiers, links, lines, link_id), naive_repeat)
+    assert fast == slow, "compiled table disagrees with the naive scan"
+
+    print(f"catalog: {args.products} products, {len(tiers)} tiers, {len(links)} negotiated prices ({args.links} links)")
+    print(f"{'step':<28}{'ms':>10}{'us/line':>10}")
+    print(f"{'compile table':<28}{compile_s * 1e3:>10.2f}{'':>10}")
+    print(f"{'price basket (table)':<28}{basket_s * 1e3:>10.3f}{basket_s * 1e6 / args.lines:>10.2f}")
+    print(f"{'price basket (scan)':<28}{naive_s * 1e3:>10.3f}{naive_s * 1e6 / args.lines:>10.2f}")
+
+
+def bench_db(args) -> None:
+    from app.db.session import SessionLocal, get_engine
+    from app.pricing.engine import get_price_cache
+    from app.repositories.link_repo import LinkRepo
+    from app.repositories.product_repo import ProductRepo
+    from app.models.product import Product
+    from sqlalchemy import select
+
+    get_engine()
+    db = SessionLocal()
+    try:
+        link = LinkRepo.get_by_pair(db, supplier_id=args.supplier_id, consumer_id=args.consumer_id)
+        if link is None:
+            raise SystemExit("no link between this supplier and consumer")
+        ids = db.execute(select(Product.id).where(Product.supplier_id == args.supplier_id)).scalars().all()
+        if not ids:
+            raise SystemExit("supplier has no products")
+        rnd = random.Random(3)
+        basket = [(rnd.choice(ids), rnd.randint(1, 300)) for _ in range(args.lines)]
+
+        def checkout():
+            rows = ProductRepo.validate_basket(db, args.supplier_id, basket)
+            table = get_price_cache().get(db, args.supplier_id, rows[0].pricing_version)
+            table.price_basket([(r.product_id, r.quantity, r.unit_price or Decimal(0)) for r in rows], link.id)
+            db.rollback()
+
+        checkout()  # compile and cache the table
+        per = timed(checkout, max(1, args.repeat // 10))
+        print(f"db checkout, {args.lines} lines: {per * 1e3:.2f} ms (validation query + pricing)")
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--links", type=int, default=50)
+    parser.add_argument("--lines", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--supplier-id", type=int)
+    parser.add_argument("--consumer-id", type=int)
+    args = parser.parse_args()
+    args.lines = min(args.lines, args.products)
+
+    bench_memory(args)
+    if args.supplier_id and args.consumer_id:
+        bench_db(args)
+
+
+if __name__ == "__main__":
+    main()
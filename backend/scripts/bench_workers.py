@@ -0,0 +1,88 @@
+"""
+Throughput vs. gunicorn worker count.
+
+Starts `gunicorn -c gunicorn_conf.py app.main:app` with each worker count,
+drives it with a fixed number of concurrent keep-alive clients for a fixed
+duration and prints requests/second. DATABASE_URL and SECRET_KEY must be set
+(e.g. from backend/.env); run from backend/:
+
+    python scripts/bench_workers.py --workers 1 2 4 8 --path /health
+    python scripts/bench_workers.py --path /suppliers --token <jwt>
+"""
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import httpx
+
+
+async def _drive(url: str, headers: dict, concurrency: int, duration: float) -> tuple[int, int]:
+    ok = errors = 0
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=10.0) as client:
+        async def worker():
+            nonlocal ok, errors
+            while time.monotonic() < deadline:
+                try:
+                    r = await client.get(url, headers=headers)
+                    if r.status_code < 500:
+                        ok += 1
+                    else:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return ok, errors
+
+
+def _wait_ready(base: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--token", default=None, help="bearer token for authenticated paths")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8077)
+    args = parser.parse_args()
+
+    base = f"http://127.0.0.1:{args.port}"
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    print(f"cpus={os.cpu_count()} path={args.path} concurrency={args.concurrency} duration={args.duration}s")
+    print(f"{'workers':>7} {'req/s':>10} {'errors':>7} {'speedup':>8}")
+
+    baseline = None
+    for n in args.workers:
+        env = dict(os.environ, WEB_CONCURRENCY=str(n), BIND=f"127.0.0.1:{args.port}", LOG_LEVEL="warning")
+        proc = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn_conf.py", "app.main:app"], env=env)
+        try:
+            _wait_ready(base)
+            ok, errors = asyncio.run(_drive(base + args.path, headers, args.concurrency, args.duration))
+        finally:
+            proc.send_signal(signal.SIGTERM)
+            proc.wait(timeout=60)
+        rps = ok / args.duration
+        baseline = baseline or rps
+        print(f"{n:>7} {rps:>10.0f} {errors:>7} {rps / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
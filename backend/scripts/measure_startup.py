@@ -0,0 +1,106 @@
+"""
+Startup-time breakdown.
+
+Runs `python -X importtime` in a fresh interpreter for `import app.main` and
+for `create_app()`, then aggregates the per-module cumulative times by
+top-level package (fastapi, sqlalchemy, pydantic, app.*, ...). Nothing
+connects to the database: the engine is created in the app lifespan. Run
+from backend/:
+
+    python scripts/measure_startup.py
+    python scripts/measure_startup.py --json --max-ms 1500   # CI: fail if slower
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+TARGETS = {
+    "import": "import app.main",
+    "create_app": "from app.main import create_app; create_app()",
+}
+
+# import time:       self [us] |  cumulative | imported package
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _run(code: str) -> tuple[list[tuple[int, int, int, str]], float]:
+    env = dict(os.environ)
+    # settings are lazy, but create_app() must not fail on a bare checkout
+    env.setdefault("DATABASE_URL", "postgresql+psycopg2://u:p@localhost/startup")
+    env.setdefault("SECRET_KEY", "startup-measurement")
+    env["PYTHONPATH"] = os.getcwd() + os.pathsep + env.get("PYTHONPATH", "")
+    wrapped = f"import time; t=time.perf_counter(); {code}; print((time.perf_counter()-t)*1000)"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", wrapped],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            rows.append((int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2, m.group(4)))
+    return rows, float(proc.stdout.strip().splitlines()[-1])
+
+
+def _group(name: str) -> str:
+    parts = name.split(".")
+    return ".".join(parts[:2]) if parts[0] == "app" else parts[0]
+
+
+def breakdown(code: str, top: int) -> dict:
+    rows, wall_ms = _run(code)
+    by_group: dict[str, int] = defaultdict(int)
+    for self_us, _cum_us, _depth, name in rows:
+        by_group[_group(name)] += self_us
+    slowest = sorted(rows, key=lambda r: r[1], reverse=True)[:top]
+    return {
+        "wall_ms": round(wall_ms, 1),
+        "groups": [
+            {"name": n, "self_ms": round(us / 1000, 1)}
+            for n, us in sorted(by_group.items(), key=lambda kv: kv[1], reverse=True)[:top]
+        ],
+        "slowest_modules": [
+            {"name": name, "cumulative_ms": round(cum / 1000, 1), "self_ms": round(s / 1000, 1)}
+            for s, cum, _depth, name in slowest
+        ],
+    }
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--target", choices=sorted(TARGETS), action="append")
+    p.add_argument("--top", type=int, default=15)
+    p.add_argument("--json", action="store_true", help="machine-readable output")
+    p.add_argument("--max-ms", type=float, default=None,
+                   help="exit 1 if any target's wall time exceeds this budget")
+    args = p.parse_args()
+
+    results = {t: breakdown(TARGETS[t], args.top) for t in (args.target or list(TARGETS))}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for target, r in results.items():
+            print(f"== {target}: {r['wall_ms']:.1f} ms")
+            print(f"  {'package':<32}{'self ms':>10}")
+            for g in r["groups"]:
+                print(f"  {g['name']:<32}{g['self_ms']:>10.1f}")
+            print(f"  {'slowest modules':<32}{'cum ms':>10}")
+            for m in r["slowest_modules"]:
+                print(f"  {m['name']:<32}{m['cumulative_ms']:>10.1f}")
+            print()
+
+    if args.max_ms is not None:
+        over = {t: r["wall_ms"] for t, r in results.items() if r["wall_ms"] > args.max_ms}
+        if over:
+            print(f"startup budget {args.max_ms:.0f} ms exceeded: {over}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())